@@ -0,0 +1,13 @@
+from services.instagram_service import InstagramService
+from core.base import BaseSocialMediaService
+
+
+class InstagramAdapter:
+    """Adapter for Instagram service"""
+
+    def __init__(self):
+        self._service = InstagramService()
+
+    @property
+    def service(self) -> BaseSocialMediaService:
+        return self._service
@@ -1,9 +1,15 @@
+import hmac
 from functools import lru_cache
-from fastapi import Depends, HTTPException, status
-from typing import Annotated
+from fastapi import Depends, Header, HTTPException, status
+from pydantic import BaseModel
+from typing import Annotated, Optional, Set, Type
 
+from config.settings import settings
 from core.models import Platform
+from services.engagement_tracker import EngagementTracker
+from services.feed_service import FeedService
 from services.fetcher_service import SocialMediaFetcher
+from services.post_watcher import PostWatcher
 
 
 @lru_cache()
@@ -12,6 +18,24 @@ def get_social_media_fetcher() -> SocialMediaFetcher:
     return SocialMediaFetcher()
 
 
+@lru_cache()
+def get_feed_service() -> FeedService:
+    """Dependency to get the feed service instance"""
+    return FeedService(get_social_media_fetcher())
+
+
+@lru_cache()
+def get_engagement_tracker() -> EngagementTracker:
+    """Dependency to get the engagement tracker instance"""
+    return EngagementTracker(get_social_media_fetcher())
+
+
+@lru_cache()
+def get_post_watcher() -> PostWatcher:
+    """Dependency to get the long-poll post watcher instance"""
+    return PostWatcher(get_social_media_fetcher())
+
+
 def validate_platform(platform: str) -> Platform:
     """Validate platform parameter"""
     try:
@@ -24,5 +48,46 @@ def validate_platform(platform: str) -> Platform:
         )
 
 
+def validate_fields(fields: Optional[str], model: Type[BaseModel]) -> Optional[Set[str]]:
+    """Validate a comma-separated ``fields`` parameter against a model"""
+    if not fields:
+        return None
+
+    available_fields = [
+        name for name, field in model.model_fields.items() if not field.exclude
+    ]
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested.difference(available_fields)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid fields {sorted(unknown)}. Available fields: {available_fields}",
+        )
+
+    return requested
+
+
+def admin_token_valid(token: Optional[str]) -> bool:
+    """Whether ``token`` matches ``ADMIN_TOKEN`` (always false when unset)"""
+    if not settings.ADMIN_TOKEN or not token:
+        return False
+    return hmac.compare_digest(token.encode(), settings.ADMIN_TOKEN.encode())
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    """Guard admin endpoints with the ``X-Admin-Token`` header"""
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Admin endpoints are disabled"
+        )
+    if not admin_token_valid(x_admin_token):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Invalid admin token"
+        )
+
+
 # Type aliases for dependencies
 FetcherDep = Annotated[SocialMediaFetcher, Depends(get_social_media_fetcher)]
+FeedServiceDep = Annotated[FeedService, Depends(get_feed_service)]
+EngagementTrackerDep = Annotated[EngagementTracker, Depends(get_engagement_tracker)]
+PostWatcherDep = Annotated[PostWatcher, Depends(get_post_watcher)]
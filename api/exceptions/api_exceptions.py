@@ -4,13 +4,16 @@ from core.exceptions import (
     APIError,
     AuthenticationError,
     ChannelNotFoundError,
+    DeadlineExceededError,
     RateLimitError,
 )
 
 
 def map_to_http_exception(error: Exception) -> HTTPException:
     """Map internal exceptions to HTTP exceptions"""
-    if isinstance(error, ChannelNotFoundError):
+    if isinstance(error, HTTPException):
+        return error
+    elif isinstance(error, ChannelNotFoundError):
         return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(error))
     elif isinstance(error, AuthenticationError):
         return HTTPException(
@@ -20,8 +23,15 @@ def map_to_http_exception(error: Exception) -> HTTPException:
         return HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=str(error)
         )
+    elif isinstance(error, DeadlineExceededError):
+        return HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=str(error)
+        )
     elif isinstance(error, APIError):
         return HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(error))
+    elif isinstance(error, ValueError):
+        # Identifiers a platform cannot accept, or platforms not configured
+        return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(error))
     else:
         return HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
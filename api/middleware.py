@@ -1,8 +1,28 @@
 from fastapi import Request
+from fastapi.responses import JSONResponse, PlainTextResponse
+from starlette.datastructures import Headers, MutableHeaders
 from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from typing import Dict, Optional, Sequence, Tuple
+from urllib.parse import parse_qs
+import asyncio
+import hmac
+import json
+import math
+import pstats
 import time
 import logging
 
+from api.dependencies import admin_token_valid
+from config.settings import settings
+from core.context import RequestContext, reset_context, set_context
+from utils.profiling import RequestProfile
+from utils.rate_limiter import (
+    InMemoryRateLimitBackend,
+    RateLimitBackend,
+    RateLimitResult,
+)
+
 logger = logging.getLogger(__name__)
 
 class TimingMiddleware(BaseHTTPMiddleware):
@@ -22,4 +42,322 @@ class TimingMiddleware(BaseHTTPMiddleware):
             f"Time: {process_time:.4f}s"
         )
         
-        return response
\ No newline at end of file
+        return response
+
+
+def client_key(scope: Scope, trust_forwarded: bool) -> str:
+    """Identify the caller by its X-API-Key header, or else by IP
+
+    Only keys listed in ``RATE_LIMIT_API_KEYS`` count, so clients cannot get
+    a fresh budget by sending a new key; they are named by position, which
+    keeps the key itself out of stats and logs.
+    """
+    headers = Headers(scope=scope)
+    api_key = headers.get("x-api-key")
+    if api_key:
+        for index, known in enumerate(settings.RATE_LIMIT_API_KEYS):
+            if hmac.compare_digest(api_key.encode(), known.encode()):
+                return f"key:{index + 1}"
+
+    forwarded = headers.get("x-forwarded-for") if trust_forwarded else None
+    if forwarded:
+        return f"ip:{forwarded.split(',')[0].strip()}"
+    client = scope.get("client")
+    return f"ip:{client[0] if client else 'unknown'}"
+
+
+class RequestContextMiddleware:
+    """Attach a ``RequestContext`` to every HTTP request (pure ASGI)
+
+    The context carries the client identity, a deadline and an event set
+    when the client disconnects, so upstream work can be dropped or cut
+    short once nobody is waiting for it. Clients may ask for a shorter
+    deadline than ``REQUEST_TIMEOUT`` with an ``X-Request-Timeout`` header
+    (seconds). Must sit outside ``BaseHTTPMiddleware`` subclasses, which
+    run the rest of the app in a task that copies the context at creation.
+    """
+
+    def __init__(
+        self, app: ASGIApp, trust_forwarded: bool = settings.RATE_LIMIT_TRUST_FORWARDED
+    ):
+        self.app = app
+        self.trust_forwarded = trust_forwarded
+
+    @staticmethod
+    def _timeout(headers: Headers) -> float:
+        try:
+            requested = float(headers.get("x-request-timeout", ""))
+        except ValueError:
+            return settings.REQUEST_TIMEOUT
+        if not 0 < requested < settings.REQUEST_TIMEOUT:
+            return settings.REQUEST_TIMEOUT
+        return requested
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        disconnected = asyncio.Event()
+        token = set_context(
+            RequestContext(
+                client_id=client_key(scope, self.trust_forwarded),
+                deadline=time.monotonic() + self._timeout(Headers(scope=scope)),
+                disconnected=disconnected,
+            )
+        )
+
+        # Only one reader may call receive(): pump every message into a queue
+        # so a disconnect is noticed even while the app is not reading
+        messages: "asyncio.Queue[Message]" = asyncio.Queue()
+
+        async def pump() -> None:
+            while True:
+                message = await receive()
+                messages.put_nowait(message)
+                if message["type"] == "http.disconnect":
+                    disconnected.set()
+                    return
+
+        async def receive_from_pump() -> Message:
+            if messages.empty() and disconnected.is_set():
+                return {"type": "http.disconnect"}
+            return await messages.get()
+
+        pump_task = asyncio.create_task(pump())
+        try:
+            await self.app(scope, receive_from_pump, send)
+        finally:
+            pump_task.cancel()
+            reset_context(token)
+
+
+class ProfilingMiddleware:
+    """Profile single requests on demand (pure ASGI)
+
+    A request with ``?profile=1`` and a valid ``X-Admin-Token`` runs under
+    cProfile, including its upstream jobs in worker threads. Its response
+    is replaced with the text report (sorted by ``profile_sort``, default
+    ``cumulative``); the original status is in ``X-Profiled-Status``. One
+    request is profiled at a time.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._busy = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or b"profile=" not in scope["query_string"]:
+            await self.app(scope, receive, send)
+            return
+
+        query = parse_qs(scope["query_string"].decode("latin-1"))
+        if query.get("profile") != ["1"] or not admin_token_valid(
+            Headers(scope=scope).get("x-admin-token")
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        if self._busy:
+            response = JSONResponse(
+                status_code=409,
+                content={"detail": "Another request is being profiled"},
+            )
+            await response(scope, receive, send)
+            return
+
+        sort = query.get("profile_sort", ["cumulative"])[0]
+        if sort not in pstats.Stats.sort_arg_dict_default:
+            sort = "cumulative"
+
+        status_code = 500
+
+        async def discard(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+
+        self._busy = True
+        try:
+            with RequestProfile() as profile:
+                await self.app(scope, receive, discard)
+        finally:
+            self._busy = False
+
+        response = PlainTextResponse(
+            profile.report(sort), headers={"X-Profiled-Status": str(status_code)}
+        )
+        await response(scope, receive, send)
+
+
+def default_exempt_paths() -> Tuple[str, ...]:
+    """``RATE_LIMIT_EXEMPT_PATHS`` under the API prefix, plus the API docs"""
+    api_paths = tuple(
+        settings.API_V1_PREFIX + path for path in settings.RATE_LIMIT_EXEMPT_PATHS
+    )
+    return api_paths + (settings.DOCS_URL, settings.REDOC_URL, "/openapi.json")
+
+
+class RateLimitMiddleware:
+    """Per-client GCRA rate limiting (pure ASGI)
+
+    Clients are keyed by a known ``X-API-Key`` header, or else by IP (see
+    ``client_key``). Batch requests cost one unit per entry in their
+    ``channels``/``items`` list or mapping, so a 500-channel batch spends as
+    much budget as 500 single lookups; a batch costing more than the whole
+    budget is refused with a 413. Every limited response carries
+    ``RateLimit-*`` headers; denied requests get a 429 with ``Retry-After``.
+    POST bodies over ``MAX_BODY_BYTES`` are refused with a 413 without being
+    read in full.
+    """
+
+    # JSON body keys whose length is the cost of a batch request
+    COST_KEYS = ("channels", "items")
+    # Largest POST body read to price a request
+    MAX_BODY_BYTES = 1024 * 1024
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        backend: Optional[RateLimitBackend] = None,
+        limit: int = settings.RATE_LIMIT_REQUESTS,
+        window: float = settings.RATE_LIMIT_WINDOW,
+        exempt_paths: Optional[Sequence[str]] = None,
+        trust_forwarded: bool = settings.RATE_LIMIT_TRUST_FORWARDED,
+    ):
+        self.app = app
+        self.backend = backend or InMemoryRateLimitBackend()
+        self.limit = limit
+        self.window = window
+        self.exempt_paths = tuple(
+            default_exempt_paths() if exempt_paths is None else exempt_paths
+        )
+        self.trust_forwarded = trust_forwarded
+
+    async def _cost(
+        self, scope: Scope, receive: Receive
+    ) -> Tuple[Optional[int], Receive]:
+        """Cost of the request, and a ``receive`` that replays the read body
+
+        The cost is ``None`` for a body over ``MAX_BODY_BYTES``.
+        """
+        if scope["method"] != "POST":
+            return 1, receive
+
+        try:
+            declared = int(Headers(scope=scope).get("content-length", 0))
+        except ValueError:
+            declared = 0
+        if declared > self.MAX_BODY_BYTES:
+            return None, receive
+
+        chunks = []
+        size = 0
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                # Let the app see the disconnect
+                return 1, _replay(b"", receive, message)
+            chunks.append(message.get("body", b""))
+            size += len(chunks[-1])
+            if size > self.MAX_BODY_BYTES:
+                return None, receive
+            more_body = message.get("more_body", False)
+        body = b"".join(chunks)
+
+        cost = 1
+        try:
+            payload = json.loads(body) if body else None
+        except ValueError:
+            payload = None
+        if isinstance(payload, dict):
+            for key in self.COST_KEYS:
+                if isinstance(payload.get(key), (list, dict)):
+                    cost = max(1, len(payload[key]))
+                    break
+
+        return cost, _replay(body, receive)
+
+    def _headers(self, result: RateLimitResult) -> Dict[str, str]:
+        headers = {
+            "RateLimit-Limit": str(result.limit),
+            "RateLimit-Remaining": str(result.remaining),
+            "RateLimit-Reset": str(math.ceil(result.reset_after)),
+            "RateLimit-Policy": f"{self.limit};w={int(self.window)}",
+        }
+        if not result.allowed:
+            headers["Retry-After"] = str(math.ceil(result.retry_after))
+        return headers
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(self.exempt_paths):
+            await self.app(scope, receive, send)
+            return
+
+        key = client_key(scope, self.trust_forwarded)
+        cost, receive = await self._cost(scope, receive)
+        if cost is None:
+            response = JSONResponse(
+                status_code=413,
+                content={
+                    "detail": {
+                        "error": "Payload Too Large",
+                        "message": f"Request body exceeds {self.MAX_BODY_BYTES} bytes",
+                    }
+                },
+            )
+            await response(scope, receive, send)
+            return
+
+        if cost > self.limit:
+            response = JSONResponse(
+                status_code=413,
+                content={
+                    "detail": {
+                        "error": "Payload Too Large",
+                        "message": (
+                            f"Request costs {cost} units, more than the limit of "
+                            f"{self.limit} per {int(self.window)}s"
+                        ),
+                    }
+                },
+            )
+            await response(scope, receive, send)
+            return
+
+        result = await self.backend.acquire(key, cost, self.limit, self.window)
+        headers = self._headers(result)
+
+        if not result.allowed:
+            response = JSONResponse(
+                status_code=429,
+                content={
+                    "detail": {
+                        "error": "Too Many Requests",
+                        "message": f"Rate limit exceeded, retry in {headers['Retry-After']}s",
+                    }
+                },
+                headers=headers,
+            )
+            await response(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).update(headers)
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+
+def _replay(body: bytes, receive: Receive, last: Optional[Message] = None) -> Receive:
+    """Wrap ``receive`` so the already-read body is delivered first"""
+    pending = [last or {"type": "http.request", "body": body, "more_body": False}]
+
+    async def replay() -> Message:
+        if pending:
+            return pending.pop()
+        return await receive()
+
+    return replay
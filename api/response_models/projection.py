@@ -0,0 +1,36 @@
+from typing import Any, Optional, Set, Union
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+def project_response(
+    response: BaseModel,
+    fields: Optional[Set[str]],
+    many: bool = False,
+    nested: Optional[str] = None,
+) -> Union[BaseModel, JSONResponse]:
+    """Serialize only the requested fields of ``response.data``
+
+    Without ``fields`` the response is returned untouched so FastAPI handles it
+    through the route's ``response_model``. With ``fields``, only the selected
+    attributes are dumped, which skips serializing everything else. ``many``
+    applies the projection to every value of a collection ``data``; with
+    ``nested``, those values are wrappers and the projection applies to their
+    ``nested`` attribute instead.
+    """
+    if fields is None:
+        return response
+
+    include = {name: True for name in type(response).model_fields if name != "data"}
+    selection: Any = fields
+    if nested is not None and response.data:
+        items = iter(
+            response.data.values() if isinstance(response.data, dict) else response.data
+        )
+        wrapper_fields = type(next(items)).model_fields
+        selection = {name: True for name in wrapper_fields if name != nested}
+        selection[nested] = fields
+    include["data"] = {"__all__": selection} if many else selection
+
+    return JSONResponse(content=response.model_dump(mode="json", include=include))
@@ -22,6 +22,24 @@ class ChannelResponse(BaseModel):
     message: str = "Channel information retrieved successfully"
 
 
+class ChannelBatchItem(BaseModel):
+    """Result of one channel in a bulk lookup"""
+
+    platform: Platform
+    identifier: str
+    status_code: int
+    data: Optional[ChannelInfo] = None
+    error: Optional[str] = None
+
+
+class ChannelBatchResponse(BaseModel):
+    """Response model for bulk channel lookups"""
+
+    success: bool = True
+    data: List[ChannelBatchItem] = Field(default_factory=list)
+    message: str = "Channels retrieved successfully"
+
+
 class MultiPostResponse(BaseModel):
     """Response model for multiple posts"""
 
@@ -31,6 +49,34 @@ class MultiPostResponse(BaseModel):
     errors: Dict[str, str] = Field(default_factory=dict)
 
 
+class FeedResponse(BaseModel):
+    """Response model for the merged multi-channel feed"""
+
+    success: bool = True
+    data: List[SocialMediaPost] = Field(default_factory=list)
+    next_cursor: Optional[str] = None
+    message: str = "Feed retrieved successfully"
+    errors: Dict[str, str] = Field(default_factory=dict)
+
+
+class EngagementSeriesData(BaseModel):
+    """Engagement time series of one post"""
+
+    platform: Platform
+    post_id: str
+    timestamps: List[datetime] = Field(default_factory=list)
+    metrics: Dict[str, List[int]] = Field(default_factory=dict)
+    growth_per_hour: Dict[str, float] = Field(default_factory=dict)
+
+
+class EngagementSeriesResponse(BaseModel):
+    """Response model for engagement time series"""
+
+    success: bool = True
+    data: Optional[EngagementSeriesData] = None
+    message: str = "Engagement series retrieved successfully"
+
+
 class ErrorResponse(BaseModel):
     """Error response model"""
 
@@ -49,8 +95,69 @@ class HealthResponse(BaseModel):
     available_platforms: List[str]
 
 
+class SchedulerClassStats(BaseModel):
+    """Upstream queue statistics of one priority class"""
+
+    queued: int
+    started: int
+    dropped: int
+    wait_ms_p50: float
+    wait_ms_p95: float
+    wait_ms_max: float
+
+
+class SchedulerStatsResponse(BaseModel):
+    """Upstream scheduler statistics"""
+
+    workers: int
+    running: int
+    classes: Dict[str, SchedulerClassStats]
+
+
+class CredentialStats(BaseModel):
+    """Usage of one pooled API key or token"""
+
+    name: str
+    calls: int
+    quarantines: int
+    quarantined_until: Optional[datetime] = None
+    quarantine_reason: Optional[str] = None
+    remaining: Dict[str, int] = Field(
+        default_factory=dict,
+        description="Known remaining budget per scope (daily quota or endpoint)",
+    )
+
+
+class CredentialStatsResponse(BaseModel):
+    """Response model for credential pool usage"""
+
+    success: bool = True
+    data: Dict[str, List[CredentialStats]] = Field(default_factory=dict)
+
+
 # Request Models
 class MultiChannelRequest(BaseModel):
     """Request model for multiple channels"""
 
     channels: Dict[Platform, str] = Field()
+
+
+class ChannelRef(BaseModel):
+    """A channel on a given platform"""
+
+    platform: Platform
+    identifier: str
+
+
+class ChannelBatchRequest(BaseModel):
+    """Request model for bulk channel lookups"""
+
+    channels: List[ChannelRef] = Field(min_length=1, max_length=5000)
+
+
+class FeedRequest(BaseModel):
+    """Request model for the merged multi-channel feed"""
+
+    channels: List[ChannelRef] = Field(min_length=1, max_length=500)
+    limit: int = Field(default=20, ge=1, le=100)
+    cursor: Optional[str] = None
@@ -0,0 +1,41 @@
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+
+from api.dependencies import require_admin
+from config.settings import settings
+from utils.profiling import SamplingProfiler, folded_stacks
+
+router = APIRouter(
+    prefix="/admin", tags=["Admin"], dependencies=[Depends(require_admin)]
+)
+
+_sampling = asyncio.Lock()
+
+
+@router.post("/profile/sample", response_class=PlainTextResponse)
+async def sample_profile(
+    seconds: float = Query(10, gt=0, description="How long to sample"),
+    interval_ms: float = Query(5, ge=1, le=1000, description="Time between samples"),
+):
+    """Sample the stacks of all threads (event loop and workers) for a while
+
+    Returns aggregated stacks in the folded format (``root;...;leaf count``),
+    ready for flamegraph.pl or speedscope.
+    """
+    if seconds > settings.PROFILE_SAMPLE_MAX_SECONDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"seconds must be at most {settings.PROFILE_SAMPLE_MAX_SECONDS}",
+        )
+    if _sampling.locked():
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="A sampling run is in progress"
+        )
+
+    async with _sampling:
+        profiler = SamplingProfiler(interval=interval_ms / 1000)
+        counts = await asyncio.to_thread(profiler.run, seconds)
+
+    return folded_stacks(counts)
@@ -1,12 +1,79 @@
-from fastapi import APIRouter, Path
+from typing import Optional
 
-from api.dependencies import FetcherDep, validate_platform
+from fastapi import APIRouter, Body, Path, Query
+
+from api.dependencies import FetcherDep, validate_fields, validate_platform
 from api.exceptions.api_exceptions import map_to_http_exception
-from api.response_models.responses import ChannelResponse
+from api.response_models.projection import project_response
+from api.response_models.responses import (
+    ChannelBatchItem,
+    ChannelBatchRequest,
+    ChannelBatchResponse,
+    ChannelResponse,
+)
+from core.context import Priority, set_priority
+from core.models import ChannelInfo
 
 router = APIRouter(prefix="/channels", tags=["Channels"])
 
 
+@router.post("/batch", response_model=ChannelBatchResponse)
+async def get_channel_info_batch(
+    fetcher: FetcherDep,
+    request: ChannelBatchRequest = Body(...),
+    fields: Optional[str] = Query(
+        None, description="Comma-separated channel fields to return (default: all)"
+    ),
+):
+    """Get information about many channels, with a result per item
+
+    Uses each platform's bulk lookup (50 channel IDs per YouTube call, 100
+    usernames per Twitter call); failed items carry their own status code.
+    """
+    set_priority(Priority.BATCH)
+    try:
+        requested_fields = validate_fields(fields, ChannelInfo)
+        channels = [(channel.platform, channel.identifier) for channel in request.channels]
+        results = await fetcher.get_channel_info_batch(channels, requested_fields)
+
+        items = []
+        for platform, identifier in channels:
+            result = results[(platform, identifier)]
+            if isinstance(result, Exception):
+                error = map_to_http_exception(result)
+                items.append(
+                    ChannelBatchItem(
+                        platform=platform,
+                        identifier=identifier,
+                        status_code=error.status_code,
+                        error=str(error.detail),
+                    )
+                )
+            else:
+                items.append(
+                    ChannelBatchItem(
+                        platform=platform,
+                        identifier=identifier,
+                        status_code=200,
+                        data=result,
+                    )
+                )
+
+        found = sum(item.data is not None for item in items)
+        return project_response(
+            ChannelBatchResponse(
+                data=items,
+                message=f"Retrieved {found} out of {len(items)} channels",
+            ),
+            requested_fields,
+            many=True,
+            nested="data",
+        )
+
+    except Exception as e:
+        raise map_to_http_exception(e)
+
+
 @router.get("/{platform}/{channel_identifier}", response_model=ChannelResponse)
 async def get_channel_info(
     fetcher: FetcherDep,
@@ -14,15 +81,19 @@ async def get_channel_info(
     channel_identifier: str = Path(
         ..., description="Channel identifier (username, ID, or handle)"
     ),
+    fields: Optional[str] = Query(
+        None, description="Comma-separated channel fields to return (default: all)"
+    ),
 ):
     """Get information about a social media channel/account"""
     try:
         validated_platform = validate_platform(platform)
+        requested_fields = validate_fields(fields, ChannelInfo)
         channel_info = await fetcher.get_channel_info(
-            validated_platform, channel_identifier
+            validated_platform, channel_identifier, requested_fields
         )
 
-        return ChannelResponse(data=channel_info)
+        return project_response(ChannelResponse(data=channel_info), requested_fields)
 
     except Exception as e:
         raise map_to_http_exception(e)
@@ -0,0 +1,92 @@
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Path, Query, status
+
+from api.dependencies import EngagementTrackerDep, validate_platform
+from api.exceptions.api_exceptions import map_to_http_exception
+from api.response_models.responses import (
+    EngagementSeriesData,
+    EngagementSeriesResponse,
+)
+
+router = APIRouter(prefix="/engagement", tags=["Engagement"])
+
+
+@router.post(
+    "/{platform}/{post_id}/track",
+    response_model=EngagementSeriesResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def track_post(
+    tracker: EngagementTrackerDep,
+    platform: str = Path(..., description="Social media platform"),
+    post_id: str = Path(..., description="Post ID (video ID, tweet ID, media ID)"),
+):
+    """Start sampling a post's engagement on every refresh"""
+    validated_platform = validate_platform(platform)
+    if not tracker.track(validated_platform, post_id):
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Engagement tracker is full",
+        )
+
+    return EngagementSeriesResponse(
+        data=EngagementSeriesData(platform=validated_platform, post_id=post_id),
+        message="Post is being tracked",
+    )
+
+
+@router.delete("/{platform}/{post_id}/track", response_model=EngagementSeriesResponse)
+async def untrack_post(
+    tracker: EngagementTrackerDep,
+    platform: str = Path(..., description="Social media platform"),
+    post_id: str = Path(..., description="Post ID (video ID, tweet ID, media ID)"),
+):
+    """Stop tracking a post and drop its samples"""
+    validated_platform = validate_platform(platform)
+    if not tracker.untrack(validated_platform, post_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Post is not tracked"
+        )
+
+    return EngagementSeriesResponse(message="Post is no longer tracked")
+
+
+@router.get("/{platform}/{post_id}", response_model=EngagementSeriesResponse)
+async def get_engagement_series(
+    tracker: EngagementTrackerDep,
+    platform: str = Path(..., description="Social media platform"),
+    post_id: str = Path(..., description="Post ID (video ID, tweet ID, media ID)"),
+    bucket: int = Query(0, ge=0, description="Downsample to one sample per N seconds"),
+    window: Optional[int] = Query(
+        None, ge=1, description="Only return the last N seconds (default: all)"
+    ),
+):
+    """Get a tracked post's engagement time series and growth rate"""
+    try:
+        validated_platform = validate_platform(platform)
+        series = tracker.get_series(validated_platform, post_id)
+        if series is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Post is not tracked"
+            )
+
+        since = time.time() - window if window else None
+        timestamps, metrics = series.downsample(bucket, since)
+
+        return EngagementSeriesResponse(
+            data=EngagementSeriesData(
+                platform=validated_platform,
+                post_id=post_id,
+                timestamps=[
+                    datetime.fromtimestamp(ts, tz=timezone.utc) for ts in timestamps
+                ],
+                metrics={metric: values.tolist() for metric, values in metrics.items()},
+                growth_per_hour=series.growth_per_hour(since),
+            )
+        )
+
+    except Exception as e:
+        raise map_to_http_exception(e)
@@ -0,0 +1,98 @@
+from datetime import datetime
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+
+from api.dependencies import EngagementTrackerDep, FetcherDep, validate_platform
+from api.exceptions.api_exceptions import map_to_http_exception
+from config.settings import settings
+from services import export
+
+router = APIRouter(prefix="/export", tags=["Export"])
+
+ExportFormat = Literal["ndjson", "arrow", "parquet"]
+
+
+def _check_format(format: str) -> None:
+    if not export.format_available(format):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"The {format} format is not available: pyarrow is not installed",
+        )
+
+
+def _stream(rows, dataset: str, format: str) -> StreamingResponse:
+    return StreamingResponse(
+        export.encode(rows, dataset, format, settings.EXPORT_BATCH_ROWS),
+        media_type=export.FORMATS[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{dataset}.{format}"'
+        },
+    )
+
+
+@router.get("/posts")
+async def export_posts(
+    fetcher: FetcherDep,
+    format: ExportFormat = Query("ndjson", description="ndjson, arrow or parquet"),
+    platform: Optional[List[str]] = Query(None, description="Only these platforms"),
+    channel: Optional[List[str]] = Query(
+        None, description="Only these channels (IDs, usernames or handles)"
+    ),
+    since: Optional[datetime] = Query(
+        None, description="Posts created at or after (UTC unless it has an offset)"
+    ),
+    until: Optional[datetime] = Query(None, description="Posts created before"),
+):
+    """Stream the cached latest posts, with their engagement counters
+
+    Reads the post cache and the loaded snapshot only; nothing is fetched
+    upstream.
+    """
+    try:
+        _check_format(format)
+        platforms = {validate_platform(p).value for p in platform or ()}
+        channel_ids = (
+            export.resolve_channel_ids(channel, fetcher.cached_channel_id)
+            if channel
+            else None
+        )
+
+        rows = export.post_rows(
+            fetcher.cached_posts(),
+            platforms,
+            channel_ids,
+            export.posix_time(since),
+            export.posix_time(until),
+        )
+        return _stream(rows, export.POSTS, format)
+
+    except Exception as e:
+        raise map_to_http_exception(e)
+
+
+@router.get("/engagement")
+async def export_engagement(
+    tracker: EngagementTrackerDep,
+    format: ExportFormat = Query("ndjson", description="ndjson, arrow or parquet"),
+    platform: Optional[List[str]] = Query(None, description="Only these platforms"),
+    since: Optional[datetime] = Query(
+        None, description="Samples taken at or after (UTC unless it has an offset)"
+    ),
+    until: Optional[datetime] = Query(None, description="Samples taken before"),
+):
+    """Stream the engagement samples of every tracked post, one row per sample"""
+    try:
+        _check_format(format)
+        platforms = [validate_platform(p) for p in platform or ()]
+
+        samples = tracker.samples(
+            platforms,
+            export.posix_time(since),
+            export.posix_time(until),
+        )
+        return _stream(export.engagement_rows(samples), export.ENGAGEMENT, format)
+
+    except Exception as e:
+        raise map_to_http_exception(e)
@@ -0,0 +1,54 @@
+from typing import Optional
+
+from fastapi import APIRouter, Body, HTTPException, Query, status
+
+from api.dependencies import FeedServiceDep, validate_fields
+from api.exceptions.api_exceptions import map_to_http_exception
+from api.response_models.projection import project_response
+from api.response_models.responses import FeedRequest, FeedResponse
+from core.context import Priority, set_priority
+from core.models import SocialMediaPost
+
+router = APIRouter(prefix="/feed", tags=["Feed"])
+
+
+@router.post("", response_model=FeedResponse)
+async def get_feed(
+    feed_service: FeedServiceDep,
+    request: FeedRequest = Body(...),
+    fields: Optional[str] = Query(
+        None, description="Comma-separated post fields to return (default: all)"
+    ),
+):
+    """Get a combined, newest-first timeline across many channels
+
+    Pass the returned ``next_cursor`` with the same channel set to get the
+    following page.
+    """
+    set_priority(Priority.BATCH)
+    try:
+        requested_fields = validate_fields(fields, SocialMediaPost)
+        channels = [(channel.platform, channel.identifier) for channel in request.channels]
+
+        try:
+            posts, next_cursor, errors = await feed_service.get_feed(
+                channels, request.limit, request.cursor
+            )
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid cursor: {e}"
+            )
+
+        return project_response(
+            FeedResponse(
+                data=posts,
+                next_cursor=next_cursor,
+                errors=errors,
+                message=f"Retrieved {len(posts)} posts from {len(channels)} channels",
+            ),
+            requested_fields,
+            many=True,
+        )
+
+    except Exception as e:
+        raise map_to_http_exception(e)
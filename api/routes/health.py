@@ -2,7 +2,11 @@ from fastapi import APIRouter
 from datetime import datetime, timezone
 
 from api.dependencies import FetcherDep
-from api.response_models.responses import HealthResponse
+from api.response_models.responses import (
+    CredentialStatsResponse,
+    HealthResponse,
+    SchedulerStatsResponse,
+)
 from config.settings import settings
 
 router = APIRouter(prefix="/health", tags=["Health"])
@@ -17,3 +21,15 @@ async def health_check(fetcher: FetcherDep):
         version=settings.APP_VERSION,
         available_platforms=fetcher.get_available_platforms(),
     )
+
+
+@router.get("/scheduler", response_model=SchedulerStatsResponse)
+async def scheduler_stats(fetcher: FetcherDep):
+    """Upstream queue depth and queue wait time per priority class"""
+    return fetcher.scheduler.stats()
+
+
+@router.get("/credentials", response_model=CredentialStatsResponse)
+async def credential_stats(fetcher: FetcherDep):
+    """Calls, known remaining budget and quarantine state of each API credential"""
+    return CredentialStatsResponse(data=fetcher.credential_stats())
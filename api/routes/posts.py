@@ -1,15 +1,28 @@
-from fastapi import APIRouter, Path, Body
+from typing import Optional
 
-from api.dependencies import FetcherDep, validate_platform
+from fastapi import APIRouter, Path, Body, Query
+
+from api.dependencies import (
+    FetcherDep,
+    PostWatcherDep,
+    validate_fields,
+    validate_platform,
+)
 from api.exceptions.api_exceptions import map_to_http_exception
+from api.response_models.projection import project_response
 from api.response_models.responses import (
     MultiChannelRequest,
     MultiPostResponse,
     PostResponse,
 )
+from config.settings import settings
+from core.context import Priority, set_priority
+from core.models import SocialMediaPost
 
 router = APIRouter(prefix="/posts", tags=["Posts"])
 
+FIELDS_DESCRIPTION = "Comma-separated post fields to return (default: all)"
+
 
 @router.get("/{platform}/{channel_identifier}/latest", response_model=PostResponse)
 async def get_latest_post(
@@ -18,17 +31,59 @@ async def get_latest_post(
     channel_identifier: str = Path(
         ..., description="Channel identifier (username, ID, or handle)"
     ),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
 ):
     """Get the latest post from a specific social media channel"""
     try:
         validated_platform = validate_platform(platform)
-        post = await fetcher.get_latest_post(validated_platform, channel_identifier)
+        requested_fields = validate_fields(fields, SocialMediaPost)
+        post = await fetcher.get_latest_post(
+            validated_platform, channel_identifier, requested_fields
+        )
         if not post:
             return PostResponse(
                 success=True, data=None, message="No posts found for this channel"
             )
 
-        return PostResponse(data=post)
+        return project_response(PostResponse(data=post), requested_fields)
+
+    except Exception as e:
+        raise map_to_http_exception(e)
+
+
+@router.get("/{platform}/{channel_identifier}/wait", response_model=PostResponse)
+async def wait_for_new_post(
+    watcher: PostWatcherDep,
+    platform: str = Path(..., description="Social media platform"),
+    channel_identifier: str = Path(
+        ..., description="Channel identifier (username, ID, or handle)"
+    ),
+    since_id: Optional[str] = Query(
+        None, description="ID of the latest post the client has seen"
+    ),
+    timeout: int = Query(30, ge=1, description="Seconds to wait for a new post"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+):
+    """Wait until the channel's latest post is not ``since_id`` (long poll)
+
+    Returns as soon as a different post is the latest one, or with no data
+    after ``timeout`` seconds (capped at ``LONGPOLL_MAX_TIMEOUT``); call
+    again with the newest ID seen. Waiters on a channel share one upstream
+    check per ``LONGPOLL_INTERVAL``.
+    """
+    try:
+        validated_platform = validate_platform(platform)
+        requested_fields = validate_fields(fields, SocialMediaPost)
+        post = await watcher.wait_for_new(
+            validated_platform,
+            channel_identifier,
+            since_id,
+            min(timeout, settings.LONGPOLL_MAX_TIMEOUT),
+        )
+        if not post:
+            return PostResponse(data=None, message="No new post")
+
+        return project_response(PostResponse(data=post), requested_fields)
 
     except Exception as e:
         raise map_to_http_exception(e)
@@ -36,11 +91,17 @@ async def get_latest_post(
 
 @router.post("/latest/batch", response_model=MultiPostResponse)
 async def get_latest_posts_batch(
-    fetcher: FetcherDep, request: MultiChannelRequest = Body(...)
+    fetcher: FetcherDep,
+    request: MultiChannelRequest = Body(...),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
 ):
     """Get latest posts from multiple channels across different platforms"""
+    set_priority(Priority.BATCH)
     try:
-        posts = await fetcher.get_latest_posts_from_multiple_channels(request.channels)
+        requested_fields = validate_fields(fields, SocialMediaPost)
+        posts = await fetcher.get_latest_posts_from_multiple_channels(
+            request.channels, requested_fields
+        )
 
         # Separate successful results from errors
         successful_posts = {}
@@ -52,10 +113,14 @@ async def get_latest_posts_batch(
             else:
                 errors[platform_str] = "Failed to fetch post or no posts found"
 
-        return MultiPostResponse(
-            data=successful_posts,
-            errors=errors,
-            message=f"Retrieved posts from {len(successful_posts)} out of {len(request.channels)} platforms",
+        return project_response(
+            MultiPostResponse(
+                data=successful_posts,
+                errors=errors,
+                message=f"Retrieved posts from {len(successful_posts)} out of {len(request.channels)} platforms",
+            ),
+            requested_fields,
+            many=True,
         )
 
     except Exception as e:
@@ -0,0 +1,66 @@
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import PlainTextResponse
+
+from api.dependencies import FetcherDep
+from services.websub_service import self_topic
+from services.youtube_feed import iter_feed_entries
+
+router = APIRouter(prefix="/websub", tags=["WebSub"])
+
+
+def _require_websub(fetcher):
+    if fetcher.websub is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="WebSub is not enabled"
+        )
+    return fetcher.websub
+
+
+@router.get("/youtube", response_class=PlainTextResponse)
+async def verify_youtube_subscription(
+    fetcher: FetcherDep,
+    mode: str = Query(..., alias="hub.mode"),
+    topic: str = Query(..., alias="hub.topic"),
+    challenge: str = Query(..., alias="hub.challenge"),
+    lease_seconds: Optional[int] = Query(None, alias="hub.lease_seconds"),
+):
+    """Answer the hub's subscription verification challenge"""
+    websub = _require_websub(fetcher)
+    echoed = websub.verify(mode, topic, challenge, lease_seconds)
+    if echoed is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Unknown subscription topic"
+        )
+
+    return PlainTextResponse(echoed)
+
+
+@router.post("/youtube", status_code=status.HTTP_204_NO_CONTENT)
+async def receive_youtube_notification(
+    fetcher: FetcherDep,
+    request: Request,
+    signature: Optional[str] = Header(None, alias="X-Hub-Signature"),
+    link: Optional[str] = Header(None),
+):
+    """Receive a new/updated/deleted video notification from the hub
+
+    Only signed notifications for channels with a live subscription are
+    applied; anything else could rewrite cached posts.
+    """
+    websub = _require_websub(fetcher)
+    body = await request.body()
+
+    if not websub.verify_signature(body, signature):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Invalid signature"
+        )
+
+    try:
+        entries = list(iter_feed_entries([body]))
+    except Exception:
+        entries = []
+    fetcher.apply_feed_entries(websub.accepted_entries(self_topic(link), entries))
+
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,85 @@
+"""Report the memory cost of cached posts
+
+Run from the project root:
+
+    uv run python -m benchmarks.bench_post_cache --count 100000
+"""
+
+import argparse
+import gc
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+from core.models import Platform, SocialMediaPost
+from core.records import PostRecord
+from utils.cache import ByteBoundedCache
+
+
+def make_posts(count: int, authors: int):
+    """Generate YouTube-like posts, including a realistic raw payload"""
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    for i in range(count):
+        channel_id = f"UC{(i % authors):022d}"
+        video_id = f"v{i:010d}"
+        title = f"Episode {i}: what we learned shipping feature number {i % 977}"
+        yield SocialMediaPost(
+            id=video_id,
+            platform=Platform.YOUTUBE,
+            author=f"Channel {i % authors}",
+            author_id=channel_id,
+            content=title,
+            created_at=start + timedelta(minutes=i),
+            url=f"https://www.youtube.com/watch?v={video_id}",
+            media_urls=[f"https://img.youtube.com/vi/{video_id}/maxresdefault.jpg"],
+            engagement={"views": i * 31, "likes": i * 3, "comments": i % 500},
+            raw_data={
+                "kind": "youtube#searchResult",
+                "id": {"kind": "youtube#video", "videoId": video_id},
+                "snippet": {
+                    "publishedAt": (start + timedelta(minutes=i)).isoformat(),
+                    "channelId": channel_id,
+                    "title": title,
+                    "channelTitle": f"Channel {i % authors}",
+                },
+            },
+        )
+
+
+def measure(build) -> int:
+    """Bytes still allocated by whatever ``build`` returns"""
+    gc.collect()
+    tracemalloc.start()
+    kept = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return current
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--authors", type=int, default=500)
+    args = parser.parse_args()
+    count = args.count
+
+    models_bytes = measure(lambda: list(make_posts(count, args.authors)))
+
+    def fill_cache():
+        cache = ByteBoundedCache(max_bytes=2**40, ttl=3600, sizeof=PostRecord.nbytes)
+        for post in make_posts(count, args.authors):
+            cache.set(("youtube", post.author_id + post.id), PostRecord.from_post(post))
+        return cache
+
+    cache = fill_cache()
+    cache_bytes = measure(fill_cache)
+
+    print(f"posts: {count:,} ({args.authors} authors)")
+    print(f"SocialMediaPost (with raw_data): {models_bytes / count:8.1f} bytes/post")
+    print(f"PostRecord in cache (measured):  {cache_bytes / count:8.1f} bytes/post")
+    print(f"PostRecord in cache (accounted): {cache.current_bytes / count:8.1f} bytes/post")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,375 @@
+"""Command line tools
+
+Run from the project root:
+
+    uv run python cli.py export --format parquet --output posts.parquet
+    uv run python cli.py fetch channels.txt --output posts.jsonl --checkpoint done.txt
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from contextlib import nullcontext
+from datetime import datetime
+from typing import List, Optional, Set, TextIO, Tuple
+
+from config.settings import settings
+from core.context import Priority, RequestContext, reset_context, set_context
+from core.exceptions import ChannelNotFoundError
+from core.models import ChannelInfo, Platform, SocialMediaPost
+from services import export
+from services.fetcher_service import CHANNEL_BATCH_CHUNK, SocialMediaFetcher
+from services.snapshot import CHANNEL_ID, POST, SnapshotReader
+from utils.latency import LatencyWindow
+
+
+def _timestamp(value: str) -> float:
+    """Parse an ISO 8601 date/time (UTC unless it has an offset)"""
+    # fromisoformat only takes a "Z" suffix from Python 3.11 on
+    return export.posix_time(datetime.fromisoformat(value.replace("Z", "+00:00")))
+
+
+def _positive(kind):
+    """argparse type: ``kind`` values greater than zero"""
+
+    def parse(value: str):
+        parsed = kind(value)
+        if parsed <= 0:
+            raise argparse.ArgumentTypeError(f"must be greater than 0: {value}")
+        return parsed
+
+    parse.__name__ = kind.__name__  # named in argparse's "invalid ..." errors
+    return parse
+
+
+def export_command(args: argparse.Namespace) -> int:
+    """Export the posts of a cache snapshot
+
+    Includes expired entries: they are the last known state of those posts.
+    """
+    if not args.snapshot:
+        print("No snapshot: pass --snapshot or set SNAPSHOT_PATH", file=sys.stderr)
+        return 2
+    if not export.format_available(args.format):
+        print(
+            f"The {args.format} format needs pyarrow: "
+            "pip install 'social-media-scrap[export]'",
+            file=sys.stderr,
+        )
+        return 2
+
+    reader = SnapshotReader(args.snapshot)
+    try:
+        channel_ids = None
+        if args.channel:
+            channel_ids = export.resolve_channel_ids(
+                args.channel,
+                lambda platform, identifier: (
+                    reader.get(CHANNEL_ID, (platform, identifier)) or (None,)
+                )[0],
+            )
+
+        records = (
+            reader.get(POST, key)[0]
+            for kind, key, _ in reader.keys()
+            if kind == POST
+        )
+        rows = export.post_rows(
+            records, set(args.platform or ()), channel_ids, args.since, args.until
+        )
+
+        count = 0
+
+        def counted(rows):
+            nonlocal count
+            for row in rows:
+                count += 1
+                yield row
+
+        output = (
+            nullcontext(sys.stdout.buffer)
+            if args.output == "-"
+            else open(args.output, "wb")
+        )
+        with output as f:
+            for chunk in export.encode(
+                counted(rows), export.POSTS, args.format, args.batch_rows
+            ):
+                f.write(chunk)
+    finally:
+        reader.close()
+
+    print(f"Exported {count} posts", file=sys.stderr)
+    return 0
+
+
+def _parse_pair(line: str) -> Tuple[str, str]:
+    """``platform identifier`` or ``platform,identifier`` -> both parts"""
+    platform, _, identifier = line.replace(",", " ", 1).partition(" ")
+    return platform.strip().lower(), identifier.strip()
+
+
+def _load_checkpoint(path: Optional[str]) -> Set[Tuple[str, str]]:
+    if not path:
+        return set()
+    try:
+        with open(path) as f:
+            return {
+                tuple(line.rstrip("\n").split("\t", 1)) for line in f if "\t" in line
+            }
+    except FileNotFoundError:
+        return set()
+
+
+class _BatchFetch:
+    """Runs (platform, identifier) pairs through a ``SocialMediaFetcher``
+
+    ``concurrency`` workers take pairs from a bounded queue, so input is
+    read as it is consumed. Each result is written as one JSON line as soon
+    as it is known. Pairs that succeeded or failed for good (not found,
+    bad input) are appended to the checkpoint and skipped on the next run;
+    others (rate limits, timeouts) are retried then.
+    """
+
+    def __init__(
+        self,
+        args: argparse.Namespace,
+        output: TextIO,
+        checkpoint: Optional[TextIO],
+    ):
+        self.args = args
+        self.output = output
+        self.checkpoint = checkpoint
+        self.done = _load_checkpoint(args.checkpoint)
+        self.fetcher = SocialMediaFetcher()
+        self.fetcher.websub = None  # no callback server to receive pushes
+        self.chunk = CHANNEL_BATCH_CHUNK if args.mode == "channel" else 1
+        self.latencies = LatencyWindow(maxlen=65536)
+        self.counts = {"ok": 0, "failed": 0, "skipped": 0}
+
+    async def _read(self, source: TextIO, queue: asyncio.Queue) -> None:
+        # About 64 KiB of lines per read keeps the queue full enough for
+        # channel lookups to go out in whole chunks
+        while lines := await asyncio.to_thread(source.readlines, 65536):
+            for line in lines:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                pair = _parse_pair(line)
+                if pair in self.done:
+                    self.counts["skipped"] += 1
+                    continue
+                await queue.put(pair)
+
+        for _ in range(self.args.concurrency):
+            await queue.put(None)
+
+    async def _lookup(self, pairs: List[Tuple[Platform, str]]) -> list:
+        if self.args.mode == "channel":
+            results = await self.fetcher.get_channel_info_batch(pairs, self.args.fields)
+            return [results[pair] for pair in pairs]
+
+        platform, identifier = pairs[0]
+        try:
+            post = await self.fetcher.get_latest_post(
+                platform, identifier, self.args.fields
+            )
+            return [post]
+        except Exception as e:
+            return [e]
+
+    def _write(self, pair: Tuple[str, str], result) -> None:
+        platform, identifier = pair
+        line = {"platform": platform, "identifier": identifier}
+        if isinstance(result, Exception):
+            line.update(ok=False, error=str(result), error_type=type(result).__name__)
+        else:
+            data = (
+                result.model_dump(mode="json", include=self.args.fields)
+                if result is not None
+                else None
+            )
+            line.update(ok=True, data=data)
+
+        self.output.write(json.dumps(line, ensure_ascii=False) + "\n")
+        self.output.flush()
+        self.counts["ok" if line["ok"] else "failed"] += 1
+
+        final = not isinstance(result, Exception) or isinstance(
+            result, (ChannelNotFoundError, ValueError)
+        )
+        if final and self.checkpoint is not None:
+            self.checkpoint.write(f"{platform}\t{identifier}\n")
+            self.checkpoint.flush()
+
+    async def _worker(self, queue: asyncio.Queue) -> None:
+        finished = False
+        while not finished:
+            pairs = []
+            while len(pairs) < self.chunk:
+                # Block for the first pair only, then take what is queued
+                if pairs and queue.empty():
+                    break
+                pair = await queue.get()
+                if pair is None:
+                    finished = True
+                    break
+                pairs.append(pair)
+
+            valid = []
+            for platform, identifier in pairs:
+                try:
+                    valid.append((Platform(platform), identifier))
+                except ValueError as e:
+                    self._write((platform, identifier), e)
+            if not valid:
+                continue
+
+            token = set_context(
+                RequestContext(
+                    client_id="cli",
+                    priority=Priority.BATCH,
+                    deadline=time.monotonic() + self.args.timeout,
+                )
+            )
+            started = time.monotonic()
+            try:
+                results = await self._lookup(valid)
+            finally:
+                reset_context(token)
+            elapsed = time.monotonic() - started
+
+            for (platform, identifier), result in zip(valid, results):
+                self.latencies.add(elapsed)
+                self._write((platform.value, identifier), result)
+
+    async def run(self, source: TextIO) -> None:
+        queue: asyncio.Queue = asyncio.Queue(
+            maxsize=self.args.concurrency * self.chunk
+        )
+        await asyncio.gather(
+            self._read(source, queue),
+            *(self._worker(queue) for _ in range(self.args.concurrency)),
+        )
+
+    def summary(self, elapsed: float) -> str:
+        fetched = self.counts["ok"] + self.counts["failed"]
+        p50, p95 = self.latencies.percentile(0.5), self.latencies.percentile(0.95)
+        rate = fetched / elapsed if elapsed > 0 else 0.0
+        summary = (
+            f"Fetched {fetched} in {elapsed:.1f}s ({rate:.1f}/s): "
+            f"{self.counts['ok']} ok, {self.counts['failed']} failed, "
+            f"{self.counts['skipped']} skipped (checkpoint)"
+        )
+        if p50 is not None:
+            summary += f"; latency p50 {p50:.2f}s, p95 {p95:.2f}s"
+        return summary
+
+
+def fetch_command(args: argparse.Namespace) -> int:
+    """Fetch latest posts or channel info for many channels, without HTTP"""
+    model = ChannelInfo if args.mode == "channel" else SocialMediaPost
+    if args.fields is not None:
+        args.fields = {name.strip() for name in args.fields.split(",") if name.strip()}
+        unknown = args.fields.difference(model.model_fields)
+        if unknown:
+            print(f"Invalid fields {sorted(unknown)}", file=sys.stderr)
+            return 2
+
+    # Upstream slots follow the requested concurrency
+    settings.UPSTREAM_CONCURRENCY = args.concurrency
+
+    source = sys.stdin if args.input == "-" else open(args.input)
+    # Resuming appends to the results of the interrupted run
+    mode = "a" if args.checkpoint else "w"
+    output = nullcontext(sys.stdout) if args.output == "-" else open(args.output, mode)
+    checkpoint = open(args.checkpoint, "a") if args.checkpoint else nullcontext()
+
+    started = time.monotonic()
+    with source, output as out, checkpoint as checkpoint_file:
+        batch = _BatchFetch(args, out, checkpoint_file)
+        try:
+            asyncio.run(batch.run(source))
+        except KeyboardInterrupt:
+            print(
+                "Interrupted; rerun with the same --checkpoint to resume",
+                file=sys.stderr,
+            )
+
+    print(batch.summary(time.monotonic() - started), file=sys.stderr)
+    return 1 if batch.counts["failed"] else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=settings.APP_NAME)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = commands.add_parser(
+        "export", help="Export cached posts from a snapshot file (no upstream calls)"
+    )
+    export_parser.add_argument(
+        "--snapshot", default=settings.SNAPSHOT_PATH, help="default: SNAPSHOT_PATH"
+    )
+    export_parser.add_argument(
+        "--format", choices=sorted(export.FORMATS), default="ndjson"
+    )
+    export_parser.add_argument("--output", default="-", help="file, or - for stdout")
+    export_parser.add_argument(
+        "--platform", action="append", help="only this platform (repeatable)"
+    )
+    export_parser.add_argument(
+        "--channel",
+        action="append",
+        help="only this channel ID, username or handle (repeatable)",
+    )
+    export_parser.add_argument(
+        "--since", type=_timestamp, help="posts created at or after (ISO 8601)"
+    )
+    export_parser.add_argument(
+        "--until", type=_timestamp, help="posts created before (ISO 8601)"
+    )
+    export_parser.add_argument(
+        "--batch-rows", type=_positive(int), default=settings.EXPORT_BATCH_ROWS
+    )
+    export_parser.set_defaults(handler=export_command)
+
+    fetch_parser = commands.add_parser(
+        "fetch",
+        help="Fetch many channels directly through the fetcher, writing JSON lines",
+    )
+    fetch_parser.add_argument(
+        "input",
+        nargs="?",
+        default="-",
+        help="file of 'platform identifier' lines, or - for stdin",
+    )
+    fetch_parser.add_argument(
+        "--mode",
+        choices=("latest", "channel"),
+        default="latest",
+        help="latest post (default) or channel info",
+    )
+    fetch_parser.add_argument("--fields", help="comma-separated fields to fetch")
+    fetch_parser.add_argument("--output", default="-", help="file, or - for stdout")
+    fetch_parser.add_argument(
+        "--concurrency", type=_positive(int), default=settings.UPSTREAM_CONCURRENCY
+    )
+    fetch_parser.add_argument(
+        "--timeout",
+        type=_positive(float),
+        default=settings.REQUEST_TIMEOUT,
+        help="seconds per lookup",
+    )
+    fetch_parser.add_argument(
+        "--checkpoint", help="file of finished pairs; rerun with it to resume"
+    )
+    fetch_parser.set_defaults(handler=fetch_command)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
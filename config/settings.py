@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Literal, Optional
 from pydantic_settings import BaseSettings
 
 
@@ -17,22 +17,95 @@ class Settings(BaseSettings):
     ALLOWED_HOSTS: list[str] = ["*"]
     CORS_ORIGINS: list[str] = ["*"]
 
-    # YouTube API
+    # YouTube API (several keys, e.g. from different projects, are pooled:
+    # each call uses the key with the most daily quota left)
     YOUTUBE_API_KEY: Optional[str] = None
+    YOUTUBE_API_KEYS: list[str] = []  # JSON list, in addition to YOUTUBE_API_KEY
+    YOUTUBE_DAILY_QUOTA: int = 10000  # units per key, reset at midnight Pacific
+    # Latest-post strategy: "feed" (public Atom feed, no quota), "playlist"
+    # (uploads playlist, 1 unit) or "search" (search.list, 100 units); the
+    # others are used as fallbacks
+    YOUTUBE_FETCH_STRATEGY: Literal["feed", "playlist", "search"] = "feed"
 
     # Twitter/X API
     TWITTER_BEARER_TOKEN: Optional[str] = None
+    TWITTER_BEARER_TOKENS: list[str] = []  # JSON list, pooled like YouTube keys
     TWITTER_API_KEY: Optional[str] = None
     TWITTER_API_SECRET: Optional[str] = None
     TWITTER_ACCESS_TOKEN: Optional[str] = None
     TWITTER_ACCESS_TOKEN_SECRET: Optional[str] = None
 
+    # Instagram Graph API (business discovery through your own business account)
+    INSTAGRAM_ACCESS_TOKEN: Optional[str] = None
+    INSTAGRAM_ACCOUNT_ID: Optional[str] = None  # your Instagram business account ID
+    INSTAGRAM_GRAPH_API_VERSION: str = "v21.0"
+
+    # Engagement tracking
+    ENGAGEMENT_REFRESH_INTERVAL: int = 900  # 15 minutes
+    ENGAGEMENT_MAX_TRACKED: int = 10000
+    ENGAGEMENT_MAX_SAMPLES: int = 2048  # per post, older samples get thinned
+
     # General settings
-    REQUEST_TIMEOUT: int = 30
+    REQUEST_TIMEOUT: int = 30  # default and maximum per-request deadline (X-Request-Timeout)
+    UPSTREAM_CONCURRENCY: int = 4  # concurrent upstream calls (scheduler slots)
+    # Hedged reads: re-send a latest-post/channel lookup still running after
+    # that call's p95 latency and take the first answer (spends extra quota)
+    HEDGE_REQUESTS: bool = False
+    HEDGE_MIN_SAMPLES: int = 20  # latencies observed before hedging starts
     MAX_RETRIES: int = 3
+    # Quarantine of a rate-limited API key/token when the API gives no reset time
+    CREDENTIAL_QUARANTINE_SECONDS: int = 60
     RATE_LIMIT_REQUESTS: int = 100
     RATE_LIMIT_WINDOW: int = 3600  # 1 hour
 
+    # Inbound rate limiting (per X-API-Key header, or per client IP)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_TRUST_FORWARDED: bool = False  # key on X-Forwarded-For behind a proxy
+    # JSON list of X-API-Key values that get a budget of their own; requests
+    # with other or no keys are limited by IP
+    RATE_LIMIT_API_KEYS: list[str] = []
+    # Path prefixes under API_V1_PREFIX; the API docs are always exempt
+    RATE_LIMIT_EXEMPT_PATHS: list[str] = ["/health", "/websub"]
+
+    # Admin endpoints and ?profile=1 request profiling (disabled when unset)
+    ADMIN_TOKEN: Optional[str] = None
+    PROFILE_SAMPLE_MAX_SECONDS: int = 60
+
+    # Latest-post cache
+    POST_CACHE_TTL: int = 300  # 5 minutes
+    POST_CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # 64 MiB
+    CHANNEL_ID_CACHE_TTL: int = 86400  # 1 day
+    CHANNEL_ID_CACHE_MAX_BYTES: int = 8 * 1024 * 1024  # 8 MiB
+    CHANNEL_INFO_CACHE_TTL: int = 3600  # 1 hour
+    CHANNEL_INFO_CACHE_MAX_BYTES: int = 8 * 1024 * 1024  # 8 MiB
+
+    # Negative cache for channels not found / without posts
+    NEGATIVE_CACHE_TTL: int = 600  # 10 minutes
+    NEGATIVE_CACHE_MAX_BYTES: int = 4 * 1024 * 1024  # 4 MiB
+    NEGATIVE_BLOOM_CAPACITY: int = 100000  # per generation (~240 KiB at 1e-4)
+    NEGATIVE_BLOOM_ERROR_RATE: float = 0.0001
+
+    # Cache snapshots for warm starts (disabled unless a path is set; on
+    # Vercel use a path under /tmp)
+    SNAPSHOT_PATH: Optional[str] = None
+    SNAPSHOT_INTERVAL: int = 300  # 5 minutes
+    SNAPSHOT_REFRESH_LIMIT: int = 1000  # stale channels re-fetched after loading
+
+    # Long-poll /posts/.../wait: one shared upstream check per channel and
+    # interval while anyone waits (pushes and other fetches wake it sooner)
+    LONGPOLL_INTERVAL: int = 15
+    LONGPOLL_MAX_TIMEOUT: int = 60
+
+    # Bulk export (Arrow/Parquet formats need the "export" extra)
+    EXPORT_BATCH_ROWS: int = 5000  # rows per record batch / NDJSON chunk
+
+    # YouTube WebSub push notifications (disabled unless a callback URL is set)
+    WEBSUB_CALLBACK_URL: Optional[str] = None  # e.g. https://host/api/v1/websub/youtube
+    WEBSUB_HUB_URL: str = "https://pubsubhubbub.appspot.com/subscribe"
+    WEBSUB_SECRET: Optional[str] = None  # required with WEBSUB_CALLBACK_URL
+    WEBSUB_LEASE_SECONDS: int = 864000  # 10 days
+    WEBSUB_RENEW_MARGIN: int = 86400  # renew a day before expiry
+
     class Config:
         env_file = ".env"
         case_sensitive = True
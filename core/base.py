@@ -1,10 +1,16 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Dict, List, Optional, Sequence, Set, Tuple, Union
+from .exceptions import SocialMediaFetcherError
 from .models import Platform, SocialMediaPost, ChannelInfo
 
 class BaseSocialMediaService(ABC):
     """Abstract base class for social media services"""
     
+    # Whether methods taking a channel identifier accept the resolved channel
+    # ID as well (spelled by ``channel_id_identifier``), which lets callers
+    # skip resolving identifiers they cached
+    accepts_channel_ids: bool = False
+    
     def __init__(self):
         self.platform_name: Platform = self._get_platform_name()
     
@@ -14,16 +20,77 @@ class BaseSocialMediaService(ABC):
         pass
     
     @abstractmethod
-    def get_latest_post(self, channel_identifier: str) -> Optional[SocialMediaPost]:
-        """Get the latest post from a channel/account"""
+    def get_latest_post(
+        self, channel_identifier: str, fields: Optional[Set[str]] = None
+    ) -> Optional[SocialMediaPost]:
+        """Get the latest post from a channel/account
+
+        ``fields`` restricts the ``SocialMediaPost`` fields the caller needs;
+        ``None`` means all of them. Services use it to request less upstream.
+        """
         pass
     
     @abstractmethod
-    def get_channel_info(self, channel_identifier: str) -> ChannelInfo:
-        """Get information about the channel/account"""
+    def get_channel_info(
+        self, channel_identifier: str, fields: Optional[Set[str]] = None
+    ) -> ChannelInfo:
+        """Get information about the channel/account
+
+        ``fields`` restricts the ``ChannelInfo`` fields the caller needs;
+        ``None`` means all of them.
+        """
         pass
     
+    def get_recent_posts(
+        self, channel_identifier: str, limit: int, page_token: Optional[str] = None
+    ) -> Tuple[List[SocialMediaPost], Optional[str]]:
+        """Get a page of recent posts, newest first, and the next page token
+
+        Services without timeline pagination only expose their latest post.
+        """
+        if page_token is not None:
+            return [], None
+
+        post = self.get_latest_post(channel_identifier)
+        return ([post] if post else []), None
+
+    def get_channel_info_batch(
+        self, channel_identifiers: Sequence[str], fields: Optional[Set[str]] = None
+    ) -> Dict[str, Union[ChannelInfo, Exception]]:
+        """Get many channels; the result or error per identifier
+
+        Platforms with bulk lookup endpoints override this; the default looks
+        the channels up one at a time.
+        """
+        results: Dict[str, Union[ChannelInfo, Exception]] = {}
+        for identifier in channel_identifiers:
+            try:
+                results[identifier] = self.get_channel_info(identifier, fields)
+            except SocialMediaFetcherError as e:
+                results[identifier] = e
+        return results
+
+    @abstractmethod
+    def get_engagement_batch(self, post_ids: Sequence[str]) -> Dict[str, Dict[str, int]]:
+        """Get current engagement counters for many posts at once
+
+        Posts that no longer exist are left out of the result.
+        """
+        pass
+
     @abstractmethod
     def validate_credentials(self) -> bool:
         """Validate API credentials"""
-        pass
\ No newline at end of file
+        pass
+
+    def channel_id_identifier(self, channel_id: str) -> str:
+        """Identifier naming the channel with this resolved ID
+
+        Only used when ``accepts_channel_ids`` is set.
+        """
+        return channel_id
+
+    @staticmethod
+    def _wants(fields: Optional[Set[str]], name: str) -> bool:
+        """Whether the caller asked for ``name`` (``None`` means every field)"""
+        return fields is None or name in fields
@@ -0,0 +1,59 @@
+import asyncio
+import time
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, replace
+from enum import IntEnum
+from typing import Optional
+
+
+class Priority(IntEnum):
+    """Scheduling class of upstream work; lower values are served first"""
+
+    INTERACTIVE = 0
+    BATCH = 1
+    BACKGROUND = 2
+
+
+@dataclass(frozen=True)
+class RequestContext:
+    """Who is asking for upstream work, how urgently, and until when"""
+
+    client_id: str = "internal"
+    priority: Priority = Priority.INTERACTIVE
+    deadline: Optional[float] = None  # time.monotonic() value
+    disconnected: Optional[asyncio.Event] = None
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left before the deadline (``None`` if there is none)"""
+        if self.deadline is None:
+            return None
+        return self.deadline - time.monotonic()
+
+    def expired(self) -> bool:
+        """Whether the caller passed its deadline or went away"""
+        if self.disconnected is not None and self.disconnected.is_set():
+            return True
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+
+_request_context: ContextVar[RequestContext] = ContextVar(
+    "request_context", default=RequestContext()
+)
+
+
+def current_context() -> RequestContext:
+    return _request_context.get()
+
+
+def set_context(context: RequestContext) -> Token:
+    """Set the context for the current task (and tasks it creates later)"""
+    return _request_context.set(context)
+
+
+def reset_context(token: Token) -> None:
+    _request_context.reset(token)
+
+
+def set_priority(priority: Priority) -> None:
+    """Change the scheduling class of the current task's upstream calls"""
+    _request_context.set(replace(_request_context.get(), priority=priority))
@@ -16,4 +16,8 @@ class RateLimitError(SocialMediaFetcherError):
 
 class ChannelNotFoundError(SocialMediaFetcherError):
     """Exception raised when channel/account is not found"""
-    pass
\ No newline at end of file
+    pass
+
+class DeadlineExceededError(SocialMediaFetcherError):
+    """Exception raised when a request runs out of time or its caller went away"""
+    pass
@@ -0,0 +1,103 @@
+import sys
+from datetime import datetime, timezone
+from typing import Tuple
+
+from .models import Platform, SocialMediaPost
+
+
+class PostRecord:
+    """Compact in-memory representation of a ``SocialMediaPost``
+
+    Used for cached/stored posts. It keeps no ``raw_data``, avoids the
+    per-instance ``__dict__`` and validation state of a Pydantic model, and
+    interns the strings repeated across many posts (platform, author, author
+    ID and engagement keys). Convert with ``to_post`` at the API boundary.
+    """
+
+    __slots__ = (
+        "id",
+        "platform",
+        "author",
+        "author_id",
+        "content",
+        "created_at",
+        "url",
+        "media_urls",
+        "engagement",
+    )
+
+    def __init__(
+        self,
+        id: str,
+        platform: str,
+        author: str,
+        author_id: str,
+        content: str,
+        created_at: float,
+        url: str,
+        media_urls: Tuple[str, ...] = (),
+        engagement: Tuple[Tuple[str, int], ...] = (),
+    ):
+        self.id = id
+        self.platform = sys.intern(platform)
+        self.author = sys.intern(author)
+        self.author_id = sys.intern(author_id)
+        self.content = content
+        self.created_at = created_at  # POSIX timestamp (UTC)
+        self.url = url
+        self.media_urls = media_urls
+        self.engagement = engagement
+
+    @classmethod
+    def from_post(cls, post: SocialMediaPost) -> "PostRecord":
+        """Build a record from a post, dropping its raw payload"""
+        created_at = post.created_at
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+
+        return cls(
+            id=post.id,
+            platform=post.platform.value,
+            author=post.author,
+            author_id=post.author_id,
+            content=post.content,
+            created_at=created_at.timestamp(),
+            url=post.url,
+            media_urls=tuple(post.media_urls),
+            engagement=tuple(
+                (sys.intern(metric), value) for metric, value in post.engagement.items()
+            ),
+        )
+
+    def to_post(self) -> SocialMediaPost:
+        """Rebuild the API model (data was validated when the record was made)"""
+        return SocialMediaPost.model_construct(
+            id=self.id,
+            platform=Platform(self.platform),
+            author=self.author,
+            author_id=self.author_id,
+            content=self.content,
+            created_at=datetime.fromtimestamp(self.created_at, tz=timezone.utc),
+            url=self.url,
+            media_urls=list(self.media_urls),
+            engagement=dict(self.engagement),
+            raw_data=None,
+        )
+
+    def nbytes(self) -> int:
+        """Approximate memory held by this record
+
+        Interned strings are shared between records and are not counted.
+        """
+        size = sys.getsizeof(self) + sys.getsizeof(self.created_at)
+        for value in (self.id, self.content, self.url):
+            size += sys.getsizeof(value)
+
+        size += sys.getsizeof(self.media_urls)
+        size += sum(sys.getsizeof(url) for url in self.media_urls)
+
+        size += sys.getsizeof(self.engagement)
+        for pair in self.engagement:
+            size += sys.getsizeof(pair) + sys.getsizeof(pair[1])
+
+        return size
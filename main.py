@@ -1,11 +1,27 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse
+from fastapi.responses import JSONResponse, RedirectResponse
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
-from api.middleware import TimingMiddleware
-from api.routes import channels, health, posts
+from api.dependencies import get_engagement_tracker, get_social_media_fetcher
+from api.middleware import (
+    ProfilingMiddleware,
+    RateLimitMiddleware,
+    RequestContextMiddleware,
+    TimingMiddleware,
+)
+from api.routes import (
+    admin,
+    channels,
+    engagement,
+    export,
+    feed,
+    health,
+    posts,
+    websub,
+)
 from config.settings import settings
 
 
@@ -24,10 +40,40 @@ async def lifespan(app: FastAPI):
     logger.info(f"Starting {settings.APP_NAME} v{settings.APP_VERSION}")
     logger.info(f"Debug mode: {settings.DEBUG}")
 
+    background_tasks = [asyncio.create_task(get_engagement_tracker().run())]
+    fetcher = get_social_media_fetcher()
+
+    if settings.SNAPSHOT_PATH:
+        loaded = fetcher.load_snapshot(settings.SNAPSHOT_PATH)
+        logger.info(f"Loaded {loaded} cache entries from {settings.SNAPSHOT_PATH}")
+        background_tasks.append(
+            asyncio.create_task(
+                fetcher.refresh_stale_snapshot_entries(settings.SNAPSHOT_REFRESH_LIMIT)
+            )
+        )
+        background_tasks.append(
+            asyncio.create_task(
+                fetcher.run_snapshots(settings.SNAPSHOT_PATH, settings.SNAPSHOT_INTERVAL)
+            )
+        )
+
+    if fetcher.websub is not None:
+        logger.info(f"WebSub enabled, callback: {fetcher.websub.callback_url}")
+        background_tasks.append(asyncio.create_task(fetcher.websub.run_renewals()))
+
     yield
 
     # Shutdown
     logger.info("Shutting down application")
+    for task in background_tasks:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            # e.g. the final cache snapshot; must not abort the shutdown
+            logger.exception("Background task failed during shutdown")
 
 
 # Create FastAPI app
@@ -43,6 +89,15 @@ app = FastAPI(
 # Add middleware
 app.add_middleware(TimingMiddleware)
 
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware)
+
+# Outside TimingMiddleware so route handlers inherit the request context
+app.add_middleware(RequestContextMiddleware)
+
+# ?profile=1 (admin only); outside the other middleware so their cost shows too
+app.add_middleware(ProfilingMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.CORS_ORIGINS,
@@ -55,6 +110,11 @@ app.add_middleware(
 app.include_router(health.router, prefix=settings.API_V1_PREFIX)
 app.include_router(posts.router, prefix=settings.API_V1_PREFIX)
 app.include_router(channels.router, prefix=settings.API_V1_PREFIX)
+app.include_router(feed.router, prefix=settings.API_V1_PREFIX)
+app.include_router(websub.router, prefix=settings.API_V1_PREFIX)
+app.include_router(engagement.router, prefix=settings.API_V1_PREFIX)
+app.include_router(export.router, prefix=settings.API_V1_PREFIX)
+app.include_router(admin.router, prefix=settings.API_V1_PREFIX)
 
 
 @app.get("/")
@@ -77,12 +137,19 @@ async def api_info():
 # Error handlers
 @app.exception_handler(404)
 async def not_found_handler(request, exc):
-    return HTTPException(
+    # Keep specific messages (e.g. channel not found) over the generic one
+    message = getattr(exc, "detail", None)
+    if not message or message == "Not Found":
+        message = "The requested resource was not found"
+
+    return JSONResponse(
         status_code=404,
-        detail={
-            "error": "Not Found",
-            "message": "The requested resource was not found",
-            "docs": settings.DOCS_URL,
+        content={
+            "detail": {
+                "error": "Not Found",
+                "message": message,
+                "docs": settings.DOCS_URL,
+            }
         },
     )
 
@@ -0,0 +1,216 @@
+import asyncio
+import logging
+import time
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from config.settings import settings
+from core.context import Priority, RequestContext, set_context
+from core.models import Platform
+from services.fetcher_service import SocialMediaFetcher
+
+logger = logging.getLogger(__name__)
+
+
+class EngagementSeries:
+    """Engagement samples of one post, stored column-wise
+
+    Timestamps and each metric live in their own typed ``array`` (8 bytes
+    per sample) instead of one dict per sample. When a series reaches
+    ``max_samples``, the older half is thinned to every other sample, so
+    recent history stays dense while the total stays bounded.
+    """
+
+    __slots__ = ("timestamps", "metrics", "max_samples")
+
+    def __init__(self, max_samples: int):
+        self.timestamps = array("d")
+        self.metrics: Dict[str, array] = {}
+        self.max_samples = max_samples
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def append(self, timestamp: float, engagement: Dict[str, int]) -> None:
+        """Add a sample; metrics missing from it repeat their last value"""
+        for metric in engagement.keys() - self.metrics.keys():
+            # A metric first seen now has no history: backfill with zeros
+            self.metrics[metric] = array("q", bytes(8 * len(self.timestamps)))
+
+        self.timestamps.append(timestamp)
+        for metric, values in self.metrics.items():
+            values.append(engagement.get(metric, values[-1] if values else 0))
+
+        if len(self.timestamps) >= self.max_samples:
+            self._thin()
+
+    def _thin(self) -> None:
+        half = len(self.timestamps) // 2
+        self.timestamps = self.timestamps[:half:2] + self.timestamps[half:]
+        for metric, values in self.metrics.items():
+            self.metrics[metric] = values[:half:2] + values[half:]
+
+    def _window_start(self, since: Optional[float]) -> int:
+        """Index of the first sample at or after ``since``"""
+        return 0 if since is None else bisect_left(self.timestamps, since)
+
+    def downsample(
+        self, bucket_seconds: float, since: Optional[float] = None
+    ) -> Tuple[array, Dict[str, array]]:
+        """Keep the last sample of each ``bucket_seconds`` bucket
+
+        Bucket boundaries are found by bisecting the timestamp column, so the
+        work per bucket is logarithmic rather than linear in the samples it
+        holds. The same index set is then gathered from every column.
+        """
+        start = self._window_start(since)
+        end = len(self.timestamps)
+        if bucket_seconds <= 0 or start == end:
+            return (
+                self.timestamps[start:],
+                {m: v[start:] for m, v in self.metrics.items()},
+            )
+
+        timestamps = self.timestamps
+        last_in_bucket = []
+        i = start
+        while i < end:
+            boundary = (timestamps[i] // bucket_seconds + 1) * bucket_seconds
+            i = max(i + 1, bisect_left(timestamps, boundary, i, end))
+            last_in_bucket.append(i - 1)
+
+        if len(last_in_bucket) == end - start:
+            # Every sample is alone in its bucket
+            return (
+                timestamps[start:],
+                {m: v[start:] for m, v in self.metrics.items()},
+            )
+
+        return (
+            array("d", map(timestamps.__getitem__, last_in_bucket)),
+            {
+                metric: array("q", map(values.__getitem__, last_in_bucket))
+                for metric, values in self.metrics.items()
+            },
+        )
+
+    def growth_per_hour(self, since: Optional[float] = None) -> Dict[str, float]:
+        """Average change per hour of every metric over the window"""
+        start = self._window_start(since)
+        if len(self.timestamps) - start < 2:
+            return {metric: 0.0 for metric in self.metrics}
+
+        hours = (self.timestamps[-1] - self.timestamps[start]) / 3600
+        if hours <= 0:
+            return {metric: 0.0 for metric in self.metrics}
+
+        return {
+            metric: (values[-1] - values[start]) / hours
+            for metric, values in self.metrics.items()
+        }
+
+
+class EngagementTracker:
+    """Tracks engagement trajectories of posts with bulk refreshes
+
+    Each refresh groups tracked posts by platform and asks the services for
+    their counters in bulk (50 videos per YouTube ``videos.list`` call, 100
+    tweets per Twitter ``get_tweets`` call), appending one sample per post.
+    """
+
+    def __init__(self, fetcher: SocialMediaFetcher):
+        self.fetcher = fetcher
+        self.max_tracked = settings.ENGAGEMENT_MAX_TRACKED
+        self.max_samples = settings.ENGAGEMENT_MAX_SAMPLES
+        self._series: Dict[Tuple[Platform, str], EngagementSeries] = {}
+
+    def track(self, platform: Platform, post_id: str) -> bool:
+        """Start tracking a post; ``False`` if the tracker is full"""
+        key = (platform, post_id)
+        if key not in self._series:
+            if len(self._series) >= self.max_tracked:
+                return False
+            self._series[key] = EngagementSeries(self.max_samples)
+        return True
+
+    def untrack(self, platform: Platform, post_id: str) -> bool:
+        return self._series.pop((platform, post_id), None) is not None
+
+    def get_series(self, platform: Platform, post_id: str) -> Optional[EngagementSeries]:
+        return self._series.get((platform, post_id))
+
+    def samples(
+        self,
+        platforms: Optional[List[Platform]] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+    ) -> Iterator[Tuple[Platform, str, array, Dict[str, array]]]:
+        """Copies of the samples in ``[since, until)`` of every tracked post
+
+        The posts are picked when called; each one's samples are copied only
+        when the iterator reaches it, so memory stays at one series at a time.
+        """
+        tracked = [
+            (platform, post_id, series)
+            for (platform, post_id), series in self._series.items()
+            if not platforms or platform in platforms
+        ]
+        return self._iter_samples(tracked, since, until)
+
+    @staticmethod
+    def _iter_samples(
+        tracked: List[Tuple[Platform, str, EngagementSeries]],
+        since: Optional[float],
+        until: Optional[float],
+    ) -> Iterator[Tuple[Platform, str, array, Dict[str, array]]]:
+        for platform, post_id, series in tracked:
+            start = series._window_start(since)
+            end = len(series) if until is None else bisect_left(series.timestamps, until)
+            if start < end:
+                yield (
+                    platform,
+                    post_id,
+                    series.timestamps[start:end],
+                    {m: v[start:end] for m, v in series.metrics.items()},
+                )
+
+    async def refresh(self) -> int:
+        """Sample every tracked post once; returns the number of samples"""
+        post_ids: Dict[Platform, List[str]] = defaultdict(list)
+        for platform, post_id in self._series:
+            post_ids[platform].append(post_id)
+
+        results = await asyncio.gather(
+            *(
+                self.fetcher.get_engagement_batch(platform, ids)
+                for platform, ids in post_ids.items()
+            ),
+            return_exceptions=True,
+        )
+
+        now = time.time()
+        sampled = 0
+        for platform, result in zip(post_ids, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Engagement refresh failed for {platform.value}: {result}")
+                continue
+
+            for post_id, engagement in result.items():
+                series = self._series.get((platform, post_id))
+                if series is not None:
+                    series.append(now, engagement)
+                    sampled += 1
+
+        return sampled
+
+    async def run(self) -> None:
+        """Refresh every ``ENGAGEMENT_REFRESH_INTERVAL`` seconds, until cancelled"""
+        set_context(
+            RequestContext(client_id="engagement-tracker", priority=Priority.BACKGROUND)
+        )
+        while True:
+            await asyncio.sleep(settings.ENGAGEMENT_REFRESH_INTERVAL)
+            if self._series:
+                await self.refresh()
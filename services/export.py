@@ -0,0 +1,209 @@
+import io
+import json
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set
+
+from core.models import Platform
+from core.records import PostRecord
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional: pip install "social-media-scrap[export]"
+    pa = pq = None
+
+# Export format -> media type
+FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+}
+COLUMNAR_FORMATS = ("arrow", "parquet")
+
+# Datasets and their columns
+POSTS = "posts"
+ENGAGEMENT = "engagement"
+
+
+def posix_time(value: Optional[datetime]) -> Optional[float]:
+    """POSIX time of a ``since``/``until`` bound; naive values are UTC"""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _schema(dataset: str):
+    if dataset == POSTS:
+        return pa.schema(
+            [
+                ("id", pa.string()),
+                ("platform", pa.string()),
+                ("author", pa.string()),
+                ("author_id", pa.string()),
+                ("content", pa.string()),
+                ("created_at", pa.timestamp("us", tz="UTC")),
+                ("url", pa.string()),
+                ("media_urls", pa.list_(pa.string())),
+                ("engagement", pa.map_(pa.string(), pa.int64())),
+            ]
+        )
+    return pa.schema(
+        [
+            ("platform", pa.string()),
+            ("post_id", pa.string()),
+            ("sampled_at", pa.timestamp("us", tz="UTC")),
+            ("engagement", pa.map_(pa.string(), pa.int64())),
+        ]
+    )
+
+
+def resolve_channel_ids(
+    identifiers: Iterable[str], lookup: Callable[[str, str], Optional[str]]
+) -> Set[str]:
+    """Channel IDs to match for ``identifiers`` (IDs, usernames or handles)
+
+    ``lookup(platform, identifier)`` returns a cached resolved ID, if any.
+    """
+    channel_ids = set()
+    for identifier in identifiers:
+        channel_ids.add(identifier)
+        for platform in Platform:
+            channel_id = lookup(platform.value, identifier)
+            if channel_id is not None:
+                channel_ids.add(channel_id)
+    return channel_ids
+
+
+def post_rows(
+    records: Iterable[PostRecord],
+    platforms: Optional[Set[str]] = None,
+    channel_ids: Optional[Set[str]] = None,
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Rows of the posts matching the filters (``since``/``until`` are POSIX times)"""
+    for record in records:
+        if platforms and record.platform not in platforms:
+            continue
+        if channel_ids and record.author_id not in channel_ids:
+            continue
+        if since is not None and record.created_at < since:
+            continue
+        if until is not None and record.created_at >= until:
+            continue
+
+        yield {
+            "id": record.id,
+            "platform": record.platform,
+            "author": record.author,
+            "author_id": record.author_id,
+            "content": record.content,
+            "created_at": datetime.fromtimestamp(record.created_at, tz=timezone.utc),
+            "url": record.url,
+            "media_urls": list(record.media_urls),
+            "engagement": dict(record.engagement),
+        }
+
+
+def engagement_rows(samples: Iterable[tuple]) -> Iterator[Dict[str, Any]]:
+    """One row per sample of ``(platform, post_id, timestamps, metrics)`` series"""
+    for platform, post_id, timestamps, metrics in samples:
+        for i, timestamp in enumerate(timestamps):
+            yield {
+                "platform": platform.value,
+                "post_id": post_id,
+                "sampled_at": datetime.fromtimestamp(timestamp, tz=timezone.utc),
+                "engagement": {metric: values[i] for metric, values in metrics.items()},
+            }
+
+
+def format_available(format: str) -> bool:
+    return format not in COLUMNAR_FORMATS or pa is not None
+
+
+def _batches(
+    rows: Iterable[Dict[str, Any]], size: int
+) -> Iterator[List[Dict[str, Any]]]:
+    rows = iter(rows)
+    while batch := list(islice(rows, size)):
+        yield batch
+
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def iter_ndjson(rows: Iterable[Dict[str, Any]], batch_rows: int) -> Iterator[bytes]:
+    """Encode rows as newline-delimited JSON, ``batch_rows`` lines per chunk"""
+    for batch in _batches(rows, batch_rows):
+        yield "".join(
+            json.dumps(row, default=_json_default, ensure_ascii=False) + "\n"
+            for row in batch
+        ).encode()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands back what was written since the last drain"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_columnar(
+    rows: Iterable[Dict[str, Any]], dataset: str, format: str, batch_rows: int
+) -> Iterator[bytes]:
+    """Encode rows as an Arrow IPC stream or a Parquet file
+
+    Rows are converted ``batch_rows`` at a time into record batches (one
+    Parquet row group each), and the encoded bytes are yielded after every
+    batch, so memory stays bounded by the batch size.
+    """
+    if pa is None:
+        raise RuntimeError(
+            f"The {format} format needs pyarrow: "
+            "pip install 'social-media-scrap[export]'"
+        )
+
+    schema = _schema(dataset)
+    sink = _ChunkSink()
+    if format == "parquet":
+        writer = pq.ParquetWriter(sink, schema)
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+
+    with writer:
+        for batch in _batches(rows, batch_rows):
+            writer.write_batch(pa.RecordBatch.from_pylist(batch, schema=schema))
+            yield sink.drain()
+    yield sink.drain()
+
+
+def encode(
+    rows: Iterable[Dict[str, Any]], dataset: str, format: str, batch_rows: int
+) -> Iterator[bytes]:
+    """Encode export rows in ``format`` (one of ``FORMATS``)"""
+    if format in COLUMNAR_FORMATS:
+        return iter_columnar(rows, dataset, format, batch_rows)
+    return iter_ndjson(rows, batch_rows)
@@ -0,0 +1,227 @@
+import asyncio
+import base64
+import hashlib
+import heapq
+import json
+import math
+from collections import deque
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+
+from core.models import Platform, SocialMediaPost
+from services.fetcher_service import SocialMediaFetcher
+
+# Smallest per-channel page worth an upstream call (Twitter's minimum is 5)
+MIN_CHANNEL_PAGE_SIZE = 5
+# Largest per-channel page any platform serves
+MAX_CHANNEL_PAGE_SIZE = 100
+
+
+class _ChannelStream:
+    """Lazily paged, newest-first post stream for one channel"""
+
+    def __init__(
+        self,
+        key: str,
+        platform: Platform,
+        channel_identifier: str,
+        page_token: Optional[str] = None,
+        offset: int = 0,
+    ):
+        self.key = key
+        self.platform = platform
+        self.channel_identifier = channel_identifier
+        # Token of the page currently buffered and how much of it was consumed,
+        # which is what a cursor needs to resume exactly where we stopped
+        self.page_token = page_token
+        self.offset = offset
+        self.next_token: Optional[str] = None
+        self.buffer: Deque[SocialMediaPost] = deque()
+        self.exhausted = False
+
+    async def load(self, fetcher: SocialMediaFetcher, page_size: int) -> None:
+        """Fetch the page at ``page_token`` and skip what was already served"""
+        posts, self.next_token = await fetcher.get_recent_posts(
+            self.platform, self.channel_identifier, page_size, self.page_token
+        )
+        self.buffer = deque(posts[self.offset :])
+        if not self.buffer and not self.next_token:
+            self.exhausted = True
+
+    async def advance(self, fetcher: SocialMediaFetcher, page_size: int) -> None:
+        """Fetch the next page once the buffered one is used up"""
+        while not self.buffer and self.next_token:
+            self.page_token, self.offset = self.next_token, 0
+            await self.load(fetcher, page_size)
+        if not self.buffer:
+            self.exhausted = True
+
+    def head_timestamp(self) -> float:
+        return self.buffer[0].created_at.timestamp()
+
+    def pop(self) -> SocialMediaPost:
+        self.offset += 1
+        return self.buffer.popleft()
+
+    def resume_state(self) -> Optional[List]:
+        """Cursor state for this stream, or ``None`` when it has nothing left"""
+        if self.buffer:
+            return [self.page_token, self.offset]
+        if self.next_token:
+            return [self.next_token, 0]
+        return None
+
+
+class FeedService:
+    """Merges recent posts from many channels into one timeline
+
+    Channels are read as newest-first streams and combined with a heap-based
+    k-way merge. Each stream holds at most one upstream page and only fetches
+    the next one when the merge actually consumes past its buffer, so memory
+    and upstream calls scale with the requested page size rather than with
+    channels times history. The returned cursor records, per channel, the
+    page token and offset to resume from.
+    """
+
+    def __init__(self, fetcher: SocialMediaFetcher):
+        self.fetcher = fetcher
+
+    @staticmethod
+    def channel_key(platform: Platform, channel_identifier: str) -> str:
+        return f"{platform.value}:{channel_identifier}"
+
+    @staticmethod
+    def _channel_set_digest(keys: Sequence[str]) -> str:
+        return hashlib.sha1("\n".join(sorted(keys)).encode()).hexdigest()[:12]
+
+    @classmethod
+    def encode_cursor(
+        cls, keys: Sequence[str], page_size: int, states: Dict[str, List]
+    ) -> str:
+        payload = {"c": cls._channel_set_digest(keys), "n": page_size, "s": states}
+        raw = json.dumps(payload, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @classmethod
+    def decode_cursor(
+        cls, cursor: str, keys: Sequence[str]
+    ) -> Tuple[int, Dict[str, List]]:
+        """Decode a cursor, raising ``ValueError`` if it is malformed or foreign"""
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            payload = json.loads(raw)
+            digest, page_size, states = payload["c"], payload["n"], payload["s"]
+        except (ValueError, KeyError, TypeError):
+            raise ValueError("malformed cursor")
+
+        if not (
+            type(page_size) is int
+            and MIN_CHANNEL_PAGE_SIZE <= page_size <= MAX_CHANNEL_PAGE_SIZE
+            and isinstance(states, dict)
+            and all(cls._valid_state(state) for state in states.values())
+        ):
+            raise ValueError("malformed cursor")
+
+        if digest != cls._channel_set_digest(keys):
+            raise ValueError("cursor was issued for a different channel set")
+
+        return page_size, states
+
+    @staticmethod
+    def _valid_state(state) -> bool:
+        """Whether ``state`` is a ``[page token or None, offset]`` pair"""
+        return (
+            isinstance(state, list)
+            and len(state) == 2
+            and (state[0] is None or isinstance(state[0], str))
+            and type(state[1]) is int
+            and 0 <= state[1] <= MAX_CHANNEL_PAGE_SIZE
+        )
+
+    async def get_feed(
+        self,
+        channels: Sequence[Tuple[Platform, str]],
+        limit: int,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[SocialMediaPost], Optional[str], Dict[str, str]]:
+        """Get one page of the merged timeline
+
+        Returns the posts, the cursor for the next page (``None`` when every
+        channel is exhausted) and per-channel errors.
+        """
+        keyed = {self.channel_key(p, c): (p, c) for p, c in channels}
+        keys = list(keyed)
+
+        if cursor:
+            page_size, states = self.decode_cursor(cursor, keys)
+        else:
+            page_size = max(MIN_CHANNEL_PAGE_SIZE, math.ceil(limit / len(keys)))
+            states = {key: [None, 0] for key in keys}
+
+        streams = [
+            _ChannelStream(key, *keyed[key], page_token=state[0], offset=state[1])
+            for key, state in states.items()
+            if key in keyed
+        ]
+
+        # Prime every stream concurrently; the merge needs each channel's head
+        results = await asyncio.gather(
+            *(stream.load(self.fetcher, page_size) for stream in streams),
+            return_exceptions=True,
+        )
+
+        errors: Dict[str, str] = {}
+        failed: List[_ChannelStream] = []
+        heap: List[Tuple[float, int, _ChannelStream]] = []
+        for index, (stream, result) in enumerate(zip(streams, results)):
+            if isinstance(result, Exception):
+                errors[stream.key] = str(result)
+                failed.append(stream)
+            elif stream.buffer:
+                heap.append((-stream.head_timestamp(), index, stream))
+            elif not stream.exhausted:
+                await self._advance(stream, page_size, errors, failed)
+                if stream.buffer:
+                    heap.append((-stream.head_timestamp(), index, stream))
+        heapq.heapify(heap)
+
+        posts: List[SocialMediaPost] = []
+        while heap and len(posts) < limit:
+            _, index, stream = heapq.heappop(heap)
+            posts.append(stream.pop())
+            # A full page must not fetch the next one of the stream it drained
+            if len(posts) >= limit:
+                break
+
+            if not stream.buffer:
+                await self._advance(stream, page_size, errors, failed)
+            if stream.buffer:
+                heapq.heappush(heap, (-stream.head_timestamp(), index, stream))
+
+        next_states = {
+            stream.key: state
+            for stream in streams
+            if stream not in failed and (state := stream.resume_state()) is not None
+        }
+        # Failed channels keep their position so later pages retry them, but
+        # only while healthy channels still have posts, so paging terminates
+        if next_states:
+            for stream in failed:
+                next_states[stream.key] = [stream.page_token, stream.offset]
+
+        next_cursor = (
+            self.encode_cursor(keys, page_size, next_states) if next_states else None
+        )
+        return posts, next_cursor, errors
+
+    async def _advance(
+        self,
+        stream: _ChannelStream,
+        page_size: int,
+        errors: Dict[str, str],
+        failed: List[_ChannelStream],
+    ) -> None:
+        try:
+            await stream.advance(self.fetcher, page_size)
+        except Exception as e:
+            errors[stream.key] = str(e)
+            failed.append(stream)
@@ -1,12 +1,63 @@
 import asyncio
-from typing import Dict, Optional, List
-from concurrent.futures import ThreadPoolExecutor
+import copy
+import functools
+import itertools
+import logging
+import sys
+import time
+from collections import defaultdict
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterator,
+    Optional,
+    List,
+    Set,
+    Tuple,
+    Union,
+)
 
+from adapters.instagram_adapter import InstagramAdapter
 from adapters.twitter_adapter import TwitterAdapter
 from adapters.youtube_adapter import YouTubeAdapter
 from core.base import BaseSocialMediaService
-from core.exceptions import SocialMediaFetcherError
-from core.models import Platform, SocialMediaPost
+from core.context import Priority, RequestContext, reset_context, set_context
+from core.exceptions import (
+    AuthenticationError,
+    ChannelNotFoundError,
+    SocialMediaFetcherError,
+)
+from core.models import ChannelInfo, Platform, SocialMediaPost
+from core.records import PostRecord
+from config.settings import settings
+from services.scheduler import UpstreamScheduler
+from services.snapshot import (
+    CHANNEL_ID,
+    CHANNEL_INFO,
+    POST,
+    SnapshotReader,
+    write_snapshot,
+)
+from services.websub_service import WebSubSubscriber
+from services.youtube_feed import FeedEntry
+from utils.bloom import RotatingBloomFilter
+from utils.cache import ByteBoundedCache
+from utils.latency import LatencyWindow
+
+logger = logging.getLogger(__name__)
+
+# Negative cache value of a channel that exists but has no posts
+EMPTY_TIMELINE = "<empty timeline>"
+# Identifiers per scheduler job in bulk channel lookups
+CHANNEL_BATCH_CHUNK = 100
+
+
+def _channel_info_nbytes(info: ChannelInfo) -> int:
+    return sys.getsizeof(info) + sum(
+        sys.getsizeof(value) for value in info.__dict__.values()
+    )
 
 
 class SocialMediaFetcher:
@@ -14,9 +65,66 @@ class SocialMediaFetcher:
 
     def __init__(self):
         self._services: Dict[str, BaseSocialMediaService] = {}
-        self._executor = ThreadPoolExecutor(max_workers=4)
+        self.scheduler = UpstreamScheduler(max_workers=settings.UPSTREAM_CONCURRENCY)
+        # (platform, service method) -> recent upstream latencies, for hedging
+        self._latencies: Dict[Tuple[str, str], LatencyWindow] = defaultdict(
+            LatencyWindow
+        )
+        self._post_cache = ByteBoundedCache(
+            max_bytes=settings.POST_CACHE_MAX_BYTES,
+            ttl=settings.POST_CACHE_TTL,
+            sizeof=PostRecord.nbytes,
+        )
+        # (platform, identifier as requested) -> resolved channel/account ID;
+        # posts are cached by resolved ID so push updates can find them
+        self._channel_ids = ByteBoundedCache(
+            max_bytes=settings.CHANNEL_ID_CACHE_MAX_BYTES,
+            ttl=settings.CHANNEL_ID_CACHE_TTL,
+            sizeof=sys.getsizeof,
+        )
+        # (platform, identifier as requested) -> full ChannelInfo
+        self._channel_info = ByteBoundedCache(
+            max_bytes=settings.CHANNEL_INFO_CACHE_MAX_BYTES,
+            ttl=settings.CHANNEL_INFO_CACHE_TTL,
+            sizeof=_channel_info_nbytes,
+        )
+        # (platform, identifier) -> not-found message, or EMPTY_TIMELINE
+        self._negative = ByteBoundedCache(
+            max_bytes=settings.NEGATIVE_CACHE_MAX_BYTES,
+            ttl=settings.NEGATIVE_CACHE_TTL,
+            sizeof=sys.getsizeof,
+        )
+        # (platform, channel ID) -> other identifiers whose empty timeline is
+        # negative-cached, so a post seen for the channel clears them too
+        self._empty_aliases = ByteBoundedCache(
+            max_bytes=settings.NEGATIVE_CACHE_MAX_BYTES,
+            ttl=settings.NEGATIVE_CACHE_TTL,
+            sizeof=sys.getsizeof,
+        )
+        # "platform:identifier" of every negative cache entry ever made; a
+        # miss skips the negative cache, a hit is only a hint to check it
+        self._missing_channels = RotatingBloomFilter(
+            capacity=settings.NEGATIVE_BLOOM_CAPACITY,
+            error_rate=settings.NEGATIVE_BLOOM_ERROR_RATE,
+            ttl=settings.NEGATIVE_CACHE_TTL,
+        )
+        # Entries of the snapshot loaded at startup, decoded on first use
+        self.snapshot: Optional[SnapshotReader] = None
+        # Called with (platform, channel ID, post) when a channel's latest
+        # post is fetched, or with post None when a push says it may have
+        # changed; listeners run on the event loop and must not block
+        self.post_listeners: List[
+            Callable[[str, str, Optional[SocialMediaPost]], None]
+        ] = []
         self._register_services()
 
+        self.websub: Optional[WebSubSubscriber] = None
+        if settings.WEBSUB_CALLBACK_URL and "youtube" in self._services:
+            try:
+                self.websub = WebSubSubscriber(settings.WEBSUB_CALLBACK_URL)
+            except AuthenticationError as e:
+                logger.warning(f"WebSub disabled: {e}")
+
     def _register_services(self):
         """Register available social media services"""
         try:
@@ -31,14 +139,26 @@ class SocialMediaFetcher:
         except Exception as e:
             print(f"Warning: Twitter service not available: {e}")
 
+        try:
+            instagram_adapter = InstagramAdapter()
+            self._services["instagram"] = instagram_adapter.service
+        except Exception as e:
+            print(f"Warning: Instagram service not available: {e}")
+
     def get_available_platforms(self) -> List[str]:
         """Get list of available platforms"""
         return list(self._services.keys())
 
-    async def get_latest_post(
-        self, platform: Platform, channel_identifier: str
-    ) -> Optional[SocialMediaPost]:
-        """Get the latest post from specified platform and channel (async)"""
+    def credential_stats(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Per-credential usage of the services that pool API credentials"""
+        return {
+            platform: service.credentials.stats()
+            for platform, service in self._services.items()
+            if getattr(service, "credentials", None) is not None
+        }
+
+    def _get_service(self, platform: Platform) -> BaseSocialMediaService:
+        """Get the registered service for a platform"""
         platform_str = platform.value
 
         if platform_str not in self._services:
@@ -48,49 +168,405 @@ class SocialMediaFetcher:
                 f"Available platforms: {available}"
             )
 
+        return self._services[platform_str]
+
+    def _cache_get(self, cache: ByteBoundedCache, kind: str, key: Hashable) -> Any:
+        """Look ``key`` up in ``cache``, then in the startup snapshot"""
+        value = cache.get(key)
+        if value is None and self.snapshot is not None:
+            entry = self.snapshot.take(kind, key)
+            if entry is not None:
+                value, expires_at = entry
+                ttl = expires_at - time.time()
+                if ttl <= 0:
+                    return None
+                cache.set(key, value, ttl=ttl)
+        return value
+
+    def _check_negative(self, platform_str: str, channel_identifier: str) -> bool:
+        """Raise for a channel recently not found; ``True`` if its timeline was empty
+
+        The bloom filter can give false positives, so only an entry in the
+        negative cache itself answers; a filter miss skips that lookup.
+        """
+        if f"{platform_str}:{channel_identifier}" not in self._missing_channels:
+            return False
+        value = self._negative.get((platform_str, channel_identifier))
+        if value == EMPTY_TIMELINE:
+            return True
+        if value is not None:
+            raise ChannelNotFoundError(value)
+        return False
+
+    def _remember_negative(
+        self, platform_str: str, channel_identifier: str, value: str
+    ) -> None:
+        self._negative.set((platform_str, channel_identifier), value)
+        self._missing_channels.add(f"{platform_str}:{channel_identifier}")
+
+    async def _remember_empty(
+        self, platform: Platform, channel_identifier: str, channel_id: Optional[str]
+    ) -> None:
+        """Negative-cache an empty timeline, linked to the channel's ID
+
+        Without the link, a post later fetched by channel ID or pushed would
+        not clear the entry of a handle. Resolving an uncached ID costs one
+        channel lookup per empty timeline and ``NEGATIVE_CACHE_TTL``.
+        """
+        platform_str = platform.value
+        self._remember_negative(platform_str, channel_identifier, EMPTY_TIMELINE)
+        if channel_id is None:
+            try:
+                info = await self.get_channel_info(
+                    platform, channel_identifier, fields={"id"}
+                )
+            except (SocialMediaFetcherError, ValueError) as e:
+                logger.debug(f"Could not resolve {channel_identifier}: {e}")
+                return
+            channel_id = info.id
+            self._channel_ids.set((platform_str, channel_identifier), channel_id)
+        if channel_id == channel_identifier:
+            return
+
+        key = (platform_str, channel_id)
+        aliases = self._empty_aliases.get(key) or ()
+        if channel_identifier not in aliases:
+            self._empty_aliases.set(key, aliases + (channel_identifier,))
+
+    def _remember_missing(
+        self, platform_str: str, channel_identifier: str, error: ChannelNotFoundError
+    ) -> None:
+        self._remember_negative(platform_str, channel_identifier, str(error))
+
+    @staticmethod
+    def _timed(window: LatencyWindow, fn, *args):
+        start = time.perf_counter()
+        result = fn(*args)
+        window.add(time.perf_counter() - start)
+        return result
+
+    async def _read(self, platform: Platform, fn, *args):
+        """Run an idempotent upstream read through the scheduler
+
+        With ``HEDGE_REQUESTS`` on, a call still running after the p95
+        latency of its recent successes is sent a second time; the first
+        successful answer wins and the other attempt is cancelled. The delay
+        counts from when the call starts running, like the latencies it is
+        compared with, so time queued in the scheduler does not trigger it.
+        """
+        window = self._latencies[(platform.value, fn.__name__)]
+        call = functools.partial(self._timed, window, fn, *args)
+
+        if not settings.HEDGE_REQUESTS or len(window) < settings.HEDGE_MIN_SAMPLES:
+            return await self.scheduler.submit(call)
+
+        loop = asyncio.get_running_loop()
+        started = asyncio.Event()
+
+        def first_call():
+            loop.call_soon_threadsafe(started.set)
+            return call()
+
+        first = asyncio.ensure_future(self.scheduler.submit(first_call))
+        attempts = {first}
+        try:
+            start = asyncio.ensure_future(started.wait())
+            try:
+                await asyncio.wait({first, start}, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                start.cancel()
+
+            done, _ = await asyncio.wait(attempts, timeout=window.percentile(0.95))
+            if not done:
+                attempts.add(asyncio.ensure_future(self.scheduler.submit(call)))
+
+            error = None
+            while attempts:
+                done, attempts = await asyncio.wait(
+                    attempts, return_when=asyncio.FIRST_COMPLETED
+                )
+                for attempt in done:
+                    if attempt.exception() is None:
+                        return attempt.result()
+                    error = error or attempt.exception()
+            raise error
+        finally:
+            for attempt in attempts:
+                attempt.cancel()
+
+    def _notify_post(
+        self, platform_str: str, channel_id: str, post: Optional[SocialMediaPost]
+    ) -> None:
+        # The channel has posts now, whatever was remembered about it
+        self._negative.pop((platform_str, channel_id))
+        for alias in self._empty_aliases.pop((platform_str, channel_id)) or ():
+            self._negative.pop((platform_str, alias))
+        for listener in self.post_listeners:
+            try:
+                listener(platform_str, channel_id, post)
+            except Exception:
+                logger.exception("Post listener failed")
+
+    async def get_latest_post(
+        self,
+        platform: Platform,
+        channel_identifier: str,
+        fields: Optional[Set[str]] = None,
+        refresh: bool = False,
+    ) -> Optional[SocialMediaPost]:
+        """Get the latest post from specified platform and channel (async)
+
+        ``refresh`` skips the caches and always asks upstream (the result is
+        still cached). Identifiers with a cached channel ID are passed to the
+        service as that ID when it accepts one.
+        """
+        platform_str = platform.value
+        service = self._get_service(platform)
+
+        channel_id = self.cached_channel_id(platform_str, channel_identifier)
+        # Cached records hold every field, so they can serve any projection
+        if channel_id is not None and not refresh:
+            record = self._cache_get(self._post_cache, POST, (platform_str, channel_id))
+            if record is not None:
+                return record.to_post()
+
+        if not refresh and self._check_negative(platform_str, channel_identifier):
+            return None
+        lookup = None
+        if channel_id is not None and service.accepts_channel_ids:
+            lookup = service.channel_id_identifier(channel_id)
+
         try:
-            service = self._services[platform_str]
             # Run the synchronous service method in thread pool
-            loop = asyncio.get_event_loop()
-            return await loop.run_in_executor(
-                self._executor, service.get_latest_post, channel_identifier
+            post = await self._read(
+                platform, service.get_latest_post, lookup or channel_identifier, fields
             )
-        except SocialMediaFetcherError:
+        except ChannelNotFoundError as e:
+            self._remember_missing(platform_str, channel_identifier, e)
+            raise
+        except (SocialMediaFetcherError, ValueError):
             raise
         except Exception as e:
             raise SocialMediaFetcherError(f"Unexpected error: {e}")
 
-    async def get_channel_info(self, platform: Platform, channel_identifier: str):
+        if post is None:
+            await self._remember_empty(platform, channel_identifier, channel_id)
+        else:
+            self._negative.pop((platform_str, channel_identifier))
+
+        # Partial fetches would poison the cache for callers wanting all fields
+        if post is not None and fields is None:
+            self._channel_ids.set((platform_str, channel_identifier), post.author_id)
+            self._post_cache.set(
+                (platform_str, post.author_id), PostRecord.from_post(post)
+            )
+
+            if self.websub is not None and platform == Platform.YOUTUBE:
+                self.websub.ensure_subscribed(post.author_id)
+
+            self._notify_post(platform_str, post.author_id, post)
+
+        return post
+
+    def apply_feed_entries(self, entries: List[FeedEntry]) -> None:
+        """Apply pushed YouTube feed entries to the latest-post cache
+
+        Edits to the cached video update it in place. A newer upload or the
+        deletion of the cached video invalidates the entry, so the next read
+        fetches the new latest post with its statistics.
+        """
+        for entry in entries:
+            if not entry.deleted:
+                self._notify_post(Platform.YOUTUBE.value, entry.channel_id, None)
+
+            cache_key = (Platform.YOUTUBE.value, entry.channel_id)
+            record = self._cache_get(self._post_cache, POST, cache_key)
+            if record is None:
+                continue
+
+            if record.id != entry.video_id:
+                if entry.deleted or (
+                    entry.published
+                    and entry.published.timestamp() <= record.created_at
+                ):
+                    continue
+                self._post_cache.pop(cache_key)
+            elif entry.deleted:
+                self._post_cache.pop(cache_key)
+            else:
+                updated = copy.copy(record)
+                updated.content = entry.title
+                self._post_cache.set(cache_key, updated)
+
+    async def get_channel_info(
+        self,
+        platform: Platform,
+        channel_identifier: str,
+        fields: Optional[Set[str]] = None,
+    ):
         """Get channel information (async)"""
-        platform_str = platform.value
+        service = self._get_service(platform)
+        cache_key = (platform.value, channel_identifier)
 
-        if platform_str not in self._services:
-            available = self.get_available_platforms()
-            raise ValueError(
-                f"Platform '{platform_str}' not supported. "
-                f"Available platforms: {available}"
+        # A cached full ChannelInfo can serve any projection
+        info = self._cache_get(self._channel_info, CHANNEL_INFO, cache_key)
+        if info is not None:
+            return info
+
+        self._check_negative(platform.value, channel_identifier)
+
+        try:
+            info = await self._read(
+                platform, service.get_channel_info, channel_identifier, fields
             )
+        except ChannelNotFoundError as e:
+            self._remember_missing(platform.value, channel_identifier, e)
+            raise
+        except (SocialMediaFetcherError, ValueError):
+            raise
+        except Exception as e:
+            raise SocialMediaFetcherError(f"Unexpected error: {e}")
+
+        if fields is None:
+            self._channel_info.set(cache_key, info)
+        return info
+
+    async def get_channel_info_batch(
+        self,
+        channels: List[Tuple[Platform, str]],
+        fields: Optional[Set[str]] = None,
+    ) -> Dict[Tuple[Platform, str], Union[ChannelInfo, Exception]]:
+        """Get many channels with each platform's bulk lookup (async)
+
+        Cached and known-missing channels are answered locally; the rest go
+        upstream in chunks of ``CHANNEL_BATCH_CHUNK`` identifiers, each one
+        scheduler job, so large syncs share capacity fairly.
+        """
+        results: Dict[Tuple[Platform, str], Union[ChannelInfo, Exception]] = {}
+        pending: Dict[Platform, List[str]] = defaultdict(list)
+
+        for platform, identifier in dict.fromkeys(channels):
+            try:
+                self._get_service(platform)
+                info = self._cache_get(
+                    self._channel_info, CHANNEL_INFO, (platform.value, identifier)
+                )
+                if info is None:
+                    self._check_negative(platform.value, identifier)
+            except (ValueError, ChannelNotFoundError) as e:
+                results[(platform, identifier)] = e
+                continue
+
+            if info is not None:
+                results[(platform, identifier)] = info
+            else:
+                pending[platform].append(identifier)
+
+        chunks = [
+            (platform, identifiers[start : start + CHANNEL_BATCH_CHUNK])
+            for platform, identifiers in pending.items()
+            for start in range(0, len(identifiers), CHANNEL_BATCH_CHUNK)
+        ]
+        batches = await asyncio.gather(
+            *(
+                self.scheduler.submit(
+                    self._get_service(platform).get_channel_info_batch,
+                    identifiers,
+                    fields,
+                )
+                for platform, identifiers in chunks
+            ),
+            return_exceptions=True,
+        )
+
+        for (platform, identifiers), batch in zip(chunks, batches):
+            if isinstance(batch, Exception):
+                if not isinstance(batch, SocialMediaFetcherError):
+                    batch = SocialMediaFetcherError(f"Unexpected error: {batch}")
+                for identifier in identifiers:
+                    results[(platform, identifier)] = batch
+                continue
+
+            for identifier in identifiers:
+                info = batch.get(identifier) or ChannelNotFoundError(
+                    f"Channel not found: {identifier}"
+                )
+                if isinstance(info, ChannelNotFoundError):
+                    self._remember_missing(platform.value, identifier, info)
+                elif not isinstance(info, Exception) and fields is None:
+                    self._channel_info.set((platform.value, identifier), info)
+                results[(platform, identifier)] = info
+
+        return results
+
+    async def get_recent_posts(
+        self,
+        platform: Platform,
+        channel_identifier: str,
+        limit: int,
+        page_token: Optional[str] = None,
+    ) -> Tuple[List[SocialMediaPost], Optional[str]]:
+        """Get a page of recent posts, newest first, and the next page token (async)
+
+        Identifiers with a cached channel ID are passed to the service as
+        that ID when it accepts one, so paging does not re-resolve them.
+        """
+        platform_str = platform.value
+        service = self._get_service(platform)
+
+        channel_id = self.cached_channel_id(platform_str, channel_identifier)
+        if (
+            channel_id is None
+            and self._check_negative(platform_str, channel_identifier)
+            and not page_token
+        ):
+            return [], None
+        lookup = None
+        if channel_id is not None and service.accepts_channel_ids:
+            lookup = service.channel_id_identifier(channel_id)
 
         try:
-            service = self._services[platform_str]
-            loop = asyncio.get_event_loop()
-            return await loop.run_in_executor(
-                self._executor, service.get_channel_info, channel_identifier
+            posts, next_token = await self.scheduler.submit(
+                service.get_recent_posts,
+                lookup or channel_identifier,
+                limit,
+                page_token,
             )
+        except ChannelNotFoundError as e:
+            self._remember_missing(platform_str, channel_identifier, e)
+            raise
+        except (SocialMediaFetcherError, ValueError):
+            raise
+        except Exception as e:
+            raise SocialMediaFetcherError(f"Unexpected error: {e}")
+
+        if posts and channel_id is None:
+            channel_id = posts[0].author_id
+            self._channel_ids.set((platform_str, channel_identifier), channel_id)
+        return posts, next_token
+
+    async def get_engagement_batch(
+        self, platform: Platform, post_ids: List[str]
+    ) -> Dict[str, Dict[str, int]]:
+        """Get current engagement counters for many posts of one platform (async)"""
+        service = self._get_service(platform)
+
+        try:
+            return await self.scheduler.submit(service.get_engagement_batch, post_ids)
         except SocialMediaFetcherError:
             raise
         except Exception as e:
             raise SocialMediaFetcherError(f"Unexpected error: {e}")
 
     async def get_latest_posts_from_multiple_channels(
-        self, channels: Dict[Platform, str]
+        self, channels: Dict[Platform, str], fields: Optional[Set[str]] = None
     ) -> Dict[str, Optional[SocialMediaPost]]:
         """Get latest posts from multiple channels concurrently"""
         tasks = []
         platform_names = []
 
         for platform, channel_identifier in channels.items():
-            task = self.get_latest_post(platform, channel_identifier)
+            task = self.get_latest_post(platform, channel_identifier, fields)
             tasks.append(task)
             platform_names.append(platform.value)
 
@@ -108,3 +584,123 @@ class SocialMediaFetcher:
                 final_results[platform_name] = result
 
         return final_results
+
+    def cached_channel_id(
+        self, platform_str: str, channel_identifier: str
+    ) -> Optional[str]:
+        """Resolved channel ID of an identifier, if the cache knows it"""
+        return self._cache_get(
+            self._channel_ids, CHANNEL_ID, (platform_str, channel_identifier)
+        )
+
+    def cached_posts(self) -> Iterator[PostRecord]:
+        """Every cached latest post, including those still in the snapshot
+
+        The in-memory entries are captured when called, so the iterator can be
+        consumed off the event loop; snapshot entries are decoded as it goes.
+        """
+        now = time.time()
+        records = [record for _, record, _ in self._post_cache.items()]
+        if self.snapshot is None:
+            return iter(records)
+
+        snapshot = self.snapshot
+        keys = [
+            key
+            for kind, key, expires_at in snapshot.keys()
+            if kind == POST and expires_at > now
+        ]
+        decoded = (snapshot.get(POST, key) for key in keys)
+        return itertools.chain(
+            records, (entry[0] for entry in decoded if entry is not None)
+        )
+
+    def load_snapshot(self, path: str) -> int:
+        """Attach the snapshot at ``path`` as a lazily decoded warm cache tier
+
+        Returns the number of entries in it (0 if there is no usable file).
+        """
+        try:
+            self.snapshot = SnapshotReader(path)
+        except FileNotFoundError:
+            return 0
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cache snapshot {path}: {e}")
+            return 0
+        return len(self.snapshot)
+
+    async def save_snapshot(self, path: str) -> int:
+        """Write the live cache entries (and unused snapshot ones) to ``path``
+
+        Snapshot entries are decoded in the writer thread, not on the loop.
+        """
+        now = time.time()
+        entries = [
+            (kind, key, value, expires_at)
+            for kind, cache in (
+                (CHANNEL_ID, self._channel_ids),
+                (POST, self._post_cache),
+                (CHANNEL_INFO, self._channel_info),
+            )
+            for key, value, expires_at in cache.items()
+        ]
+        if self.snapshot is not None:
+            entries = itertools.chain(entries, self.snapshot.remaining(now))
+
+        return await asyncio.to_thread(write_snapshot, path, entries)
+
+    async def refresh_stale_snapshot_entries(self, limit: int) -> int:
+        """Re-fetch up to ``limit`` channels whose snapshot entries expired
+
+        Latest posts are refreshed through the identifiers clients asked
+        for (the channel ID mappings), channel info by its own key. Runs as
+        background work in the scheduler.
+        """
+        if self.snapshot is None:
+            return 0
+
+        now = time.time()
+        expiry = {
+            (kind, key): expires_at for kind, key, expires_at in self.snapshot.keys()
+        }
+        stale = []
+        for (kind, key), expires_at in expiry.items():
+            if kind == CHANNEL_ID:
+                channel_id, _ = self.snapshot.get(kind, key)
+                post_expires_at = expiry.get((POST, (key[0], channel_id)), 0)
+                if min(expires_at, post_expires_at) <= now:
+                    stale.append((self.get_latest_post, key))
+            elif kind == CHANNEL_INFO and expires_at <= now:
+                stale.append((self.get_channel_info, key))
+
+        token = set_context(
+            RequestContext(client_id="snapshot", priority=Priority.BACKGROUND)
+        )
+        try:
+            results = await asyncio.gather(
+                *(
+                    refresh(Platform(platform), identifier)
+                    for refresh, (platform, identifier) in stale[:limit]
+                    if platform in self._services
+                ),
+                return_exceptions=True,
+            )
+        finally:
+            reset_context(token)
+        return sum(not isinstance(result, Exception) for result in results)
+
+    async def run_snapshots(self, path: str, interval: float) -> None:
+        """Snapshot the caches every ``interval`` seconds, and once more on cancel
+
+        A failed snapshot (full disk, permissions) is logged and retried at
+        the next interval.
+        """
+        try:
+            while True:
+                await asyncio.sleep(interval)
+                try:
+                    await self.save_snapshot(path)
+                except Exception:
+                    logger.exception(f"Writing cache snapshot {path} failed")
+        finally:
+            await self.save_snapshot(path)
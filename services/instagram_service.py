@@ -1,178 +1,355 @@
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
-from typing import Optional
+import json
+import re
+import time
 from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Set, Tuple, Union
+
+import requests
+
 from core.base import BaseSocialMediaService
-from core.models import SocialMediaPost, ChannelInfo
-from core.exceptions import APIError, AuthenticationError, ChannelNotFoundError
+from core.models import Platform, SocialMediaPost, ChannelInfo
+from core.exceptions import (
+    APIError,
+    AuthenticationError,
+    ChannelNotFoundError,
+    RateLimitError,
+)
 from config.settings import settings
+from utils.http_client import HTTPClient
+
+# The Graph batch endpoint accepts at most 50 requests per call
+MAX_BATCH_SIZE = 50
+
+# Instagram usernames and paging cursors; anything else could inject fields
+# or parameters into the lookup URL
+USERNAME_PATTERN = re.compile(r"^[A-Za-z0-9._]{1,30}$")
+CURSOR_PATTERN = re.compile(r"^[A-Za-z0-9_=-]+$")
+
+# ChannelInfo field -> IG User fields needed to populate it
+ACCOUNT_FIELDS = {
+    "name": ("name",),
+    "username": ("username",),
+    "url": ("username",),
+    "follower_count": ("followers_count",),
+}
+
+# SocialMediaPost field -> IG Media fields needed to populate it
+MEDIA_FIELDS = {
+    "content": ("caption",),
+    "created_at": ("timestamp",),
+    "url": ("permalink",),
+    "media_urls": ("media_type", "media_url", "thumbnail_url"),
+    "engagement": ("like_count", "comments_count"),
+}
+
+# Graph error codes (https://developers.facebook.com/docs/graph-api/guides/error-handling)
+AUTH_ERROR_CODES = {102, 190}
+RATE_LIMIT_ERROR_CODES = {4, 17, 32, 613, 80002}
+NOT_FOUND_ERROR_CODES = {110, 803}
+NOT_FOUND_ERROR_SUBCODES = {2207013}
 
 
 class InstagramService(BaseSocialMediaService):
-    """Instragram service implementation"""
+    """Instagram service implementation (Graph API business discovery)
+
+    Accounts are looked up by username through ``business_discovery`` on the
+    configured Instagram business account, with field expansion so an
+    account, its latest media and that media's metrics come back in a single
+    request. Several lookups go through the Graph batch endpoint, which folds
+    up to 50 of them into one HTTP call; a single one is a plain GET.
+    """
 
     def __init__(self):
         super().__init__()
-        # Instagram Basic Display API endpoints
-        self.basic_display_base_url = "https://graph.instagram.com"
-        
-        # Instagram Graph API endpoints (for business accounts)
-        self.graph_api_base_url = "https://graph.facebook.com/v18.0"
-
-        if (
-            not settings.YOUTUBE_API_KEY
-            or not settings.INSTAGRAM_ACCESS_TOKEN
-            or not settings.INSTAGRAM_APP_SECRET
-        ):
+        if not settings.INSTAGRAM_ACCESS_TOKEN or not settings.INSTAGRAM_ACCOUNT_ID:
             raise AuthenticationError("Instagram API credentials not provided")
 
-        try:
-            self.youtube = build("youtube", "v3", developerKey=settings.YOUTUBE_API_KEY)
-        except Exception as e:
-            raise AuthenticationError(f"Failed to initialize YouTube client: {e}")
+        self.graph_api_base_url = (
+            f"https://graph.facebook.com/{settings.INSTAGRAM_GRAPH_API_VERSION}"
+        )
+        self.http = HTTPClient()
 
-    def _get_platform_name(self) -> str:
-        return "instagram"
+    def _get_platform_name(self) -> Platform:
+        return Platform.INSTAGRAM
 
     def validate_credentials(self) -> bool:
         """Validate Instagram API credentials"""
-        if not self.access_token:
-            logger.error("Instagram access token not provided")
-            return False
-        
-        # Test the access token by making a simple request
-        test_url = f"{self.basic_display_base_url}/me"
-        params = {
-            'fields': 'id,username',
-            'access_token': self.access_token
-        }
-        
-        response_data = self._make_request(test_url, params)
-        
-        if response_data and 'id' in response_data:
-            return True
-        else:
+        try:
+            (result,) = self._batch([f"{settings.INSTAGRAM_ACCOUNT_ID}?fields=id"])
+            return not isinstance(result, Exception)
+        except Exception:
             return False
 
-    def get_channel_info(self, channel_identifier: str) -> ChannelInfo:
-        """Get YouTube channel information"""
-        try:
-            # Try by channel ID first
-            response = (
-                self.youtube.channels()
-                .list(part="snippet,statistics", id=channel_identifier)
-                .execute()
+    @staticmethod
+    def _select(
+        mapping: Dict[str, Tuple[str, ...]],
+        fields: Optional[Set[str]],
+        required: Tuple[str, ...] = ("id",),
+    ) -> str:
+        """Graph field list covering the requested model fields"""
+        selected = list(required)
+        for field, graph_fields in mapping.items():
+            if fields is None or field in fields:
+                selected.extend(f for f in graph_fields if f not in selected)
+        return ",".join(selected)
+
+    def _discovery_url(
+        self,
+        username: str,
+        account_fields: Optional[Set[str]],
+        media_fields: Optional[Set[str]] = None,
+        media_limit: int = 0,
+        after: Optional[str] = None,
+    ) -> str:
+        """Relative URL of a business discovery lookup with field expansion
+
+        Raises ``ValueError`` for usernames and page tokens that are not
+        shaped like Instagram's.
+        """
+        if not USERNAME_PATTERN.match(username):
+            raise ValueError(f"Invalid Instagram username: {username!r}")
+        if after is not None and not CURSOR_PATTERN.match(after):
+            raise ValueError("Invalid Instagram page token")
+
+        if not media_limit:
+            selection = self._select(ACCOUNT_FIELDS, account_fields)
+        else:
+            # Posts always carry their author and creation time
+            selection = self._select(
+                ACCOUNT_FIELDS, account_fields, required=("id", "username")
+            )
+            media_selection = self._select(
+                MEDIA_FIELDS, media_fields, required=("id", "timestamp")
             )
+            paging = f".limit({media_limit})" + (f".after({after})" if after else "")
+            selection += f",media{paging}{{{media_selection}}}"
 
-            if "items" not in response.keys():
-                # Try by username
-                response = (
-                    self.youtube.channels()
-                    .list(part="snippet,statistics", forUsername=channel_identifier)
-                    .execute()
-                )
+        return (
+            f"{settings.INSTAGRAM_ACCOUNT_ID}"
+            f"?fields=business_discovery.username({username}){{{selection}}}"
+        )
 
-            if "items" not in response.keys():
-                # Try by custom URL (handle)
-                response = (
-                    self.youtube.search()
-                    .list(
-                        part="snippet",
-                        q=channel_identifier,
-                        type="channel",
-                        maxResults=1,
-                    )
-                    .execute()
+    def _get(self, relative_url: str) -> Union[dict, Exception]:
+        """Run one GET request directly, without the batch envelope"""
+        for attempt in range(self.http.max_retries + 1):
+            try:
+                response = self.http.session.get(
+                    f"{self.graph_api_base_url}/{relative_url}",
+                    params={"access_token": settings.INSTAGRAM_ACCESS_TOKEN},
+                    timeout=self.http.timeout,
                 )
+                break
+            except requests.RequestException as e:
+                if attempt == self.http.max_retries:
+                    return APIError(f"Instagram API request failed: {e}")
+                time.sleep(2**attempt)
 
-                if response["items"]:
-                    channel_id = response["items"][0]["id"]["channelId"]
-                    response = (
-                        self.youtube.channels()
-                        .list(part="snippet,statistics", id=channel_id)
-                        .execute()
-                    )
-
-            if not response["items"]:
-                raise ChannelNotFoundError(
-                    f"YouTube channel not found: {channel_identifier}"
-                )
+        body = response.json() if response.content else {}
+        if response.ok:
+            return body
+        return self._graph_error(body.get("error", {}))
+
+    def _batch(self, relative_urls: Sequence[str]) -> List[Union[dict, Exception]]:
+        """Run GET requests through the Graph batch endpoint
 
-            channel_data = response["items"][0]
-            snippet = channel_data["snippet"]
-            statistics = channel_data.get("statistics", {})
-
-            channel_info = ChannelInfo(
-                id=channel_data["id"],
-                name=snippet["title"],
-                username=snippet.get("customUrl"),
-                platform=self.platform_name,
-                url=f"https://www.youtube.com/channel/{channel_data['id']}",
-                follower_count=int(statistics.get("subscriberCount", 0)),
+        Returns one parsed body or exception per request, in order. A single
+        request is sent as a plain GET.
+        """
+        if len(relative_urls) == 1:
+            return [self._get(relative_urls[0])]
+
+        results: List[Union[dict, Exception]] = []
+        for start in range(0, len(relative_urls), MAX_BATCH_SIZE):
+            chunk = relative_urls[start : start + MAX_BATCH_SIZE]
+            responses = self.http.post(
+                self.graph_api_base_url + "/",
+                data={
+                    "access_token": settings.INSTAGRAM_ACCESS_TOKEN,
+                    "include_headers": "false",
+                    "batch": json.dumps(
+                        [{"method": "GET", "relative_url": url} for url in chunk]
+                    ),
+                },
             )
 
-            return channel_info
+            for response in responses:
+                if response is None:
+                    # The batch timed out before this request completed
+                    results.append(APIError("Instagram API request timed out"))
+                    continue
 
-        except HttpError as e:
-            raise APIError(f"YouTube API error: {e}")
+                body = json.loads(response.get("body") or "{}")
+                if response.get("code") == 200:
+                    results.append(body)
+                else:
+                    results.append(self._graph_error(body.get("error", {})))
 
-    def get_latest_post(self, channel_identifier: str) -> Optional[SocialMediaPost]:
-        """Get the latest video from a YouTube channel"""
-        try:
-            # First get channel info to get the channel ID
-            channel_info = self.get_channel_info(channel_identifier)
-
-            # Search for the latest video from this channel
-            response = (
-                self.youtube.search()
-                .list(
-                    part="snippet",
-                    channelId=channel_info.id,
-                    type="video",
-                    order="date",
-                    maxResults=1,
+        return results
+
+    @staticmethod
+    def _graph_error(error: dict) -> Exception:
+        """Map a Graph API error object to an internal exception"""
+        code = error.get("code")
+        message = f"Instagram API error: {error.get('message', 'unknown error')}"
+
+        if code in AUTH_ERROR_CODES:
+            return AuthenticationError(message)
+        if code in RATE_LIMIT_ERROR_CODES:
+            return RateLimitError(message)
+        if (
+            code in NOT_FOUND_ERROR_CODES
+            or error.get("error_subcode") in NOT_FOUND_ERROR_SUBCODES
+        ):
+            return ChannelNotFoundError(message)
+        return APIError(message)
+
+    @staticmethod
+    def _username(channel_identifier: str) -> str:
+        return channel_identifier.lstrip("@")
+
+    def _to_channel_info(self, account: dict) -> ChannelInfo:
+        username = account.get("username")
+        return ChannelInfo(
+            id=account["id"],
+            name=account.get("name") or username or "",
+            username=username,
+            platform=self.platform_name,
+            url=f"https://www.instagram.com/{username}/" if username else "",
+            follower_count=account.get("followers_count"),
+        )
+
+    @staticmethod
+    def _engagement_from_media(media: dict) -> Dict[str, int]:
+        """Map IG Media metrics to the engagement dict (likes may be hidden)"""
+        engagement = {}
+        if "like_count" in media:
+            engagement["likes"] = media["like_count"]
+        if "comments_count" in media:
+            engagement["comments"] = media["comments_count"]
+        return engagement
+
+    def _to_post(self, account: dict, media: dict) -> SocialMediaPost:
+        # Videos expose a thumbnail; images and albums a media URL
+        media_url = (
+            media.get("thumbnail_url")
+            if media.get("media_type") == "VIDEO"
+            else media.get("media_url")
+        )
+
+        return SocialMediaPost(
+            id=media["id"],
+            platform=self.platform_name,
+            author=account.get("name") or account.get("username", ""),
+            author_id=account["id"],
+            content=media.get("caption", ""),
+            created_at=datetime.strptime(media["timestamp"], "%Y-%m-%dT%H:%M:%S%z"),
+            url=media.get("permalink", ""),
+            media_urls=[media_url] if media_url else [],
+            engagement=self._engagement_from_media(media),
+            raw_data=media,
+        )
+
+    def get_channel_info_batch(
+        self, channel_identifiers: Sequence[str], fields: Optional[Set[str]] = None
+    ) -> Dict[str, Union[ChannelInfo, Exception]]:
+        """Get several accounts, 50 per HTTP call"""
+        results: Dict[str, Union[ChannelInfo, Exception]] = {}
+        urls = {}
+        for identifier in channel_identifiers:
+            try:
+                urls[identifier] = self._discovery_url(
+                    self._username(identifier), fields
                 )
-                .execute()
-            )
+            except ValueError as e:
+                results[identifier] = e
 
-            if not response["items"]:
-                return None
+        for identifier, body in zip(urls, self._batch(list(urls.values()))):
+            if isinstance(body, Exception):
+                results[identifier] = body
+            else:
+                results[identifier] = self._to_channel_info(body["business_discovery"])
+        return results
 
-            video = response["items"][0]
-            video_id = video["id"]["videoId"]
-            snippet = video["snippet"]
+    def get_latest_posts_batch(
+        self, channel_identifiers: Sequence[str], fields: Optional[Set[str]] = None
+    ) -> Dict[str, Union[Optional[SocialMediaPost], Exception]]:
+        """Get several accounts' latest media with metrics, 50 per HTTP call"""
+        results: Dict[str, Union[Optional[SocialMediaPost], Exception]] = {}
+        urls = {}
+        for identifier in channel_identifiers:
+            try:
+                urls[identifier] = self._discovery_url(
+                    self._username(identifier), {"name"}, fields, media_limit=1
+                )
+            except ValueError as e:
+                results[identifier] = e
 
-            # Get additional video details
-            video_details = (
-                self.youtube.videos()
-                .list(part="statistics,contentDetails", id=video_id)
-                .execute()
-            )
+        for identifier, body in zip(urls, self._batch(list(urls.values()))):
+            if isinstance(body, Exception):
+                results[identifier] = body
+                continue
 
-            stats = (
-                video_details["items"][0]["statistics"]
-                if video_details["items"]
-                else {}
-            )
+            account = body["business_discovery"]
+            media = account.get("media", {}).get("data", [])
+            results[identifier] = self._to_post(account, media[0]) if media else None
+        return results
 
-            return SocialMediaPost(
-                id=video_id,
-                platform=self.platform_name,
-                author=snippet["channelTitle"],
-                author_id=snippet["channelId"],
-                content=snippet["title"],
-                created_at=datetime.fromisoformat(
-                    snippet["publishedAt"].replace("Z", "+00:00")
-                ),
-                url=f"https://www.youtube.com/watch?v={video_id}",
-                media_urls=[f"https://img.youtube.com/vi/{video_id}/maxresdefault.jpg"],
-                engagement={
-                    "views": int(stats.get("viewCount", 0)),
-                    "likes": int(stats.get("likeCount", 0)),
-                    "comments": int(stats.get("commentCount", 0)),
-                },
-                raw_data=video,
-            )
+    def get_engagement_batch(self, post_ids: Sequence[str]) -> Dict[str, Dict[str, int]]:
+        """Get metrics for many media objects, 50 per HTTP call"""
+        urls = [f"{media_id}?fields=like_count,comments_count" for media_id in post_ids]
+
+        engagement = {}
+        for media_id, body in zip(post_ids, self._batch(urls)):
+            if isinstance(body, (AuthenticationError, RateLimitError)):
+                raise body
+            if isinstance(body, Exception):
+                # Deleted or otherwise inaccessible media
+                continue
+            engagement[media_id] = self._engagement_from_media(body)
+        return engagement
+
+    def get_channel_info(
+        self, channel_identifier: str, fields: Optional[Set[str]] = None
+    ) -> ChannelInfo:
+        """Get Instagram account information"""
+        result = self.get_channel_info_batch([channel_identifier], fields)[
+            channel_identifier
+        ]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def get_latest_post(
+        self, channel_identifier: str, fields: Optional[Set[str]] = None
+    ) -> Optional[SocialMediaPost]:
+        """Get the latest media of an Instagram account"""
+        result = self.get_latest_posts_batch([channel_identifier], fields)[
+            channel_identifier
+        ]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def get_recent_posts(
+        self, channel_identifier: str, limit: int, page_token: Optional[str] = None
+    ) -> Tuple[List[SocialMediaPost], Optional[str]]:
+        """Get a page of recent media from an Instagram account"""
+        url = self._discovery_url(
+            self._username(channel_identifier),
+            {"name"},
+            media_limit=max(1, min(limit, 100)),
+            after=page_token,
+        )
+        (body,) = self._batch([url])
+        if isinstance(body, Exception):
+            raise body
 
-        except HttpError as e:
-            raise APIError(f"YouTube API error: {e}")
+        account = body["business_discovery"]
+        media = account.get("media", {})
+        posts = [self._to_post(account, item) for item in media.get("data", [])]
+        next_token = (
+            media.get("paging", {}).get("cursors", {}).get("after")
+            if media.get("paging", {}).get("next")
+            else None
+        )
+        return posts, next_token
@@ -0,0 +1,234 @@
+import asyncio
+import logging
+from collections import Counter, defaultdict
+from typing import Dict, Optional, Set, Tuple
+
+from config.settings import settings
+from core.context import Priority, RequestContext, current_context, set_context
+from core.exceptions import ChannelNotFoundError
+from core.models import Platform, SocialMediaPost
+from services.fetcher_service import SocialMediaFetcher
+
+logger = logging.getLogger(__name__)
+
+# What the poller asks for to tell whether the latest post changed; the
+# YouTube feed strategy serves it without quota
+POLL_FIELDS = {"id", "created_at"}
+
+
+class _Watch:
+    """Shared state of everyone waiting on one channel"""
+
+    def __init__(self):
+        self.condition = asyncio.Condition()
+        self.latest: Optional[SocialMediaPost] = None
+        self.checked = False  # whether ``latest`` reflects a completed check
+        self.error: Optional[Exception] = None
+        self.waiters = 0
+        self.since_ids: Counter = Counter()  # post IDs the waiters already have
+        self.poke = asyncio.Event()  # check now instead of at the next interval
+        self.pushed: Optional[SocialMediaPost] = None
+        self.stale = False  # a push said the latest post may have changed
+        self.task: Optional[asyncio.Task] = None
+
+
+class PostWatcher:
+    """Long-poll support: wait until a channel's latest post changes
+
+    All waiters on a channel share one poller task, which checks upstream
+    every ``LONGPOLL_INTERVAL`` seconds while anyone is waiting and wakes
+    them all through one ``asyncio.Condition``. Posts fetched for other
+    requests and YouTube WebSub pushes reach the poller through the
+    fetcher's post listeners, so they are seen before the next interval.
+
+    After the first check the poller only asks for the latest post's ID
+    (``POLL_FIELDS``) and fetches the full post when that changes. Channels
+    with a live WebSub subscription are not polled; pushes wake them.
+    """
+
+    def __init__(self, fetcher: SocialMediaFetcher):
+        self.fetcher = fetcher
+        self.interval = settings.LONGPOLL_INTERVAL
+        self._watches: Dict[Tuple[str, str], _Watch] = {}
+        # (platform, resolved channel ID) -> keys of the watches on it, so
+        # listener updates reach watches made with a username or handle
+        self._channel_keys: Dict[Tuple[str, str], Set[Tuple[str, str]]] = (
+            defaultdict(set)
+        )
+        fetcher.post_listeners.append(self._on_post)
+
+    def __len__(self) -> int:
+        return len(self._watches)
+
+    def _on_post(
+        self, platform_str: str, channel_id: str, post: Optional[SocialMediaPost]
+    ) -> None:
+        channel_key = (platform_str, channel_id)
+        for key in self._channel_keys.get(channel_key, ()) or (channel_key,):
+            watch = self._watches.get(key)
+            if watch is None:
+                continue
+            if post is not None:
+                watch.pushed = post
+            else:
+                watch.stale = True
+            watch.poke.set()
+
+    async def _publish(
+        self,
+        key: Tuple[str, str],
+        watch: _Watch,
+        post: Optional[SocialMediaPost],
+        error: Optional[Exception] = None,
+    ) -> None:
+        async with watch.condition:
+            watch.latest = post
+            watch.error = error
+            watch.checked = True
+            watch.condition.notify_all()
+
+        if post is not None:
+            self._channel_keys[(key[0], post.author_id)].add(key)
+
+    @staticmethod
+    async def _wait(watch: _Watch, ready) -> None:
+        async with watch.condition:
+            await watch.condition.wait_for(ready)
+
+    def _pushed_live(self, platform: Platform, watch: _Watch) -> bool:
+        """Whether WebSub pushes the channel's new posts, so periodic polls are moot"""
+        websub = self.fetcher.websub
+        return (
+            platform == Platform.YOUTUBE
+            and websub is not None
+            and watch.latest is not None
+            and websub.is_live(watch.latest.author_id)
+        )
+
+    async def _check(
+        self, platform: Platform, identifier: str, watch: _Watch
+    ) -> Optional[SocialMediaPost]:
+        """The channel's latest post, asking upstream for as little as possible"""
+        if watch.stale:
+            # Pushed: fetch the new post in full, whatever the subscription
+            watch.stale = False
+            return await self.fetcher.get_latest_post(
+                platform, identifier, refresh=True
+            )
+
+        if not watch.checked:
+            # The first check may be answered from cache, unless the cached
+            # post is not one a waiter has and may be older than theirs
+            post = await self.fetcher.get_latest_post(platform, identifier)
+            if post is None or not any(
+                since_id != post.id for since_id in watch.since_ids
+            ):
+                return post
+            return await self.fetcher.get_latest_post(
+                platform, identifier, refresh=True
+            )
+
+        if self._pushed_live(platform, watch):
+            return watch.latest
+
+        if watch.latest is not None:
+            head = await self.fetcher.get_latest_post(
+                platform, identifier, fields=POLL_FIELDS, refresh=True
+            )
+            if head is None or head.id == watch.latest.id:
+                return watch.latest if head else None
+        return await self.fetcher.get_latest_post(platform, identifier, refresh=True)
+
+    async def _poll(self, key: Tuple[str, str], watch: _Watch) -> None:
+        platform, identifier = Platform(key[0]), key[1]
+        set_context(RequestContext(client_id="post-watcher", priority=Priority.BATCH))
+
+        try:
+            while watch.waiters:
+                post = watch.pushed
+                watch.pushed = None
+                if post is None:
+                    try:
+                        post = await self._check(platform, identifier, watch)
+                    except (ChannelNotFoundError, ValueError) as e:
+                        # Unknown channel or unsupported platform: tell everyone
+                        await self._publish(key, watch, None, e)
+                        return
+                    except Exception as e:
+                        logger.warning(f"Long-poll check of {key} failed: {e}")
+                        post = watch.latest
+                await self._publish(key, watch, post)
+
+                # Our own fetch was reported to the listener as well; pushes
+                # that arrived meanwhile still need a check
+                watch.pushed = None
+                if not watch.stale:
+                    watch.poke.clear()
+                try:
+                    await asyncio.wait_for(watch.poke.wait(), self.interval)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            if self._watches.get(key) is watch:
+                del self._watches[key]
+            for channel_key, keys in list(self._channel_keys.items()):
+                keys.discard(key)
+                if not keys:
+                    del self._channel_keys[channel_key]
+
+    async def wait_for_new(
+        self,
+        platform: Platform,
+        channel_identifier: str,
+        since_id: Optional[str],
+        timeout: float,
+    ) -> Optional[SocialMediaPost]:
+        """Latest post once it is not ``since_id``, or ``None`` after ``timeout``
+
+        Without ``since_id`` this returns the current latest post as soon as
+        it is known. Raises ``ChannelNotFoundError`` for unknown channels and
+        ``ValueError`` for platforms that are not configured.
+        """
+        key = (platform.value, channel_identifier)
+        watch = self._watches.get(key)
+        if watch is None:
+            watch = self._watches[key] = _Watch()
+
+        def ready() -> bool:
+            if watch.error is not None:
+                return True
+            if not watch.checked or watch.latest is None:
+                return False
+            return since_id is None or watch.latest.id != since_id
+
+        watch.waiters += 1
+        if since_id is not None:
+            watch.since_ids[since_id] += 1
+        if watch.task is None or watch.task.done():
+            watch.task = asyncio.create_task(self._poll(key, watch))
+
+        disconnected = current_context().disconnected
+        try:
+            stops = [asyncio.ensure_future(self._wait(watch, ready))]
+            if disconnected is not None:
+                stops.append(asyncio.ensure_future(disconnected.wait()))
+            try:
+                await asyncio.wait(
+                    stops, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+            finally:
+                for stop in stops:
+                    stop.cancel()
+                await asyncio.gather(*stops, return_exceptions=True)
+
+            if watch.error is not None:
+                raise watch.error
+            return watch.latest if ready() else None
+        finally:
+            watch.waiters -= 1
+            if since_id is not None:
+                watch.since_ids[since_id] -= 1
+                if not watch.since_ids[since_id]:
+                    del watch.since_ids[since_id]
+            if not watch.waiters:
+                watch.poke.set()  # let the poller notice and stop
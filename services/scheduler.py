@@ -0,0 +1,169 @@
+import asyncio
+import contextvars
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Optional
+
+from core.context import Priority, RequestContext, current_context
+from core.exceptions import DeadlineExceededError
+from utils.latency import LatencyWindow
+from utils.profiling import profiled_call
+
+# Recent queue waits kept per class for percentiles
+WAIT_SAMPLES = 1024
+
+
+class _Job:
+    __slots__ = ("fn", "args", "future", "context", "request", "enqueued_at")
+
+    def __init__(
+        self,
+        fn: Callable,
+        args: tuple,
+        future: asyncio.Future,
+        request: RequestContext,
+    ):
+        self.fn = fn
+        self.args = args
+        self.future = future
+        # Run in a copy of the caller's context so upstream code sees it
+        self.context = contextvars.copy_context()
+        self.request = request
+        self.enqueued_at = time.monotonic()
+
+
+class _ClassStats:
+    __slots__ = ("waits", "started", "dropped")
+
+    def __init__(self):
+        self.waits = LatencyWindow(WAIT_SAMPLES)
+        self.started = 0
+        self.dropped = 0
+
+    def summary(self, queued: int) -> Dict[str, Any]:
+        def ms(p: float) -> float:
+            return round((self.waits.percentile(p) or 0.0) * 1000, 2)
+
+        return {
+            "queued": queued,
+            "started": self.started,
+            "dropped": self.dropped,
+            "wait_ms_p50": ms(0.50),
+            "wait_ms_p95": ms(0.95),
+            "wait_ms_max": ms(1.0),
+        }
+
+
+class UpstreamScheduler:
+    """Runs blocking upstream calls on a bounded thread pool, by priority
+
+    Jobs wait in one queue per priority class; a free slot always goes to
+    the highest non-empty class. Within a class, clients take turns (one
+    job each, round-robin), so one client's large batch cannot starve
+    another's single lookup. Jobs whose caller was cancelled, disconnected
+    or passed its deadline are dropped when they reach the head of the
+    queue instead of using a slot.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._running = 0
+        # priority -> client_id -> that client's pending jobs
+        self._queues: Dict[Priority, "OrderedDict[str, Deque[_Job]]"] = {
+            priority: OrderedDict() for priority in Priority
+        }
+        self._stats = {priority: _ClassStats() for priority in Priority}
+
+    async def submit(self, fn: Callable, *args) -> Any:
+        """Run ``fn(*args)`` in the pool under the current request context"""
+        request = current_context()
+        job = _Job(fn, args, asyncio.get_running_loop().create_future(), request)
+
+        self._queues[request.priority].setdefault(
+            request.client_id, deque()
+        ).append(job)
+        self._dispatch()
+
+        # Cancelling the caller cancels job.future, so a queued job is skipped;
+        # a job already running is bounded by its upstream timeouts instead
+        try:
+            return await asyncio.wait_for(job.future, request.remaining())
+        except asyncio.TimeoutError:
+            if job.future.done() and not job.future.cancelled():
+                raise  # the upstream call itself timed out
+            raise DeadlineExceededError("Request deadline exceeded")
+
+    def _dispatch(self) -> None:
+        while self._running < self.max_workers:
+            job = self._next_job()
+            if job is None:
+                return
+            self._start(job)
+
+    def _next_job(self) -> Optional[_Job]:
+        for priority, clients in self._queues.items():
+            while clients:
+                client_id, jobs = next(iter(clients.items()))
+                job = jobs.popleft()
+                if jobs:
+                    clients.move_to_end(client_id)
+                else:
+                    del clients[client_id]
+
+                if self._drop_if_stale(job):
+                    self._stats[priority].dropped += 1
+                    continue
+                return job
+        return None
+
+    @staticmethod
+    def _drop_if_stale(job: _Job) -> bool:
+        if job.future.done():
+            return True
+        if job.request.disconnected is not None and job.request.disconnected.is_set():
+            job.future.set_exception(DeadlineExceededError("Client disconnected"))
+            return True
+        if job.request.expired():
+            job.future.set_exception(
+                DeadlineExceededError("Request deadline exceeded while queued")
+            )
+            return True
+        return False
+
+    def _start(self, job: _Job) -> None:
+        stats = self._stats[job.request.priority]
+        stats.waits.add(time.monotonic() - job.enqueued_at)
+        stats.started += 1
+
+        self._running += 1
+        loop = asyncio.get_running_loop()
+        running = loop.run_in_executor(
+            self._executor, job.context.run, profiled_call, job.fn, *job.args
+        )
+        running.add_done_callback(lambda done: self._finish(job, done))
+
+    def _finish(self, job: _Job, done: asyncio.Future) -> None:
+        self._running -= 1
+        if not job.future.done():
+            if done.cancelled():
+                job.future.cancel()
+            elif done.exception() is not None:
+                job.future.set_exception(done.exception())
+            else:
+                job.future.set_result(done.result())
+        self._dispatch()
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, throughput and queue wait percentiles per class"""
+        return {
+            "workers": self.max_workers,
+            "running": self._running,
+            "classes": {
+                priority.name.lower(): self._stats[priority].summary(
+                    sum(len(jobs) for jobs in self._queues[priority].values())
+                )
+                for priority in Priority
+            },
+        }
@@ -0,0 +1,152 @@
+import marshal
+import mmap
+import os
+import struct
+from typing import Any, Dict, Hashable, Iterable, Iterator, Optional, Tuple
+
+from core.models import ChannelInfo, Platform
+from core.records import PostRecord
+
+MAGIC = b"SMAPISN1"
+# magic, index offset, index length
+HEADER = struct.Struct("<8sQQ")
+
+# Entry kinds and how their values are stored (marshal only takes builtins)
+POST = "post"
+CHANNEL_ID = "channel_id"
+CHANNEL_INFO = "channel_info"
+
+
+def encode_value(kind: str, value: Any) -> Any:
+    if kind == POST:
+        return tuple(getattr(value, slot) for slot in PostRecord.__slots__)
+    if kind == CHANNEL_INFO:
+        return (
+            value.id,
+            value.name,
+            value.username,
+            value.platform.value,
+            value.url,
+            value.follower_count,
+        )
+    return value
+
+
+def decode_value(kind: str, data: Any) -> Any:
+    if kind == POST:
+        return PostRecord(*data)
+    if kind == CHANNEL_INFO:
+        id, name, username, platform, url, follower_count = data
+        return ChannelInfo.model_construct(
+            id=id,
+            name=name,
+            username=username,
+            platform=Platform(platform),
+            url=url,
+            follower_count=follower_count,
+        )
+    return data
+
+
+def write_snapshot(
+    path: str, entries: Iterable[Tuple[str, Hashable, Any, float]]
+) -> int:
+    """Write ``(kind, key, value, expires_at)`` entries; returns the count
+
+    Each value is marshalled on its own, followed by an index of
+    ``(kind, key, expires_at, offset, length)``, so a reader can map the file
+    and decode single entries on demand. The file is replaced atomically.
+    """
+    index = []
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, 0, 0))
+        for kind, key, value, expires_at in entries:
+            blob = marshal.dumps(encode_value(kind, value))
+            index.append((kind, key, expires_at, f.tell(), len(blob)))
+            f.write(blob)
+
+        index_blob = marshal.dumps(index)
+        index_offset = f.tell()
+        f.write(index_blob)
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, index_offset, len(index_blob)))
+
+    os.replace(tmp_path, path)
+    return len(index)
+
+
+class SnapshotReader:
+    """Memory-mapped snapshot; only the index is decoded up front
+
+    Values are decoded from the mapping when ``take`` asks for them, so
+    loading a large snapshot costs one index decode regardless of how many
+    entries are used afterwards.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            magic, index_offset, index_length = HEADER.unpack_from(self._map)
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a cache snapshot")
+            index = marshal.loads(
+                self._map[index_offset : index_offset + index_length]
+            )
+        except Exception:
+            self._map.close()
+            raise
+
+        # (kind, key) -> (expires_at, offset, length)
+        self._index: Dict[Tuple[str, Hashable], Tuple[float, int, int]] = {
+            (kind, key): (expires_at, offset, length)
+            for kind, key, expires_at, offset, length in index
+        }
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def _decode(self, location: Tuple[float, int, int], kind: str) -> Any:
+        _, offset, length = location
+        return decode_value(kind, marshal.loads(self._map[offset : offset + length]))
+
+    def get(self, kind: str, key: Hashable) -> Optional[Tuple[Any, float]]:
+        """Decode an entry: ``(value, expires_at)`` or ``None``"""
+        location = self._index.get((kind, key))
+        if location is None:
+            return None
+        return self._decode(location, kind), location[0]
+
+    def take(self, kind: str, key: Hashable) -> Optional[Tuple[Any, float]]:
+        """Decode and remove an entry: ``(value, expires_at)`` or ``None``"""
+        location = self._index.pop((kind, key), None)
+        if location is None:
+            return None
+        return self._decode(location, kind), location[0]
+
+    def keys(self) -> Iterator[Tuple[str, Hashable, float]]:
+        """``(kind, key, expires_at)`` of the entries not taken yet"""
+        for (kind, key), (expires_at, _, _) in list(self._index.items()):
+            yield kind, key, expires_at
+
+    def remaining(self, now: float) -> Iterator[Tuple[str, Hashable, Any, float]]:
+        """The live entries not taken yet, to carry into a new snapshot
+
+        The entries are chosen when called and decoded as the iterator is
+        consumed, which may be in another thread.
+        """
+        live = [
+            (kind, key, location)
+            for (kind, key), location in self._index.items()
+            if location[0] > now
+        ]
+        return (
+            (kind, key, self._decode(location, kind), location[0])
+            for kind, key, location in live
+        )
+
+    def close(self) -> None:
+        self._index.clear()
+        self._map.close()
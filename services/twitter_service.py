@@ -1,103 +1,462 @@
+import requests
+import threading
+import time
 import tweepy
-from typing import Optional
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple, Union
 from core.base import BaseSocialMediaService
 from core.models import Platform, SocialMediaPost, ChannelInfo
-from core.exceptions import APIError, AuthenticationError, ChannelNotFoundError
+from core.exceptions import (
+    APIError,
+    AuthenticationError,
+    ChannelNotFoundError,
+    DeadlineExceededError,
+    RateLimitError,
+    SocialMediaFetcherError,
+)
 from config.settings import settings
+from utils.credential_pool import Credential, CredentialPool, unique_secrets
+from utils.deadline import DeadlineSession
+
+MAX_USERNAME_LENGTH = 15
+# Identifiers naming an account by numeric user ID rather than by username
+# (which may be all digits too): "id:783214"
+USER_ID_PREFIX = "id:"
+# Problem types (last segment of the problem "type" URI, or its "reason") of
+# 403s about the app or token itself rather than the requested resource
+CREDENTIAL_PROBLEMS = {
+    "client-forbidden",
+    "client-not-enrolled",
+    "unsupported-authentication",
+    "usage-capped",
+}
+
+
+def _problem_types(error: tweepy.HTTPException) -> Set[str]:
+    """Problem types and reasons of a Twitter API v2 error response"""
+    try:
+        body = error.response.json()
+    except ValueError:
+        return set()
+    if not isinstance(body, dict):
+        return set()
+    problems = [body] + [e for e in body.get("errors", []) if isinstance(e, dict)]
+    types = set()
+    for problem in problems:
+        if isinstance(problem.get("type"), str):
+            types.add(problem["type"].rstrip("/").rsplit("/", 1)[-1])
+        if isinstance(problem.get("reason"), str):
+            types.add(problem["reason"])
+    return types
 
 
 class TwitterService(BaseSocialMediaService):
-    """Twitter/X service implementation"""
+    """Twitter/X service implementation
+
+    Accounts are named by username, or by user ID with ``USER_ID_PREFIX``.
+    Timelines of accounts named by ID need no user lookup first: the author
+    comes back as an expansion of the timeline call.
+    """
+
+    accepts_channel_ids = True
 
     def __init__(self):
         super().__init__()
-        if not settings.TWITTER_BEARER_TOKEN:
+        bearer_tokens = unique_secrets(
+            settings.TWITTER_BEARER_TOKEN, settings.TWITTER_BEARER_TOKENS
+        )
+        if not bearer_tokens:
             raise AuthenticationError("Twitter Bearer token not provided")
 
+        # Rate-limit headers of the last response, per worker thread
+        self._local = threading.local()
         try:
-            self.client = tweepy.Client(
-                bearer_token=settings.TWITTER_BEARER_TOKEN, wait_on_rate_limit=True
+            # One client per token; calls go to the token with most requests left
+            self.credentials = CredentialPool(
+                "twitter",
+                [
+                    Credential(
+                        CredentialPool.label("twitter", i),
+                        self._make_client(token),
+                    )
+                    for i, token in enumerate(bearer_tokens)
+                ],
             )
         except Exception as e:
             raise AuthenticationError(f"Failed to initialize Twitter client: {e}")
 
+    def _make_client(self, bearer_token: str) -> tweepy.Client:
+        # Fail fast on 429 instead of sleeping in a worker until the reset
+        client = tweepy.Client(bearer_token=bearer_token, wait_on_rate_limit=False)
+        # tweepy sends requests without a timeout; bound them by the deadline
+        client.session = DeadlineSession(settings.REQUEST_TIMEOUT)
+        client.session.hooks["response"].append(self._remember_headers)
+        return client
+
+    def _remember_headers(self, response, *args, **kwargs) -> None:
+        self._local.headers = response.headers
+
+    def _call(self, method: str, **kwargs) -> Any:
+        """Call a ``tweepy.Client`` method with the token that has most budget left
+
+        Rate limits are per endpoint, so each token's remaining requests are
+        tracked per method from the ``x-rate-limit-*`` response headers. A
+        token that gets a 429, or a 403 about the token itself (e.g. a spent
+        usage cap, see ``CREDENTIAL_PROBLEMS``), is quarantined until the
+        reported reset and the call is retried with the next token; once none
+        is left the error is raised. Other 403s are raised as they are, and
+        timeouts (bounded by the request deadline) as ``DeadlineExceededError``.
+        """
+        while True:
+            credential = self.credentials.acquire(method)
+            self._local.headers = None
+            try:
+                return getattr(credential.client, method)(**kwargs)
+            except (tweepy.TooManyRequests, tweepy.Forbidden) as e:
+                if isinstance(e, tweepy.Forbidden) and not (
+                    _problem_types(e) & CREDENTIAL_PROBLEMS
+                ):
+                    raise
+                reset = e.response.headers.get("x-rate-limit-reset")
+                until = (
+                    float(reset)
+                    if reset
+                    else time.time() + settings.CREDENTIAL_QUARANTINE_SECONDS
+                )
+                self.credentials.quarantine(
+                    credential, until, f"HTTP {e.response.status_code}"
+                )
+                if not self.credentials.available():
+                    raise
+            except requests.Timeout as e:
+                raise DeadlineExceededError(f"Twitter API request timed out: {e}")
+            finally:
+                headers = self._local.headers
+                if headers and "x-rate-limit-remaining" in headers:
+                    self.credentials.observe(
+                        credential,
+                        method,
+                        int(headers["x-rate-limit-remaining"]),
+                        float(headers.get("x-rate-limit-reset", 0)),
+                    )
+
     def _get_platform_name(self) -> Platform:
         return Platform.TWITTER
 
+    def channel_id_identifier(self, channel_id: str) -> str:
+        return USER_ID_PREFIX + channel_id
+
+    @staticmethod
+    def _user_id(channel_identifier: str) -> Optional[str]:
+        """The user ID an ``id:``-prefixed identifier names, else ``None``"""
+        if not channel_identifier.startswith(USER_ID_PREFIX):
+            return None
+        user_id = channel_identifier[len(USER_ID_PREFIX) :]
+        if not user_id.isdigit():
+            raise ValueError(f"Twitter user IDs are numeric: {channel_identifier}")
+        return user_id
+
     def validate_credentials(self) -> bool:
         """Validate Twitter API credentials"""
         try:
-            self.client.get_me()
+            for credential in self.credentials.credentials:
+                credential.client.get_me()
             return True
         except Exception:
             return False
 
-    def get_channel_info(self, channel_identifier: str) -> ChannelInfo:
-        """Get Twitter account information"""
+    def get_channel_info(
+        self, channel_identifier: str, fields: Optional[Set[str]] = None
+    ) -> ChannelInfo:
+        """Get Twitter account information, by username or ``id:`` user ID"""
+        user_id = self._user_id(channel_identifier)
         try:
             # Remove @ if present
             username = channel_identifier.lstrip("@")
 
-            user = self.client.get_user(
-                username=username, user_fields=["public_metrics", "url", "description"]
+            user_fields = (
+                ["public_metrics"] if self._wants(fields, "follower_count") else None
             )
+            user = None
+            if user_id is not None:
+                user = self._call("get_user", id=user_id, user_fields=user_fields)
+            elif len(username) <= MAX_USERNAME_LENGTH:
+                user = self._call(
+                    "get_user", username=username, user_fields=user_fields
+                )
 
-            if not user.data:  # type: ignore
+            if user is None or not user.data:  # type: ignore
                 raise ChannelNotFoundError(
                     f"Twitter account not found: {channel_identifier}"
                 )
 
-            user_data = user.data  # type: ignore
-
-            return ChannelInfo(
-                id=str(user_data.id),
-                name=user_data.name,
-                username=user_data.username,
-                platform=self.platform_name,
-                url=f"https://twitter.com/{user_data.username}",
-                follower_count=user_data.public_metrics.get("followers_count", 0),
-            )
+            return self._to_channel_info(user.data)  # type: ignore
 
+        except tweepy.TooManyRequests as e:
+            raise RateLimitError(f"Twitter API rate limit exceeded: {e}")
         except tweepy.TweepyException as e:
             raise APIError(f"Twitter API error: {e}")
 
-    def get_latest_post(self, channel_identifier: str) -> Optional[SocialMediaPost]:
+    def get_channel_info_batch(
+        self, channel_identifiers: Sequence[str], fields: Optional[Set[str]] = None
+    ) -> Dict[str, Union[ChannelInfo, Exception]]:
+        """Get many accounts, 100 user IDs or usernames per get_users call
+
+        A malformed username or ID fails its whole request, so the
+        identifiers of a failed call are retried one by one.
+        """
+        user_fields = (
+            ["public_metrics"] if self._wants(fields, "follower_count") else None
+        )
+        results: Dict[str, Union[ChannelInfo, Exception]] = {}
+
+        # user ID -> identifier
+        by_user_id = {
+            identifier[len(USER_ID_PREFIX) :]: identifier
+            for identifier in channel_identifiers
+            if identifier.startswith(USER_ID_PREFIX)
+            and identifier[len(USER_ID_PREFIX) :].isdigit()
+        }
+        user_ids = list(by_user_id)
+        for start in range(0, len(user_ids), 100):
+            chunk = user_ids[start : start + 100]
+            try:
+                response = self._call("get_users", ids=chunk, user_fields=user_fields)
+            except tweepy.TooManyRequests as e:
+                raise RateLimitError(f"Twitter API rate limit exceeded: {e}")
+            except tweepy.TweepyException:
+                continue
+
+            for user in response.data or []:  # type: ignore
+                identifier = by_user_id.get(str(user.id))
+                if identifier is not None:
+                    results[identifier] = self._to_channel_info(user)
+            for user_id in chunk:
+                identifier = by_user_id[user_id]
+                if identifier not in results:
+                    results[identifier] = ChannelNotFoundError(
+                        f"Twitter account not found: {identifier}"
+                    )
+
+        # Usernames are case-insensitive
+        by_username = {
+            identifier.lstrip("@").lower(): identifier
+            for identifier in channel_identifiers
+            if not identifier.startswith(USER_ID_PREFIX)
+            and len(identifier.lstrip("@")) <= MAX_USERNAME_LENGTH
+        }
+        usernames = list(by_username)
+
+        for start in range(0, len(usernames), 100):
+            chunk = usernames[start : start + 100]
+            try:
+                response = self._call(
+                    "get_users", usernames=chunk, user_fields=user_fields
+                )
+            except tweepy.TooManyRequests as e:
+                raise RateLimitError(f"Twitter API rate limit exceeded: {e}")
+            except tweepy.TweepyException:
+                continue
+
+            for user in response.data or []:  # type: ignore
+                identifier = by_username.get(user.username.lower())
+                if identifier is not None:
+                    results[identifier] = self._to_channel_info(user)
+            for username in chunk:
+                identifier = by_username[username]
+                if identifier not in results:
+                    results[identifier] = ChannelNotFoundError(
+                        f"Twitter account not found: {identifier}"
+                    )
+
+        for identifier in channel_identifiers:
+            if identifier not in results:
+                try:
+                    results[identifier] = self.get_channel_info(identifier, fields)
+                except (SocialMediaFetcherError, ValueError) as e:
+                    results[identifier] = e
+        return results
+
+    def _to_channel_info(self, user: tweepy.User) -> ChannelInfo:
+        return ChannelInfo(
+            id=str(user.id),
+            name=user.name,
+            username=user.username,
+            platform=self.platform_name,
+            url=f"https://twitter.com/{user.username}",
+            follower_count=(
+                user.public_metrics.get("followers_count", 0)
+                if user.public_metrics
+                else None
+            ),
+        )
+
+    def get_latest_post(
+        self, channel_identifier: str, fields: Optional[Set[str]] = None
+    ) -> Optional[SocialMediaPost]:
         """Get the latest tweet from a Twitter account"""
         try:
-            # Get user info first
-            channel_info = self.get_channel_info(channel_identifier)
+            # Only ask for the tweet fields and expansions the caller needs
+            tweet_fields = ["created_at"]
+            if self._wants(fields, "engagement"):
+                tweet_fields.append("public_metrics")
+
+            expansions = []
+            media_params = {}
+            if self._wants(fields, "media_urls"):
+                tweet_fields.append("attachments")
+                expansions.append("attachments.media_keys")
+                media_params = {"media_fields": ["url", "preview_image_url"]}
 
             # Get the latest tweet
-            tweets = self.client.get_users_tweets(
-                id=channel_info.id,
+            tweets, channel_info = self._user_timeline(
+                channel_identifier,
+                expansions,
                 max_results=5,
-                tweet_fields=["created_at", "public_metrics", "attachments"],
-                expansions=["attachments.media_keys"],
-                media_fields=["url", "preview_image_url"],
+                tweet_fields=tweet_fields,
+                **media_params,
             )
 
             if not tweets.data:  # type: ignore
                 return None
 
             tweet = tweets.data[0]  # type: ignore
-            media_urls = []
-
-            return SocialMediaPost(
-                id=str(tweet.id),
-                platform=self.platform_name,
-                author=channel_info.name,
-                author_id=channel_info.id,
-                content=tweet.text,
-                created_at=tweet.created_at,
-                url=f"https://twitter.com/{channel_info.username}/status/{tweet.id}",
-                media_urls=media_urls,
-                engagement={
-                    "likes": tweet.public_metrics.get("like_count", 0),
-                    "retweets": tweet.public_metrics.get("retweet_count", 0),
-                    "replies": tweet.public_metrics.get("reply_count", 0),
-                    "quotes": tweet.public_metrics.get("quote_count", 0),
-                },
+            media_by_key = self._media_by_key(tweets) if media_params else {}
+
+            return self._to_post(tweet, channel_info, media_by_key)
+
+        except tweepy.TooManyRequests as e:
+            raise RateLimitError(f"Twitter API rate limit exceeded: {e}")
+        except tweepy.TweepyException as e:
+            raise APIError(f"Twitter API error: {e}")
+
+    def get_recent_posts(
+        self, channel_identifier: str, limit: int, page_token: Optional[str] = None
+    ) -> Tuple[List[SocialMediaPost], Optional[str]]:
+        """Get a page of recent tweets from a Twitter account"""
+        try:
+            tweets, channel_info = self._user_timeline(
+                channel_identifier,
+                ["attachments.media_keys"],
+                # The timeline endpoint accepts between 5 and 100 results
+                max_results=max(5, min(limit, 100)),
+                pagination_token=page_token,
+                tweet_fields=["created_at", "public_metrics", "attachments"],
+                media_fields=["url", "preview_image_url"],
+            )
+
+            media_by_key = self._media_by_key(tweets)
+            posts = [
+                self._to_post(tweet, channel_info, media_by_key)
+                for tweet in tweets.data or []  # type: ignore
+            ]
+
+            return posts, tweets.meta.get("next_token")  # type: ignore
+
+        except tweepy.TooManyRequests as e:
+            raise RateLimitError(f"Twitter API rate limit exceeded: {e}")
+        except tweepy.TweepyException as e:
+            raise APIError(f"Twitter API error: {e}")
+
+    def _user_timeline(
+        self, channel_identifier: str, expansions: List[str], **params: Any
+    ) -> Tuple[tweepy.Response, Optional[ChannelInfo]]:
+        """A ``get_users_tweets`` page and the account's identity
+
+        Accounts named by username are looked up first. For ``id:`` accounts
+        the author is expanded into the timeline response instead, so the
+        identity is ``None`` when the page has no tweets.
+        """
+        user_id = self._user_id(channel_identifier)
+        channel_info = None
+        if user_id is None:
+            # The posts only need the account's identity fields
+            channel_info = self.get_channel_info(
+                channel_identifier, fields={"id", "name", "username"}
             )
+            user_id = channel_info.id
+        else:
+            expansions = expansions + ["author_id"]
 
+        tweets = self._call(
+            "get_users_tweets", id=user_id, expansions=expansions or None, **params
+        )
+        if channel_info is None:
+            if not tweets.data and any(  # type: ignore
+                error.get("title") == "Not Found Error"
+                for error in tweets.errors  # type: ignore
+            ):
+                raise ChannelNotFoundError(
+                    f"Twitter account not found: {channel_identifier}"
+                )
+            for user in tweets.includes.get("users", []):  # type: ignore
+                if str(user.id) == user_id:
+                    channel_info = self._to_channel_info(user)
+            if tweets.data and channel_info is None:  # type: ignore
+                raise APIError(f"Twitter timeline of {channel_identifier} has no author")
+        return tweets, channel_info
+
+    def get_engagement_batch(self, post_ids: Sequence[str]) -> Dict[str, Dict[str, int]]:
+        """Get public metrics for many tweets, 100 per get_tweets call"""
+        engagement = {}
+        try:
+            for start in range(0, len(post_ids), 100):
+                tweets = self._call(
+                    "get_tweets",
+                    ids=list(post_ids[start : start + 100]),
+                    tweet_fields=["public_metrics"],
+                )
+                for tweet in tweets.data or []:  # type: ignore
+                    engagement[str(tweet.id)] = self._engagement_from_metrics(
+                        tweet.public_metrics
+                    )
+        except tweepy.TooManyRequests as e:
+            raise RateLimitError(f"Twitter API rate limit exceeded: {e}")
         except tweepy.TweepyException as e:
             raise APIError(f"Twitter API error: {e}")
+
+        return engagement
+
+    @staticmethod
+    def _engagement_from_metrics(public_metrics: dict) -> Dict[str, int]:
+        """Map a tweet's ``public_metrics`` to the engagement dict"""
+        return {
+            "likes": public_metrics.get("like_count", 0),
+            "retweets": public_metrics.get("retweet_count", 0),
+            "replies": public_metrics.get("reply_count", 0),
+            "quotes": public_metrics.get("quote_count", 0),
+        }
+
+    @staticmethod
+    def _media_by_key(tweets) -> Dict[str, tweepy.Media]:
+        """Index the expanded media of a tweets response by media key"""
+        return {media.media_key: media for media in tweets.includes.get("media", [])}
+
+    def _to_post(
+        self,
+        tweet: tweepy.Tweet,
+        channel_info: ChannelInfo,
+        media_by_key: Dict[str, tweepy.Media],
+    ) -> SocialMediaPost:
+        """Map a tweet to the unified post model"""
+        media_urls = []
+        for media_key in (tweet.attachments or {}).get("media_keys", []):
+            media = media_by_key.get(media_key)
+            url = media and (media.url or media.preview_image_url)
+            if url:
+                media_urls.append(url)
+
+        engagement = {}
+        if tweet.public_metrics:
+            engagement = self._engagement_from_metrics(tweet.public_metrics)
+
+        return SocialMediaPost(
+            id=str(tweet.id),
+            platform=self.platform_name,
+            author=channel_info.name,
+            author_id=channel_info.id,
+            content=tweet.text,
+            created_at=tweet.created_at,
+            url=f"https://twitter.com/{channel_info.username}/status/{tweet.id}",
+            media_urls=media_urls,
+            engagement=engagement,
+        )
@@ -0,0 +1,188 @@
+import asyncio
+import hashlib
+import hmac
+import logging
+import re
+import time
+from typing import Dict, List, Optional
+
+from config.settings import settings
+from core.exceptions import AuthenticationError, SocialMediaFetcherError
+from services.youtube_feed import FeedEntry, topic_url
+from utils.http_client import HTTPClient
+
+logger = logging.getLogger(__name__)
+
+# Minimum delay before re-sending a subscription the hub has not confirmed
+RESUBSCRIBE_AFTER = 600
+
+# The rel="self" target of a Link header: the topic a notification is for
+_SELF_LINK = re.compile(r'<([^>]*)>\s*;\s*rel="?self"?')
+
+
+def self_topic(link_header: Optional[str]) -> Optional[str]:
+    """Topic URL named by a notification's ``Link: <...>; rel=self`` header"""
+    match = _SELF_LINK.search(link_header or "")
+    return match.group(1) if match else None
+
+
+class _Subscription:
+    """Lease state of one channel's WebSub subscription"""
+
+    __slots__ = ("channel_id", "verified", "requested_at", "expires_at", "last_used")
+
+    def __init__(self, channel_id: str):
+        self.channel_id = channel_id
+        self.verified = False
+        self.requested_at = 0.0
+        self.expires_at = 0.0
+        self.last_used = time.time()
+
+
+class WebSubSubscriber:
+    """Manages YouTube WebSub (PubSubHubbub) subscriptions
+
+    Subscribes channels' upload feeds at the hub, answers the hub's
+    verification challenges, checks notification signatures and renews
+    leases before they expire. A secret is required: unsigned notifications
+    could otherwise rewrite any cached post. Leases of channels nobody asked
+    about for a whole lease period are left to lapse. The hub URL is
+    configurable, so a local fake hub can drive the full flow.
+    """
+
+    def __init__(
+        self,
+        callback_url: str,
+        hub_url: Optional[str] = None,
+        secret: Optional[str] = None,
+    ):
+        self.callback_url = callback_url
+        self.hub_url = hub_url or settings.WEBSUB_HUB_URL
+        self.secret = secret or settings.WEBSUB_SECRET
+        if not self.secret:
+            raise AuthenticationError(
+                "WEBSUB_SECRET is required when WEBSUB_CALLBACK_URL is set"
+            )
+        self.lease_seconds = settings.WEBSUB_LEASE_SECONDS
+        self.renew_margin = settings.WEBSUB_RENEW_MARGIN
+        self._subscriptions: Dict[str, _Subscription] = {}
+        self._http = HTTPClient()
+
+    def _request(self, channel_id: str, mode: str) -> None:
+        """Send a (un)subscription request to the hub (blocking)"""
+        data = {
+            "hub.callback": self.callback_url,
+            "hub.topic": topic_url(channel_id),
+            "hub.mode": mode,
+            "hub.verify": "async",
+            "hub.lease_seconds": str(self.lease_seconds),
+            "hub.secret": self.secret,
+        }
+
+        self._http.post(self.hub_url, data=data)
+
+    async def _subscribe(self, subscription: _Subscription) -> None:
+        subscription.requested_at = time.time()
+        try:
+            loop = asyncio.get_event_loop()
+            await loop.run_in_executor(
+                None, self._request, subscription.channel_id, "subscribe"
+            )
+        except SocialMediaFetcherError as e:
+            logger.warning(f"WebSub subscribe failed for {subscription.channel_id}: {e}")
+
+    def ensure_subscribed(self, channel_id: str) -> None:
+        """Mark a channel as in use and subscribe it if not already pending"""
+        subscription = self._subscriptions.get(channel_id)
+        if subscription is None:
+            subscription = self._subscriptions[channel_id] = _Subscription(channel_id)
+            asyncio.ensure_future(self._subscribe(subscription))
+
+        subscription.last_used = time.time()
+
+    def topic_channel_id(self, topic: str) -> Optional[str]:
+        """Channel ID of a topic we subscribed to, if any"""
+        channel_id = topic.rsplit("channel_id=", 1)[-1]
+        if channel_id in self._subscriptions and topic_url(channel_id) == topic:
+            return channel_id
+        return None
+
+    def verify(
+        self, mode: str, topic: str, challenge: str, lease_seconds: Optional[int]
+    ) -> Optional[str]:
+        """Handle a hub verification request
+
+        Returns the challenge to echo back, or ``None`` to refuse it.
+        """
+        channel_id = self.topic_channel_id(topic)
+        if channel_id is None:
+            return None
+
+        if mode == "subscribe":
+            subscription = self._subscriptions[channel_id]
+            subscription.verified = True
+            subscription.expires_at = time.time() + (lease_seconds or self.lease_seconds)
+        elif mode == "unsubscribe":
+            self._subscriptions.pop(channel_id, None)
+        else:
+            return None
+
+        return challenge
+
+    def is_live(self, channel_id: str) -> bool:
+        """Whether the channel has a confirmed, unexpired subscription"""
+        subscription = self._subscriptions.get(channel_id)
+        return (
+            subscription is not None
+            and subscription.verified
+            and subscription.expires_at > time.time()
+        )
+
+    def accepted_entries(
+        self, topic: Optional[str], entries: List[FeedEntry]
+    ) -> List[FeedEntry]:
+        """Entries of a notification that belong to its live subscription
+
+        A notification naming a topic we are not live on is dropped whole;
+        entries of other channels than its topic are dropped too.
+        """
+        if topic is not None:
+            channel_id = self.topic_channel_id(topic)
+            if channel_id is None or not self.is_live(channel_id):
+                return []
+            return [entry for entry in entries if entry.channel_id == channel_id]
+        return [entry for entry in entries if self.is_live(entry.channel_id)]
+
+    def verify_signature(self, body: bytes, signature: Optional[str]) -> bool:
+        """Check the ``X-Hub-Signature`` HMAC of a notification body"""
+        if not signature or "=" not in signature:
+            return False
+
+        algorithm, _, received = signature.partition("=")
+        if algorithm not in ("sha1", "sha256", "sha384", "sha512"):
+            return False
+
+        expected = hmac.new(self.secret.encode(), body, getattr(hashlib, algorithm))
+        return hmac.compare_digest(expected.hexdigest(), received.strip().lower())
+
+    async def run_renewals(self, interval: float = 60.0) -> None:
+        """Renew leases that are about to expire, until cancelled"""
+        while True:
+            await asyncio.sleep(interval)
+            now = time.time()
+
+            for channel_id, subscription in list(self._subscriptions.items()):
+                # Let channels nobody asked about during a whole lease lapse
+                if now - subscription.last_used > self.lease_seconds:
+                    if subscription.expires_at <= now:
+                        self._subscriptions.pop(channel_id, None)
+                    continue
+
+                # Renew leases ahead of expiry, and retry requests the hub
+                # never confirmed
+                expiring = (
+                    not subscription.verified
+                    or subscription.expires_at - self.renew_margin <= now
+                )
+                if expiring and now - subscription.requested_at > RESUBSCRIBE_AFTER:
+                    await self._subscribe(subscription)
@@ -0,0 +1,125 @@
+import re
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, NamedTuple, Optional
+from xml.etree.ElementTree import Element, XMLPullParser
+
+from core.models import Platform, SocialMediaPost
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+YT = "{http://www.youtube.com/xml/schemas/2015}"
+TOMBSTONE = "{http://purl.org/atompub/tombstones/1.0}"
+
+FEED_URL = "https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"
+TOPIC_URL = "https://www.youtube.com/xml/feeds/videos.xml?channel_id={channel_id}"
+
+# Hub notifications carry nanosecond timestamps; datetime only takes micros
+_EXTRA_FRACTION_DIGITS = re.compile(r"(\.\d{6})\d+")
+
+
+class FeedEntry(NamedTuple):
+    """A video entry from a YouTube Atom feed or WebSub notification"""
+
+    video_id: str
+    channel_id: str
+    title: str
+    author: str
+    published: Optional[datetime]
+    updated: Optional[datetime]
+    deleted: bool = False
+
+
+def feed_url(channel_id: str) -> str:
+    """Public Atom feed URL of a channel"""
+    return FEED_URL.format(channel_id=channel_id)
+
+
+def topic_url(channel_id: str) -> str:
+    """WebSub topic URL of a channel's uploads"""
+    return TOPIC_URL.format(channel_id=channel_id)
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    value = _EXTRA_FRACTION_DIGITS.sub(r"\1", value.strip().replace("Z", "+00:00"))
+    return datetime.fromisoformat(value)
+
+
+def _text(element: Element, tag: str) -> str:
+    return (element.findtext(tag) or "").strip()
+
+
+def _to_entry(element: Element) -> Optional[FeedEntry]:
+    if element.tag == ATOM + "entry":
+        video_id = _text(element, YT + "videoId")
+        if not video_id:
+            return None
+        return FeedEntry(
+            video_id=video_id,
+            channel_id=_text(element, YT + "channelId"),
+            title=_text(element, ATOM + "title"),
+            author=_text(element, f"{ATOM}author/{ATOM}name"),
+            published=_parse_timestamp(element.findtext(ATOM + "published")),
+            updated=_parse_timestamp(element.findtext(ATOM + "updated")),
+        )
+
+    # <at:deleted-entry ref="yt:video:ID"> with the channel URI under <at:by>
+    ref = element.get("ref", "")
+    channel_uri = _text(element, f"{TOMBSTONE}by/{ATOM}uri")
+    return FeedEntry(
+        video_id=ref.rsplit(":", 1)[-1],
+        channel_id=channel_uri.rstrip("/").rsplit("/", 1)[-1],
+        title="",
+        author=_text(element, f"{TOMBSTONE}by/{ATOM}name"),
+        published=None,
+        updated=_parse_timestamp(element.get("when")),
+        deleted=True,
+    )
+
+
+def iter_feed_entries(
+    chunks: Iterable[bytes], limit: Optional[int] = None
+) -> Iterator[FeedEntry]:
+    """Incrementally parse feed entries from a stream of byte chunks
+
+    Entries are yielded as soon as their closing tag arrives and released
+    afterwards, so callers that only need the newest entry can stop reading
+    the response after the first one.
+    """
+    parser = XMLPullParser(events=("end",))
+    yielded = 0
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        for _, element in parser.read_events():
+            if element.tag not in (ATOM + "entry", TOMBSTONE + "deleted-entry"):
+                continue
+
+            entry = _to_entry(element)
+            element.clear()
+            if entry is None:
+                continue
+
+            yield entry
+            yielded += 1
+            if limit is not None and yielded >= limit:
+                return
+
+    parser.close()
+
+
+def feed_entry_to_post(
+    entry: FeedEntry, engagement: Optional[Dict[str, int]] = None
+) -> SocialMediaPost:
+    """Map a feed entry to the unified post model"""
+    return SocialMediaPost(
+        id=entry.video_id,
+        platform=Platform.YOUTUBE,
+        author=entry.author,
+        author_id=entry.channel_id,
+        content=entry.title,
+        created_at=entry.published or entry.updated,
+        url=f"https://www.youtube.com/watch?v={entry.video_id}",
+        media_urls=[f"https://img.youtube.com/vi/{entry.video_id}/maxresdefault.jpg"],
+        engagement=engagement or {},
+    )
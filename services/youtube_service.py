@@ -1,159 +1,578 @@
+import httplib2
+import logging
+import re
+import requests
+import threading
+import time
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
-from typing import Optional
-from datetime import datetime
+from googleapiclient.http import HttpRequest
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple, Union
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from xml.etree.ElementTree import ParseError
 from core.base import BaseSocialMediaService
 from core.models import Platform, SocialMediaPost, ChannelInfo
-from core.exceptions import APIError, AuthenticationError, ChannelNotFoundError
+from core.exceptions import (
+    APIError,
+    AuthenticationError,
+    ChannelNotFoundError,
+    SocialMediaFetcherError,
+)
 from config.settings import settings
+from services.youtube_feed import feed_entry_to_post, feed_url, iter_feed_entries
+from utils.credential_pool import Credential, CredentialPool, unique_secrets
+from utils.deadline import DeadlineSession, upstream_timeout
+
+logger = logging.getLogger(__name__)
+
+
+# ChannelInfo field -> (channels.list part, partial-response selector)
+CHANNEL_FIELD_PARTS = {
+    "name": ("snippet", "snippet/title"),
+    "username": ("snippet", "snippet/customUrl"),
+    "follower_count": ("statistics", "statistics/subscriberCount"),
+}
+
+SEARCH_VIDEO_FIELDS = "items(id/videoId,snippet(publishedAt,channelId,title,channelTitle))"
+VIDEO_STATISTICS_FIELDS = "items(statistics(viewCount,likeCount,commentCount))"
+VIDEOS_STATISTICS_FIELDS = "items(id,statistics(viewCount,likeCount,commentCount))"
+PLAYLIST_ITEM_FIELDS = (
+    "nextPageToken,"
+    "items(snippet(title,channelId,channelTitle),contentDetails(videoId,videoPublishedAt))"
+)
+
+# playlistItems.list / videos.list accept at most 50 items per call
+MAX_PAGE_SIZE = 50
+
+# Latest-post strategies, cheapest first: public feed (0 units),
+# uploads playlist (1 unit), search.list (100 units)
+FETCH_STRATEGIES = ("feed", "playlist", "search")
+
+CHANNEL_ID_PATTERN = re.compile(r"^UC[0-9A-Za-z_-]{22}$")
+
+# Data API error reasons that are about the key, not the request
+QUOTA_REASONS = {"quotaExceeded", "dailyLimitExceeded"}
+RATE_LIMIT_REASONS = {"rateLimitExceeded", "userRateLimitExceeded"}
+# Data API error reason of a channel without an uploads playlist: the channel
+# ID names no channel
+MISSING_CHANNEL_REASONS = {"playlistNotFound"}
+SEARCH_COST = 100  # quota units of a search.list call; other calls cost 1
+
+
+def _error_reasons(error: HttpError) -> Set[str]:
+    """The ``reason`` of every error detail of a Data API error"""
+    return {
+        detail.get("reason")
+        for detail in error.error_details or []
+        if isinstance(detail, dict)
+    }
+
+
+def _channel_missing(error: Exception) -> bool:
+    """Whether a latest-post strategy failed because the channel does not exist
+
+    The public feed answers 404 and the uploads playlist ``playlistNotFound``
+    for channel IDs that name no channel.
+    """
+    if isinstance(error, requests.HTTPError):
+        return error.response is not None and error.response.status_code == 404
+    if isinstance(error, HttpError):
+        return bool(_error_reasons(error) & MISSING_CHANNEL_REASONS)
+    return False
+
+
+class _FeedIncomplete(Exception):
+    """The feed entry cannot fill the requested post fields"""
+
+
+def next_quota_reset() -> float:
+    """POSIX time of the next daily quota reset (midnight Pacific Time)"""
+    try:
+        pacific = ZoneInfo("America/Los_Angeles")
+    except ZoneInfoNotFoundError:
+        pacific = timezone(timedelta(hours=-8))
+    tomorrow = datetime.now(pacific).date() + timedelta(days=1)
+    return datetime(
+        tomorrow.year, tomorrow.month, tomorrow.day, tzinfo=pacific
+    ).timestamp()
 
 
 class YouTubeService(BaseSocialMediaService):
     """YouTube service implementation"""
 
+    accepts_channel_ids = True
+
     def __init__(self):
         super().__init__()
-        if not settings.YOUTUBE_API_KEY:
+        api_keys = unique_secrets(settings.YOUTUBE_API_KEY, settings.YOUTUBE_API_KEYS)
+        if not api_keys:
             raise AuthenticationError("YouTube API key not provided")
 
         try:
-            self.youtube = build("youtube", "v3", developerKey=settings.YOUTUBE_API_KEY)
+            # One Data API client per key; calls go to the key with most quota left
+            self.credentials = CredentialPool(
+                "youtube",
+                [
+                    Credential(
+                        CredentialPool.label("youtube", i),
+                        build("youtube", "v3", developerKey=key),
+                    )
+                    for i, key in enumerate(api_keys)
+                ],
+            )
         except Exception as e:
             raise AuthenticationError(f"Failed to initialize YouTube client: {e}")
 
+        # Pooled connections for the public (non Data API) feed endpoint
+        self._session = DeadlineSession(settings.REQUEST_TIMEOUT)
+        # httplib2 connections are not thread-safe: one pool per worker thread
+        self._local = threading.local()
+
     def _get_platform_name(self) -> Platform:
         return Platform.YOUTUBE
 
+    def _http(self) -> httplib2.Http:
+        """This thread's Data API connection pool, timed out by the deadline
+
+        The API key travels in the request URI, so a plain ``Http`` can
+        execute requests built by any key's client.
+        """
+        http = getattr(self._local, "http", None)
+        if http is None:
+            http = self._local.http = httplib2.Http()
+
+        timeout = upstream_timeout(settings.REQUEST_TIMEOUT)
+        http.timeout = timeout
+        # Kept-alive connections hold the timeout they were opened with
+        for connection in http.connections.values():
+            connection.timeout = timeout
+            if connection.sock is not None:
+                connection.sock.settimeout(timeout)
+        return http
+
+    def _execute(
+        self, make_request: Callable[[object], HttpRequest], cost: int = 1
+    ) -> dict:
+        """Run a Data API call with the key that has the most quota left
+
+        ``make_request`` builds the request from a key's client. A key that
+        runs out of quota is quarantined until the daily reset (a rate-limited
+        one for ``CREDENTIAL_QUARANTINE_SECONDS``) and the call is retried
+        with the next key; once none is left the error is raised.
+        """
+        while True:
+            credential = self.credentials.acquire("quota")
+            try:
+                return make_request(credential.client).execute(http=self._http())
+            except HttpError as e:
+                reasons = _error_reasons(e)
+                if reasons & QUOTA_REASONS:
+                    until = next_quota_reset()
+                elif reasons & RATE_LIMIT_REASONS or e.resp.status == 429:
+                    until = time.time() + settings.CREDENTIAL_QUARANTINE_SECONDS
+                else:
+                    raise
+
+                self.credentials.quarantine(credential, until, e.reason)
+                if not self.credentials.available():
+                    raise
+            finally:
+                # Failed calls are charged too
+                self.credentials.spend(
+                    credential,
+                    "quota",
+                    cost,
+                    settings.YOUTUBE_DAILY_QUOTA,
+                    next_quota_reset(),
+                )
+
     def validate_credentials(self) -> bool:
         """Validate YouTube API credentials"""
         try:
             # Make a simple API call to test credentials
-            self.youtube.channels().list(part="id", mine=True).execute()
+            self._execute(lambda youtube: youtube.channels().list(part="id", mine=True))
             return True
         except HttpError:
             return False
         except Exception:
             return False
 
-    def get_channel_info(self, channel_identifier: str) -> ChannelInfo:
+    def _channel_request_params(self, fields: Optional[Set[str]]) -> dict:
+        """Build the minimal ``part``/``fields`` pair for a channels.list call"""
+        parts = ["id"]
+        selectors = ["id"]
+        for field, (part, selector) in CHANNEL_FIELD_PARTS.items():
+            if self._wants(fields, field):
+                if part not in parts:
+                    parts.append(part)
+                selectors.append(selector)
+
+        return {"part": ",".join(parts), "fields": f"items({','.join(selectors)})"}
+
+    @staticmethod
+    def _engagement_from_statistics(stats: dict) -> Dict[str, int]:
+        """Map a videos.list ``statistics`` object to the engagement dict"""
+        return {
+            "views": int(stats.get("viewCount", 0)),
+            "likes": int(stats.get("likeCount", 0)),
+            "comments": int(stats.get("commentCount", 0)),
+        }
+
+    def _resolve_channel_id(self, channel_identifier: str) -> str:
+        """Resolve any channel identifier to its channel ID
+
+        Identifiers already shaped like a channel ID cost no API call.
+        """
+        if CHANNEL_ID_PATTERN.match(channel_identifier):
+            return channel_identifier
+        return self.get_channel_info(channel_identifier, fields={"id"}).id
+
+    def get_channel_info(
+        self, channel_identifier: str, fields: Optional[Set[str]] = None
+    ) -> ChannelInfo:
         """Get YouTube channel information"""
+        params = self._channel_request_params(fields)
         try:
             # Try by channel ID first
-            response = (
-                self.youtube.channels()
-                .list(part="snippet,statistics", id=channel_identifier)
-                .execute()
+            response = self._execute(
+                lambda youtube: youtube.channels().list(id=channel_identifier, **params)
             )
 
             if "items" not in response.keys():
                 # Try by username
-                response = (
-                    self.youtube.channels()
-                    .list(part="snippet,statistics", forUsername=channel_identifier)
-                    .execute()
+                response = self._execute(
+                    lambda youtube: youtube.channels().list(
+                        forUsername=channel_identifier, **params
+                    )
                 )
 
             if "items" not in response.keys():
                 # Try by custom URL (handle)
-                response = (
-                    self.youtube.search()
-                    .list(
-                        part="snippet",
+                response = self._execute(
+                    lambda youtube: youtube.search().list(
+                        part="id",
                         q=channel_identifier,
                         type="channel",
                         maxResults=1,
-                    )
-                    .execute()
+                        fields="items(id/channelId)",
+                    ),
+                    cost=SEARCH_COST,
                 )
 
-                if response["items"]:
+                if response.get("items"):
                     channel_id = response["items"][0]["id"]["channelId"]
-                    response = (
-                        self.youtube.channels()
-                        .list(part="snippet,statistics", id=channel_id)
-                        .execute()
+                    response = self._execute(
+                        lambda youtube: youtube.channels().list(id=channel_id, **params)
                     )
 
-            if not response["items"]:
+            if not response.get("items"):
                 raise ChannelNotFoundError(
                     f"YouTube channel not found: {channel_identifier}"
                 )
 
-            channel_data = response["items"][0]
-            snippet = channel_data["snippet"]
-            statistics = channel_data.get("statistics", {})
-
-            channel_info = ChannelInfo(
-                id=channel_data["id"],
-                name=snippet["title"],
-                username=snippet.get("customUrl"),
-                platform=self.platform_name,
-                url=f"https://www.youtube.com/channel/{channel_data['id']}",
-                follower_count=int(statistics.get("subscriberCount", 0)),
-            )
-
-            return channel_info
+            return self._to_channel_info(response["items"][0])
 
         except HttpError as e:
             raise APIError(f"YouTube API error: {e}")
 
-    def get_latest_post(self, channel_identifier: str) -> Optional[SocialMediaPost]:
-        """Get the latest video from a YouTube channel"""
-        try:
-            # First get channel info to get the channel ID
-            channel_info = self.get_channel_info(channel_identifier)
-
-            # Search for the latest video from this channel
-            response = (
-                self.youtube.search()
-                .list(
-                    part="snippet",
-                    channelId=channel_info.id,
-                    type="video",
-                    order="date",
-                    maxResults=1,
+    def get_channel_info_batch(
+        self, channel_identifiers: Sequence[str], fields: Optional[Set[str]] = None
+    ) -> Dict[str, Union[ChannelInfo, Exception]]:
+        """Get many channels, 50 channel IDs per channels.list call
+
+        Handles and usernames (and IDs whose batch call failed) go through
+        the one-by-one ``get_channel_info`` fallback chain.
+        """
+        results: Dict[str, Union[ChannelInfo, Exception]] = {}
+        params = self._channel_request_params(fields)
+        channel_ids = [i for i in channel_identifiers if CHANNEL_ID_PATTERN.match(i)]
+
+        for start in range(0, len(channel_ids), MAX_PAGE_SIZE):
+            chunk = channel_ids[start : start + MAX_PAGE_SIZE]
+            try:
+                response = self._execute(
+                    lambda youtube: youtube.channels().list(
+                        id=",".join(chunk), **params
+                    )
                 )
-                .execute()
+            except HttpError as e:
+                logger.warning(f"YouTube channels.list batch failed: {e}")
+                continue
+
+            for item in response.get("items", []):
+                results[item["id"]] = self._to_channel_info(item)
+            for channel_id in chunk:
+                if channel_id not in results:
+                    results[channel_id] = ChannelNotFoundError(
+                        f"YouTube channel not found: {channel_id}"
+                    )
+
+        for identifier in channel_identifiers:
+            if identifier not in results:
+                try:
+                    results[identifier] = self.get_channel_info(identifier, fields)
+                except SocialMediaFetcherError as e:
+                    results[identifier] = e
+        return results
+
+    def _to_channel_info(self, channel_data: dict) -> ChannelInfo:
+        snippet = channel_data.get("snippet", {})
+        statistics = channel_data.get("statistics")
+
+        return ChannelInfo(
+            id=channel_data["id"],
+            name=snippet.get("title", ""),
+            username=snippet.get("customUrl"),
+            platform=self.platform_name,
+            url=f"https://www.youtube.com/channel/{channel_data['id']}",
+            follower_count=(
+                int(statistics.get("subscriberCount", 0))
+                if statistics is not None
+                else None
+            ),
+        )
+
+    def _strategy_order(self) -> List[str]:
+        """Configured latest-post strategy first, the others as fallbacks"""
+        preferred = settings.YOUTUBE_FETCH_STRATEGY
+        return [preferred] + [s for s in FETCH_STRATEGIES if s != preferred]
+
+    def _latest_via_feed(
+        self, channel_id: str, fields: Optional[Set[str]] = None
+    ) -> Optional[SocialMediaPost]:
+        """Latest upload from the public Atom feed (no Data API quota)
+
+        The feed is parsed while it streams in and the download stops after
+        the first entry. Entries without a publish date only stand in for a
+        post when the caller does not need ``created_at``.
+        """
+        with self._session.get(feed_url(channel_id), stream=True) as response:
+            response.raise_for_status()
+            entries = list(
+                iter_feed_entries(response.iter_content(chunk_size=4096), limit=1)
             )
 
-            if not response["items"]:
+        if not entries:
+            return None
+        entry = entries[0]
+        if entry.published is None and (
+            self._wants(fields, "created_at") or entry.updated is None
+        ):
+            raise _FeedIncomplete(f"feed entry {entry.video_id} has no publish date")
+        return feed_entry_to_post(entry)
+
+    def _latest_via_playlist(
+        self, channel_id: str, fields: Optional[Set[str]] = None
+    ) -> Optional[SocialMediaPost]:
+        """Latest upload from the uploads playlist (1 quota unit)"""
+        posts, _ = self._playlist_page(channel_id, 1)
+        return posts[0] if posts else None
+
+    def _latest_via_search(
+        self, channel_id: str, fields: Optional[Set[str]] = None
+    ) -> Optional[SocialMediaPost]:
+        """Latest upload from search.list (100 quota units)"""
+        response = self._execute(
+            lambda youtube: youtube.search().list(
+                part="snippet",
+                channelId=channel_id,
+                type="video",
+                order="date",
+                maxResults=1,
+                fields=SEARCH_VIDEO_FIELDS,
+            ),
+            cost=SEARCH_COST,
+        )
+
+        if not response.get("items"):
+            return None
+
+        video = response["items"][0]
+        video_id = video["id"]["videoId"]
+        snippet = video["snippet"]
+
+        return SocialMediaPost(
+            id=video_id,
+            platform=self.platform_name,
+            author=snippet["channelTitle"],
+            author_id=snippet["channelId"],
+            content=snippet["title"],
+            created_at=datetime.fromisoformat(
+                snippet["publishedAt"].replace("Z", "+00:00")
+            ),
+            url=f"https://www.youtube.com/watch?v={video_id}",
+            media_urls=[f"https://img.youtube.com/vi/{video_id}/maxresdefault.jpg"],
+            raw_data=video,
+        )
+
+    def get_latest_post(
+        self, channel_identifier: str, fields: Optional[Set[str]] = None
+    ) -> Optional[SocialMediaPost]:
+        """Get the latest video from a YouTube channel
+
+        Tries the ``YOUTUBE_FETCH_STRATEGY`` strategy first and falls back to
+        the others if it fails, unless it failed because the channel does not
+        exist (IDs shaped like a channel ID are not looked up beforehand).
+        """
+        try:
+            channel_id = self._resolve_channel_id(channel_identifier)
+
+            post = None
+            last_error: Optional[Exception] = None
+            for strategy in self._strategy_order():
+                try:
+                    post = getattr(self, f"_latest_via_{strategy}")(channel_id, fields)
+                    break
+                except (
+                    HttpError,
+                    requests.RequestException,
+                    ParseError,
+                    _FeedIncomplete,
+                ) as e:
+                    if _channel_missing(e):
+                        raise ChannelNotFoundError(
+                            f"YouTube channel not found: {channel_identifier}"
+                        )
+                    logger.warning(f"YouTube {strategy} strategy failed for {channel_id}: {e}")
+                    last_error = e
+            else:
+                raise APIError(f"YouTube API error: {last_error}")
+
+            if post is None:
                 return None
 
-            video = response["items"][0]
-            video_id = video["id"]["videoId"]
-            snippet = video["snippet"]
+            # Statistics cost an extra call, so only fetch them when asked for
+            if self._wants(fields, "engagement"):
+                video_details = self._execute(
+                    lambda youtube: youtube.videos().list(
+                        part="statistics", id=post.id, fields=VIDEO_STATISTICS_FIELDS
+                    )
+                )
 
-            # Get additional video details
-            video_details = (
-                self.youtube.videos()
-                .list(part="statistics,contentDetails", id=video_id)
-                .execute()
-            )
+                stats = (
+                    video_details["items"][0]["statistics"]
+                    if video_details.get("items")
+                    else {}
+                )
+                post.engagement = self._engagement_from_statistics(stats)
 
-            stats = (
-                video_details["items"][0]["statistics"]
-                if video_details["items"]
-                else {}
-            )
+            return post
 
-            return SocialMediaPost(
-                id=video_id,
-                platform=self.platform_name,
-                author=snippet["channelTitle"],
-                author_id=snippet["channelId"],
-                content=snippet["title"],
-                created_at=datetime.fromisoformat(
-                    snippet["publishedAt"].replace("Z", "+00:00")
-                ),
-                url=f"https://www.youtube.com/watch?v={video_id}",
-                media_urls=[f"https://img.youtube.com/vi/{video_id}/maxresdefault.jpg"],
-                engagement={
-                    "views": int(stats.get("viewCount", 0)),
-                    "likes": int(stats.get("likeCount", 0)),
-                    "comments": int(stats.get("commentCount", 0)),
-                },
-                raw_data=video,
+        except HttpError as e:
+            raise APIError(f"YouTube API error: {e}")
+
+    def get_recent_posts(
+        self, channel_identifier: str, limit: int, page_token: Optional[str] = None
+    ) -> Tuple[List[SocialMediaPost], Optional[str]]:
+        """Get a page of recent uploads from the channel's uploads playlist
+
+        playlistItems.list costs 1 quota unit per page versus 100 for
+        search.list; statistics for the whole page come from one videos.list.
+        """
+        try:
+            channel_id = self._resolve_channel_id(channel_identifier)
+            try:
+                posts, next_page_token = self._playlist_page(
+                    channel_id, limit, page_token
+                )
+            except HttpError as e:
+                if _channel_missing(e):
+                    raise ChannelNotFoundError(
+                        f"YouTube channel not found: {channel_identifier}"
+                    )
+                raise
+            if not posts:
+                return posts, next_page_token
+
+            video_details = self._execute(
+                lambda youtube: youtube.videos().list(
+                    part="statistics",
+                    id=",".join(post.id for post in posts),
+                    fields=VIDEOS_STATISTICS_FIELDS,
+                )
             )
+            stats_by_id = {
+                video["id"]: video.get("statistics", {})
+                for video in video_details.get("items", [])
+            }
+            for post in posts:
+                post.engagement = self._engagement_from_statistics(
+                    stats_by_id.get(post.id, {})
+                )
+
+            return posts, next_page_token
 
         except HttpError as e:
             raise APIError(f"YouTube API error: {e}")
+
+    def get_engagement_batch(self, post_ids: Sequence[str]) -> Dict[str, Dict[str, int]]:
+        """Get statistics for many videos, 50 per videos.list call"""
+        engagement = {}
+        try:
+            for start in range(0, len(post_ids), MAX_PAGE_SIZE):
+                ids = ",".join(post_ids[start : start + MAX_PAGE_SIZE])
+                response = self._execute(
+                    lambda youtube: youtube.videos().list(
+                        part="statistics",
+                        id=ids,
+                        fields=VIDEOS_STATISTICS_FIELDS,
+                    )
+                )
+                for video in response.get("items", []):
+                    engagement[video["id"]] = self._engagement_from_statistics(
+                        video.get("statistics", {})
+                    )
+        except HttpError as e:
+            raise APIError(f"YouTube API error: {e}")
+
+        return engagement
+
+    def _playlist_page(
+        self, channel_id: str, limit: int, page_token: Optional[str] = None
+    ) -> Tuple[List[SocialMediaPost], Optional[str]]:
+        """A page of the channel's uploads playlist, without statistics"""
+        # Every channel's uploads playlist is its ID with a "UU" prefix
+        uploads_playlist_id = "UU" + channel_id[2:]
+
+        request_params = {
+            "part": "snippet,contentDetails",
+            "playlistId": uploads_playlist_id,
+            "maxResults": max(1, min(limit, MAX_PAGE_SIZE)),
+            "fields": PLAYLIST_ITEM_FIELDS,
+        }
+        if page_token:
+            request_params["pageToken"] = page_token
+
+        response = self._execute(
+            lambda youtube: youtube.playlistItems().list(**request_params)
+        )
+
+        posts = []
+        for item in response.get("items", []):
+            published_at = item["contentDetails"].get("videoPublishedAt")
+            # Private and deleted videos have no publish date
+            if not published_at:
+                continue
+
+            snippet = item["snippet"]
+            video_id = item["contentDetails"]["videoId"]
+            posts.append(
+                SocialMediaPost(
+                    id=video_id,
+                    platform=self.platform_name,
+                    author=snippet["channelTitle"],
+                    author_id=snippet["channelId"],
+                    content=snippet["title"],
+                    created_at=datetime.fromisoformat(
+                        published_at.replace("Z", "+00:00")
+                    ),
+                    url=f"https://www.youtube.com/watch?v={video_id}",
+                    media_urls=[
+                        f"https://img.youtube.com/vi/{video_id}/maxresdefault.jpg"
+                    ],
+                    raw_data=item,
+                )
+            )
+
+        return posts, response.get("nextPageToken")
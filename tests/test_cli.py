@@ -0,0 +1,111 @@
+import argparse
+import asyncio
+import io
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+import cli
+from core.exceptions import ChannelNotFoundError, RateLimitError
+from core.models import ChannelInfo, Platform
+
+
+class ScriptedFetcher:
+    """Answers channel batches from a script of identifier -> result"""
+
+    def __init__(self, script):
+        self.script = script
+        self.batches = []
+
+    async def get_channel_info_batch(self, pairs, fields):
+        self.batches.append([identifier for _, identifier in pairs])
+        return {pair: self.script[pair[1]] for pair in pairs}
+
+
+def channel(identifier):
+    return ChannelInfo(
+        id=identifier,
+        name=identifier,
+        platform=Platform.YOUTUBE,
+        url=f"https://www.youtube.com/channel/{identifier}",
+    )
+
+
+SCRIPT = {
+    "UCfound": channel("UCfound"),
+    "UCgone": ChannelNotFoundError("Channel not found"),
+    "UCbusy": RateLimitError("quota exceeded"),
+}
+INPUT = "# channels\nyoutube UCfound\nyoutube,UCgone\n\nyoutube UCbusy\nmyspace tom\n"
+
+
+def run_fetch(source, checkpoint_path, checkpoint):
+    args = argparse.Namespace(
+        mode="channel",
+        fields=None,
+        concurrency=2,
+        timeout=5.0,
+        checkpoint=checkpoint_path,
+    )
+    output = io.StringIO()
+    batch = cli._BatchFetch(args, output, checkpoint)
+    batch.fetcher = ScriptedFetcher(SCRIPT)
+    asyncio.run(batch.run(io.StringIO(source)))
+    lines = [json.loads(line) for line in output.getvalue().splitlines()]
+    return batch, {line["identifier"]: line for line in lines}
+
+
+def test_fetch_writes_a_line_per_pair_and_checkpoints_final_results(tmp_path):
+    path = tmp_path / "done.txt"
+    with open(path, "a") as checkpoint:
+        batch, lines = run_fetch(INPUT, str(path), checkpoint)
+
+    assert lines["UCfound"]["ok"] and lines["UCfound"]["data"]["name"] == "UCfound"
+    assert lines["UCgone"]["error_type"] == "ChannelNotFoundError"
+    assert lines["UCbusy"]["error_type"] == "RateLimitError"
+    assert lines["tom"]["error_type"] == "ValueError"
+    assert sorted(sum(batch.fetcher.batches, [])) == ["UCbusy", "UCfound", "UCgone"]
+    assert batch.counts == {"ok": 1, "failed": 3, "skipped": 0}
+    # Rate-limited pairs are retried on the next run; the rest are final
+    assert set(path.read_text().splitlines()) == {
+        "youtube\tUCfound",
+        "youtube\tUCgone",
+        "myspace\ttom",
+    }
+
+
+def test_rerun_skips_checkpointed_pairs(tmp_path):
+    path = tmp_path / "done.txt"
+    path.write_text("youtube\tUCfound\nyoutube\tUCgone\nmyspace\ttom\n")
+
+    batch, lines = run_fetch(INPUT, str(path), None)
+
+    assert list(lines) == ["UCbusy"]
+    assert batch.counts["skipped"] == 3
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("2024-03-01T12:00:00Z", datetime(2024, 3, 1, 12, tzinfo=timezone.utc)),
+        ("2024-03-01T12:00:00", datetime(2024, 3, 1, 12, tzinfo=timezone.utc)),
+        ("2024-03-01T14:00:00+02:00", datetime(2024, 3, 1, 12, tzinfo=timezone.utc)),
+    ],
+)
+def test_timestamps_are_utc_unless_offset(value, expected):
+    assert cli._timestamp(value) == expected.timestamp()
+
+
+@pytest.mark.parametrize("argv", [["--concurrency", "0"], ["--timeout", "-1"]])
+def test_non_positive_numbers_are_rejected(argv, capsys):
+    with pytest.raises(SystemExit) as exit:
+        cli.main(["fetch", *argv])
+
+    assert exit.value.code == 2
+    assert "must be greater than 0" in capsys.readouterr().err
+
+
+def test_unknown_fields_are_rejected_before_fetching(capsys):
+    assert cli.main(["fetch", "--mode", "channel", "--fields", "name,bogus"]) == 2
+    assert "bogus" in capsys.readouterr().err
@@ -0,0 +1,101 @@
+import time
+
+import pytest
+
+from core.exceptions import AuthenticationError, RateLimitError
+from utils.credential_pool import Credential, CredentialPool, unique_secrets
+
+
+def make_pool(count: int = 3) -> CredentialPool:
+    return CredentialPool(
+        "youtube",
+        [
+            Credential(CredentialPool.label("youtube", i), object())
+            for i in range(count)
+        ],
+    )
+
+
+def test_unique_secrets():
+    assert unique_secrets(" a ", ["b", "a", "", "  "], None, ["c"]) == ["a", "b", "c"]
+
+
+def test_label_reveals_nothing_of_the_secret():
+    assert CredentialPool.label("twitter", 0) == "twitter-1"
+
+
+def test_requires_credentials():
+    with pytest.raises(AuthenticationError):
+        CredentialPool("youtube", [])
+
+
+def test_rotates_between_fresh_credentials():
+    pool = make_pool()
+
+    names = [pool.acquire("quota").name for _ in range(6)]
+
+    assert sorted(names[:3]) == ["youtube-1", "youtube-2", "youtube-3"]
+    assert names[3:] == names[:3]
+
+
+def test_prefers_credential_with_most_budget():
+    pool = make_pool()
+    first, second, third = pool.credentials
+    reset_at = time.time() + 60
+    pool.observe(first, "search", 5, reset_at)
+    pool.observe(second, "search", 50, reset_at)
+    pool.observe(third, "search", 20, reset_at)
+
+    assert pool.acquire("search") is second
+    # Budgets are per scope
+    assert pool.acquire("other") is first
+
+
+def test_spend_counts_down_and_resets():
+    pool = make_pool(2)
+    first, second = pool.credentials
+    reset_at = time.time() + 60
+    pool.spend(first, "quota", 100, 10_000, reset_at)
+
+    assert first.budgets["quota"] == (9_900, reset_at)
+    assert pool.acquire("quota") is second
+
+    # A budget past its reset starts over from the limit
+    first.budgets["quota"] = (0, time.time() - 1)
+    pool.spend(first, "quota", 1, 10_000, reset_at)
+    assert first.budgets["quota"] == (9_999, reset_at)
+
+
+def test_quarantine_skips_credential_until_it_expires():
+    pool = make_pool(2)
+    first, second = pool.credentials
+    pool.quarantine(first, time.time() + 60, "quotaExceeded")
+
+    assert all(pool.acquire() is second for _ in range(3))
+    assert pool.available()
+    assert [s["quarantine_reason"] for s in pool.stats()] == ["quotaExceeded", None]
+
+    first.quarantined_until = time.time() - 1
+    assert first in {pool.acquire(), pool.acquire()}
+    assert pool.stats()[0]["quarantine_reason"] is None
+
+
+def test_quarantine_never_shortens():
+    pool = make_pool(1)
+    (credential,) = pool.credentials
+    until = time.time() + 60
+    pool.quarantine(credential, until, "daily quota")
+    pool.quarantine(credential, until - 30, "rate limited")
+
+    assert credential.quarantined_until == until
+    assert credential.quarantines == 2
+
+
+def test_all_quarantined_raises_rate_limit_error():
+    pool = make_pool(2)
+    for credential in pool.credentials:
+        pool.quarantine(credential, time.time() + 60, "HTTP 429")
+
+    assert not pool.available()
+    with pytest.raises(RateLimitError, match="All youtube credentials"):
+        pool.acquire()
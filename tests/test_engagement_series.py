@@ -0,0 +1,93 @@
+import random
+
+import pytest
+
+from core.models import Platform
+from services.engagement_tracker import EngagementSeries, EngagementTracker
+
+
+def series_of(samples, max_samples=1000):
+    series = EngagementSeries(max_samples)
+    for timestamp, engagement in samples:
+        series.append(timestamp, engagement)
+    return series
+
+
+def last_per_bucket(timestamps, bucket_seconds):
+    """Reference: index of the last sample of every bucket, one by one"""
+    buckets = [int(ts // bucket_seconds) for ts in timestamps]
+    return [
+        i
+        for i in range(len(buckets))
+        if i + 1 == len(buckets) or buckets[i + 1] != buckets[i]
+    ]
+
+
+def test_new_metric_is_backfilled_and_missing_metric_repeats():
+    series = series_of([(0, {"views": 5}), (60, {"likes": 1}), (120, {"views": 9})])
+
+    assert list(series.metrics["views"]) == [5, 5, 9]
+    assert list(series.metrics["likes"]) == [0, 1, 1]
+
+
+def test_thinning_keeps_recent_half_dense():
+    series = series_of([(t, {"views": t}) for t in range(8)], max_samples=8)
+
+    assert list(series.timestamps) == [0, 2, 4, 5, 6, 7]
+    assert list(series.metrics["views"]) == [0, 2, 4, 5, 6, 7]
+
+
+@pytest.mark.parametrize("bucket_seconds", [1, 60, 300, 3600, 10**6])
+def test_downsample_matches_reference(bucket_seconds):
+    rng = random.Random(bucket_seconds)
+    now, samples = 1_700_000_000.0, []
+    for i in range(500):
+        now += rng.choice([0.5, 10, 59, 60, 61, 900])
+        samples.append((now, {"views": i, "likes": i // 3}))
+    series = series_of(samples)
+    since = samples[37][0]
+
+    timestamps, metrics = series.downsample(bucket_seconds, since)
+
+    window = [s for s in samples if s[0] >= since]
+    expected = last_per_bucket([ts for ts, _ in window], bucket_seconds)
+    assert list(timestamps) == [window[i][0] for i in expected]
+    assert list(metrics["views"]) == [window[i][1]["views"] for i in expected]
+    assert list(metrics["likes"]) == [window[i][1]["likes"] for i in expected]
+
+
+def test_downsample_without_buckets_returns_copies():
+    series = series_of([(0, {"views": 1}), (1, {"views": 2})])
+
+    timestamps, metrics = series.downsample(0)
+    timestamps.append(99)
+
+    assert list(series.timestamps) == [0, 1]
+    assert list(metrics["views"]) == [1, 2]
+    timestamps, metrics = series.downsample(60, since=5)
+    assert (list(timestamps), list(metrics["views"])) == ([], [])
+
+
+def test_growth_per_hour():
+    series = series_of(
+        [(0, {"views": 100}), (1800, {"views": 160}), (7200, {"views": 400})]
+    )
+
+    assert series.growth_per_hour() == {"views": 150.0}
+    assert series.growth_per_hour(since=1800) == pytest.approx({"views": 160.0})
+    assert series.growth_per_hour(since=7200) == {"views": 0.0}
+
+
+def test_samples_are_windowed_copies():
+    tracker = EngagementTracker(fetcher=None)
+    tracker.track(Platform.YOUTUBE, "v1")
+    tracker.track(Platform.TWITTER, "t1")
+    for t in range(0, 300, 60):
+        tracker.get_series(Platform.YOUTUBE, "v1").append(t, {"views": t})
+
+    samples = list(tracker.samples([Platform.YOUTUBE], since=60, until=240))
+
+    ((platform, post_id, timestamps, metrics),) = samples
+    assert (platform, post_id) == (Platform.YOUTUBE, "v1")
+    assert list(timestamps) == [60, 120, 180]
+    assert list(metrics["views"]) == [60, 120, 180]
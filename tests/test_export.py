@@ -0,0 +1,54 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+from core.records import PostRecord
+from services import export
+
+JAN_1 = datetime(2025, 1, 1, tzinfo=timezone.utc).timestamp()
+
+
+def record(post_id, platform="youtube", author_id="UC1", created_at=JAN_1):
+    return PostRecord(
+        id=post_id,
+        platform=platform,
+        author="Author",
+        author_id=author_id,
+        content="text",
+        created_at=created_at,
+        url=f"https://example.com/{post_id}",
+        engagement=(("views", 3),),
+    )
+
+
+def test_posix_time_takes_naive_bounds_as_utc():
+    assert export.posix_time(datetime(2025, 1, 1)) == JAN_1
+    plus_two = timezone(timedelta(hours=2))
+    assert export.posix_time(datetime(2025, 1, 1, 2, tzinfo=plus_two)) == JAN_1
+    assert export.posix_time(None) is None
+
+
+def test_post_rows_filter():
+    records = [
+        record("early", created_at=JAN_1 - 1),
+        record("start", created_at=JAN_1),
+        record("tweet", platform="twitter", author_id="42"),
+        record("other", author_id="UC2"),
+        record("end", created_at=JAN_1 + 3600),
+    ]
+
+    rows = export.post_rows(
+        iter(records), {"youtube"}, {"UC1"}, JAN_1, JAN_1 + 3600
+    )
+
+    assert [row["id"] for row in rows] == ["start"]
+
+
+def test_ndjson_rows_are_json_lines():
+    rows = export.post_rows(iter([record("a"), record("b")]), set(), None)
+
+    chunks = list(export.iter_ndjson(rows, batch_rows=1))
+
+    assert len(chunks) == 2
+    decoded = [json.loads(line) for chunk in chunks for line in chunk.splitlines()]
+    assert [row["id"] for row in decoded] == ["a", "b"]
+    assert decoded[0]["created_at"].startswith("2025-01-01T00:00:00")
@@ -0,0 +1,70 @@
+import base64
+import json
+
+import pytest
+
+from services.feed_service import MAX_CHANNEL_PAGE_SIZE, FeedService
+
+KEYS = ["youtube:UC123", "twitter:jack"]
+
+
+def raw_cursor(payload) -> str:
+    raw = json.dumps(payload).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def test_round_trip():
+    states = {"youtube:UC123": ["token", 3], "twitter:jack": [None, 0]}
+    cursor = FeedService.encode_cursor(KEYS, 20, states)
+
+    assert FeedService.decode_cursor(cursor, KEYS) == (20, states)
+
+
+def test_channel_order_does_not_matter():
+    cursor = FeedService.encode_cursor(KEYS, 20, {})
+
+    assert FeedService.decode_cursor(cursor, list(reversed(KEYS))) == (20, {})
+
+
+def test_rejects_cursor_of_other_channel_set():
+    cursor = FeedService.encode_cursor(KEYS, 20, {})
+
+    with pytest.raises(ValueError, match="different channel set"):
+        FeedService.decode_cursor(cursor, ["youtube:UC123"])
+
+
+@pytest.mark.parametrize("cursor", ["", "!!!", "bm90IGpzb24", raw_cursor([1, 2])])
+def test_rejects_garbage(cursor):
+    with pytest.raises(ValueError, match="malformed"):
+        FeedService.decode_cursor(cursor, KEYS)
+
+
+@pytest.mark.parametrize(
+    "page_size", [0, 4, MAX_CHANNEL_PAGE_SIZE + 1, 10**9, 20.0, True, "20", None]
+)
+def test_rejects_bad_page_size(page_size):
+    digest = FeedService._channel_set_digest(KEYS)
+    cursor = raw_cursor({"c": digest, "n": page_size, "s": {}})
+
+    with pytest.raises(ValueError, match="malformed"):
+        FeedService.decode_cursor(cursor, KEYS)
+
+
+@pytest.mark.parametrize(
+    "states",
+    [
+        [],
+        {"youtube:UC123": "token"},
+        {"youtube:UC123": ["token"]},
+        {"youtube:UC123": [5, 0]},
+        {"youtube:UC123": ["token", -1]},
+        {"youtube:UC123": ["token", MAX_CHANNEL_PAGE_SIZE + 1]},
+        {"youtube:UC123": ["token", 1.5]},
+    ],
+)
+def test_rejects_bad_states(states):
+    digest = FeedService._channel_set_digest(KEYS)
+    cursor = raw_cursor({"c": digest, "n": 20, "s": states})
+
+    with pytest.raises(ValueError, match="malformed"):
+        FeedService.decode_cursor(cursor, KEYS)
@@ -0,0 +1,93 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from api.routes.feed import router
+from core.models import Platform, SocialMediaPost
+from services.feed_service import FeedService
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+class PagedFetcher:
+    """Serves each channel's posts newest-first in pages of ``page_size``"""
+
+    def __init__(self, timelines):
+        self.timelines = timelines
+        self.calls = []
+
+    async def get_recent_posts(self, platform, identifier, page_size, page_token):
+        self.calls.append((identifier, page_token))
+        if identifier not in self.timelines:
+            raise RuntimeError(f"{identifier} is down")
+        start = int(page_token or 0)
+        end = start + page_size
+        posts = self.timelines[identifier][start:end]
+        return posts, str(end) if end < len(self.timelines[identifier]) else None
+
+
+def timeline(name, hours):
+    return [
+        SocialMediaPost(
+            id=f"{name}-{hour}",
+            platform=Platform.YOUTUBE,
+            author=name,
+            author_id=name,
+            content="",
+            created_at=START + timedelta(hours=hour),
+            url=f"https://example.com/{name}/{hour}",
+        )
+        for hour in sorted(hours, reverse=True)
+    ]
+
+
+def read_all(feed, channels, limit):
+    ids, cursor = [], None
+    while True:
+        posts, cursor, errors = asyncio.run(feed.get_feed(channels, limit, cursor))
+        ids.extend(post.id for post in posts)
+        if cursor is None:
+            return ids, errors
+
+
+def test_pages_merge_newest_first_without_gaps_or_repeats():
+    fetcher = PagedFetcher(
+        {"a": timeline("a", range(0, 24, 2)), "b": timeline("b", range(1, 12, 3))}
+    )
+    channels = [(Platform.YOUTUBE, "a"), (Platform.YOUTUBE, "b")]
+
+    ids, errors = read_all(FeedService(fetcher), channels, limit=4)
+
+    expected = sorted(
+        fetcher.timelines["a"] + fetcher.timelines["b"],
+        key=lambda post: post.created_at,
+        reverse=True,
+    )
+    assert ids == [post.id for post in expected]
+    assert errors == {}
+
+
+def test_full_page_does_not_fetch_past_what_it_serves():
+    fetcher = PagedFetcher({"a": timeline("a", range(20))})
+
+    posts, cursor, _ = asyncio.run(
+        FeedService(fetcher).get_feed([(Platform.YOUTUBE, "a")], 5)
+    )
+
+    assert len(posts) == 5 and cursor is not None
+    assert fetcher.calls == [("a", None)]
+
+
+def test_failed_channel_is_reported_and_the_rest_still_served():
+    fetcher = PagedFetcher({"a": timeline("a", range(3))})
+    channels = [(Platform.YOUTUBE, "a"), (Platform.YOUTUBE, "gone")]
+
+    ids, errors = read_all(FeedService(fetcher), channels, limit=10)
+
+    assert ids == ["a-2", "a-1", "a-0"]
+    assert errors == {"youtube:gone": "gone is down"}
+
+
+def test_feed_route_has_no_trailing_slash():
+    (route,) = router.routes
+
+    assert route.path == "/feed" and route.methods == {"POST"}
@@ -0,0 +1,96 @@
+import asyncio
+import threading
+
+import pytest
+
+from config.settings import settings
+from core.models import Platform
+from services.fetcher_service import SocialMediaFetcher
+
+# Recent latencies the p95 hedging delay is derived from
+FAST = 0.01
+
+
+class SlowOnce:
+    """Upstream read whose first call stalls until released; later calls are fast"""
+
+    def __init__(self, error=None):
+        self.error = error
+        self.calls = 0
+        self.release = threading.Event()
+        self.lock = threading.Lock()
+
+    def lookup(self, channel_identifier):
+        with self.lock:
+            self.calls += 1
+            first = self.calls == 1
+        if first:
+            self.release.wait(5)
+            return "slow"
+        if self.error is not None:
+            raise self.error
+        return "fast"
+
+
+def warmed_fetcher(samples):
+    fetcher = SocialMediaFetcher()
+    window = fetcher._latencies[(Platform.YOUTUBE.value, "lookup")]
+    for _ in range(samples):
+        window.add(FAST)
+    return fetcher
+
+
+def read(fetcher, upstream):
+    async def run():
+        try:
+            return await fetcher._read(Platform.YOUTUBE, upstream.lookup, "UC123")
+        finally:
+            upstream.release.set()
+
+    return asyncio.run(run())
+
+
+@pytest.fixture(autouse=True)
+def hedging(monkeypatch):
+    monkeypatch.setattr(settings, "HEDGE_REQUESTS", True)
+
+
+def test_stalled_read_is_hedged_and_fast_answer_wins():
+    upstream = SlowOnce()
+
+    assert read(warmed_fetcher(settings.HEDGE_MIN_SAMPLES), upstream) == "fast"
+    assert upstream.calls == 2
+
+
+def test_no_hedge_before_enough_samples():
+    upstream = SlowOnce()
+    upstream.release.set()
+
+    assert read(warmed_fetcher(settings.HEDGE_MIN_SAMPLES - 1), upstream) == "slow"
+    assert upstream.calls == 1
+
+
+def test_failed_hedge_falls_back_to_the_original_call():
+    upstream = SlowOnce(error=RuntimeError("hedge failed"))
+    fetcher = warmed_fetcher(settings.HEDGE_MIN_SAMPLES)
+
+    async def run():
+        attempt = asyncio.ensure_future(
+            fetcher._read(Platform.YOUTUBE, upstream.lookup, "UC123")
+        )
+        while upstream.calls < 2:
+            await asyncio.sleep(FAST)
+        upstream.release.set()
+        return await attempt
+
+    assert asyncio.run(run()) == "slow"
+    assert upstream.calls == 2
+
+
+def test_read_is_not_hedged_when_disabled(monkeypatch):
+    monkeypatch.setattr(settings, "HEDGE_REQUESTS", False)
+    upstream = SlowOnce()
+    upstream.release.set()
+
+    assert read(warmed_fetcher(settings.HEDGE_MIN_SAMPLES), upstream) == "slow"
+    assert upstream.calls == 1
@@ -0,0 +1,102 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from config.settings import settings
+from core.exceptions import ChannelNotFoundError, RateLimitError
+from services.instagram_service import MAX_BATCH_SIZE, InstagramService
+
+ACCOUNTS = {"nasa": {"id": "1", "username": "nasa", "name": "NASA"}}
+
+
+def discovered(relative_url):
+    """Graph response for a business discovery URL, or a not-found error"""
+    username = relative_url.split("username(")[1].split(")")[0]
+    if username not in ACCOUNTS:
+        error = {"code": 110, "message": f"no user {username}"}
+        return 400, {"error": error}
+    return 200, {"business_discovery": ACCOUNTS[username]}
+
+
+class FakeGraph:
+    """Stands in for ``HTTPClient``: plain GETs and batch POSTs, recorded"""
+
+    max_retries = 0
+    timeout = 1
+
+    def __init__(self):
+        self.gets = []
+        self.batches = []
+        self.session = SimpleNamespace(get=self.get)
+
+    def get(self, url, params, timeout):
+        self.gets.append(url)
+        status, body = discovered(url)
+        return SimpleNamespace(
+            ok=status == 200, content=b"x", json=lambda: body, status_code=status
+        )
+
+    def post(self, url, data):
+        batch = json.loads(data["batch"])
+        self.batches.append([request["relative_url"] for request in batch])
+        responses = []
+        for request in batch:
+            status, body = discovered(request["relative_url"])
+            responses.append({"code": status, "body": json.dumps(body)})
+        return responses
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(settings, "INSTAGRAM_ACCESS_TOKEN", "token")
+    monkeypatch.setattr(settings, "INSTAGRAM_ACCOUNT_ID", "17841400000000000")
+    service = InstagramService()
+    service.http = FakeGraph()
+    return service
+
+
+def test_single_lookup_skips_batch_envelope(service):
+    info = service.get_channel_info("@nasa")
+
+    assert info.username == "nasa"
+    assert len(service.http.gets) == 1 and service.http.batches == []
+
+
+def test_batch_keeps_per_item_results_and_chunks(service):
+    names = ["nasa"] + [f"user{i}" for i in range(MAX_BATCH_SIZE)]
+
+    results = service.get_channel_info_batch(names)
+
+    assert [len(batch) for batch in service.http.batches] == [MAX_BATCH_SIZE, 1]
+    assert results["nasa"].id == "1"
+    assert all(isinstance(results[n], ChannelNotFoundError) for n in names[1:])
+
+
+@pytest.mark.parametrize(
+    "username", ["na sa", "nasa){id}", "a" * 31, "nasa&access_token=x", ""]
+)
+def test_malformed_usernames_never_reach_the_graph(service, username):
+    results = service.get_channel_info_batch([username, "nasa"])
+
+    assert isinstance(results[username], ValueError)
+    assert results["nasa"].id == "1"
+    assert len(service.http.gets) == 1 and service.http.batches == []
+
+
+def test_malformed_page_token_is_rejected(service):
+    with pytest.raises(ValueError, match="page token"):
+        service.get_recent_posts("nasa", 10, page_token="abc}{media")
+
+    assert service.http.gets == []
+
+
+@pytest.mark.parametrize(
+    "error, expected",
+    [
+        ({"code": 4}, RateLimitError),
+        ({"code": 100, "error_subcode": 2207013}, ChannelNotFoundError),
+    ],
+)
+def test_graph_errors_map_to_internal_exceptions(error, expected):
+    assert type(InstagramService._graph_error(error)) is expected
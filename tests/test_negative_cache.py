@@ -0,0 +1,121 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+from core.base import BaseSocialMediaService
+from core.exceptions import ChannelNotFoundError
+from core.models import ChannelInfo, Platform, SocialMediaPost
+from services.fetcher_service import SocialMediaFetcher
+from services.youtube_feed import FeedEntry
+
+CHANNEL_ID = "UC" + "a" * 22
+
+
+class ScriptedYouTube(BaseSocialMediaService):
+    """Knows one channel, reachable as @handle or by ID; counts upstream calls"""
+
+    accepts_channel_ids = True
+
+    def __init__(self):
+        super().__init__()
+        self.latest = None
+        self.calls = []
+
+    def _get_platform_name(self):
+        return Platform.YOUTUBE
+
+    def _known(self, identifier):
+        if identifier not in ("@handle", CHANNEL_ID):
+            raise ChannelNotFoundError(f"YouTube channel not found: {identifier}")
+
+    def get_latest_post(self, channel_identifier, fields=None):
+        self.calls.append(("latest", channel_identifier))
+        self._known(channel_identifier)
+        return self.latest
+
+    def get_channel_info(self, channel_identifier, fields=None):
+        self.calls.append(("info", channel_identifier))
+        self._known(channel_identifier)
+        return ChannelInfo(
+            id=CHANNEL_ID, name="Channel", platform=Platform.YOUTUBE, url="u"
+        )
+
+    def get_engagement_batch(self, post_ids):
+        return {}
+
+    def validate_credentials(self):
+        return True
+
+
+@pytest.fixture
+def youtube():
+    return ScriptedYouTube()
+
+
+@pytest.fixture
+def fetcher(youtube):
+    fetcher = SocialMediaFetcher()
+    fetcher._services = {"youtube": youtube}
+    return fetcher
+
+
+def latest(fetcher, identifier):
+    return asyncio.run(fetcher.get_latest_post(Platform.YOUTUBE, identifier))
+
+
+def upload(video_id):
+    return SocialMediaPost(
+        id=video_id,
+        platform=Platform.YOUTUBE,
+        author="Channel",
+        author_id=CHANNEL_ID,
+        content="New video",
+        created_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+        url=f"https://www.youtube.com/watch?v={video_id}",
+    )
+
+
+def test_not_found_is_remembered(fetcher, youtube):
+    for _ in range(3):
+        with pytest.raises(ChannelNotFoundError):
+            latest(fetcher, "@nobody")
+
+    assert youtube.calls == [("latest", "@nobody")]
+
+
+def test_bloom_hit_without_entry_goes_upstream(fetcher, youtube):
+    # A false positive of the filter must not turn into a 404
+    fetcher._missing_channels.add("youtube:@handle")
+    youtube.latest = upload("v1")
+
+    assert latest(fetcher, "@handle").id == "v1"
+
+
+def test_empty_timeline_is_remembered(fetcher, youtube):
+    assert latest(fetcher, "@handle") is None
+    assert latest(fetcher, "@handle") is None
+
+    # One extra lookup links the handle to its channel ID
+    assert youtube.calls == [("latest", "@handle"), ("info", "@handle")]
+
+
+def test_post_fetched_by_channel_id_clears_handle_entry(fetcher, youtube):
+    latest(fetcher, "@handle")
+    youtube.latest = upload("v1")
+
+    assert latest(fetcher, CHANNEL_ID).id == "v1"
+    assert latest(fetcher, "@handle").id == "v1"
+
+
+def test_push_clears_handle_entry(fetcher, youtube):
+    latest(fetcher, "@handle")
+    youtube.latest = upload("v1")
+
+    fetcher.apply_feed_entries(
+        [FeedEntry("v1", CHANNEL_ID, "New video", "Channel", None, None)]
+    )
+
+    assert latest(fetcher, "@handle").id == "v1"
+    # Resolved once, then asked upstream by channel ID
+    assert youtube.calls[-1] == ("latest", CHANNEL_ID)
@@ -0,0 +1,126 @@
+import asyncio
+from datetime import datetime, timezone
+
+from core.models import Platform, SocialMediaPost
+from services.post_watcher import POLL_FIELDS, PostWatcher
+
+
+def post(post_id: str) -> SocialMediaPost:
+    return SocialMediaPost(
+        id=post_id,
+        platform=Platform.YOUTUBE,
+        author="Some Channel",
+        author_id="UC123",
+        content=f"Video {post_id}",
+        created_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+        url=f"https://www.youtube.com/watch?v={post_id}",
+    )
+
+
+class FakeWebSub:
+    def __init__(self, live: bool):
+        self.live = live
+
+    def is_live(self, channel_id: str) -> bool:
+        return self.live
+
+
+class FakeFetcher:
+    """Serves ``cached`` unless refreshing, then ``upstream``; records calls"""
+
+    def __init__(self, cached, upstream, live=False):
+        self.post_listeners = []
+        self.websub = FakeWebSub(live)
+        self.cached = cached
+        self.upstream = upstream
+        self.calls = []
+
+    async def get_latest_post(self, platform, identifier, fields=None, refresh=False):
+        self.calls.append((fields, refresh))
+        return self.upstream if refresh else self.cached
+
+    def push(self, channel_id: str) -> None:
+        for listener in self.post_listeners:
+            listener(Platform.YOUTUBE.value, channel_id, None)
+
+
+def watcher(fetcher: FakeFetcher, interval: float) -> PostWatcher:
+    watcher = PostWatcher(fetcher)
+    watcher.interval = interval
+    return watcher
+
+
+def test_stale_cached_post_is_not_reported_as_new():
+    fetcher = FakeFetcher(cached=post("old"), upstream=post("seen"))
+
+    async def run():
+        return await watcher(fetcher, 30).wait_for_new(
+            Platform.YOUTUBE, "@some", "seen", timeout=0.1
+        )
+
+    assert asyncio.run(run()) is None
+    assert fetcher.calls == [(None, False), (None, True)]
+
+
+def test_without_since_id_returns_cached_post():
+    fetcher = FakeFetcher(cached=post("a"), upstream=post("b"))
+
+    async def run():
+        return await watcher(fetcher, 30).wait_for_new(
+            Platform.YOUTUBE, "@some", None, timeout=1
+        )
+
+    assert asyncio.run(run()).id == "a"
+    assert fetcher.calls == [(None, False)]
+
+
+def test_polls_ids_and_fetches_full_post_on_change():
+    fetcher = FakeFetcher(cached=post("a"), upstream=post("a"))
+
+    async def run():
+        waiter = asyncio.create_task(
+            watcher(fetcher, 0.02).wait_for_new(
+                Platform.YOUTUBE, "@some", "a", timeout=1
+            )
+        )
+        await asyncio.sleep(0.07)
+        fetcher.upstream = post("b")
+        return await waiter
+
+    assert asyncio.run(run()).id == "b"
+    assert (POLL_FIELDS, True) in fetcher.calls
+    # Only the change needed a full fetch
+    assert fetcher.calls[-1] == (None, True)
+    assert fetcher.calls[1:-1] == [(POLL_FIELDS, True)] * (len(fetcher.calls) - 2)
+
+
+def test_live_channel_is_not_polled():
+    fetcher = FakeFetcher(cached=post("a"), upstream=post("a"), live=True)
+
+    async def run():
+        return await watcher(fetcher, 0.02).wait_for_new(
+            Platform.YOUTUBE, "@some", "a", timeout=0.1
+        )
+
+    assert asyncio.run(run()) is None
+    assert fetcher.calls == [(None, False)]
+
+
+def test_push_wakes_waiters_on_live_channel():
+    fetcher = FakeFetcher(cached=post("a"), upstream=post("a"), live=True)
+
+    async def run():
+        w = watcher(fetcher, 30)
+        waiters = [
+            asyncio.create_task(
+                w.wait_for_new(Platform.YOUTUBE, "@some", "a", timeout=1)
+            )
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0.02)
+        fetcher.upstream = post("b")
+        fetcher.push("UC123")
+        return await asyncio.wait_for(asyncio.gather(*waiters), 0.5)
+
+    assert [p.id for p in asyncio.run(run())] == ["b", "b", "b"]
+    assert fetcher.calls == [(None, False), (None, True)]
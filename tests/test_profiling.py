@@ -0,0 +1,105 @@
+import asyncio
+import contextvars
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from api.dependencies import require_admin
+from api.middleware import ProfilingMiddleware
+from config.settings import settings
+from utils.profiling import (
+    RequestProfile,
+    SamplingProfiler,
+    folded_stacks,
+    profiled_call,
+)
+
+
+def upstream_lookup():
+    return sum(range(1000))
+
+
+async def teapot_app(scope, receive, send):
+    upstream_lookup()
+    await send({"type": "http.response.start", "status": 418, "headers": []})
+    await send({"type": "http.response.body", "body": b"short and stout"})
+
+
+def request(query, token=None):
+    """Run one GET through the profiling middleware; returns status, headers, body"""
+    headers = [(b"x-admin-token", token.encode())] if token else []
+    scope = {"type": "http", "headers": headers, "query_string": query.encode()}
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(ProfilingMiddleware(teapot_app)(scope, receive, send))
+    headers = {k.decode(): v.decode() for k, v in sent[0]["headers"]}
+    return sent[0]["status"], headers, b"".join(m.get("body", b"") for m in sent[1:])
+
+
+@pytest.fixture
+def admin_token(monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "s3cret")
+
+
+def test_admin_profile_replaces_response_with_report(admin_token):
+    status, headers, body = request("profile=1&profile_sort=tottime", "s3cret")
+
+    assert status == 200 and headers["x-profiled-status"] == "418"
+    assert b"upstream_lookup" in body and b"Ordered by: internal time" in body
+
+
+@pytest.mark.parametrize(
+    "query, token",
+    [("profile=1", "wrong"), ("profile=1", None), ("profile=0", "s3cret")],
+)
+def test_request_is_served_normally_without_valid_profile_request(
+    admin_token, query, token
+):
+    assert request(query, token)[::2] == (418, b"short and stout")
+
+
+def test_profile_is_off_while_admin_token_is_unset():
+    assert request("profile=1", "anything")[0] == 418
+
+
+def test_admin_endpoints_are_hidden_until_a_token_is_set(monkeypatch):
+    with pytest.raises(HTTPException) as disabled:
+        require_admin("anything")
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "s3cret")
+    with pytest.raises(HTTPException) as forbidden:
+        require_admin("wrong")
+
+    assert (disabled.value.status_code, forbidden.value.status_code) == (404, 403)
+    require_admin("s3cret")
+
+
+def test_worker_thread_calls_join_the_request_profile():
+    with RequestProfile() as profile:
+        context = contextvars.copy_context()
+    worker = threading.Thread(target=context.run, args=(profiled_call, upstream_lookup))
+    worker.start()
+    worker.join()
+
+    assert "upstream_lookup" in profile.report()
+
+
+def test_sampler_folds_stacks_of_other_threads():
+    done = threading.Event()
+    worker = threading.Thread(target=done.wait, name="ThreadPoolExecutor-7_2")
+    worker.start()
+    try:
+        counts = SamplingProfiler(interval=0.001).run(0.02)
+    finally:
+        done.set()
+        worker.join()
+
+    stacks = folded_stacks(counts).splitlines()
+    assert any(line.startswith("ThreadPoolExecutor-7;") for line in stacks)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in stacks)
@@ -0,0 +1,86 @@
+import asyncio
+import json
+
+import pytest
+
+from api.middleware import RateLimitMiddleware, client_key
+from config.settings import settings
+
+
+async def ok_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+def http_scope(method="GET", path="/api/v1/posts/youtube/x", headers=()):
+    return {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "headers": [(k.lower().encode(), v.encode()) for k, v in headers],
+        "client": ("203.0.113.7", 50000),
+        "query_string": b"",
+    }
+
+
+def call(app, scope, body=b""):
+    """Run one request through ``app``; returns the status and JSON body"""
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    payload = b"".join(m.get("body", b"") for m in sent[1:])
+    return sent[0]["status"], json.loads(payload)
+
+
+@pytest.fixture
+def known_keys(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_API_KEYS", ["alpha", "beta"])
+
+
+def test_known_api_key_is_its_own_client(known_keys):
+    scope = http_scope(headers=[("X-API-Key", "beta")])
+
+    assert client_key(scope, trust_forwarded=False) == "key:2"
+
+
+@pytest.mark.parametrize("headers", [[], [("X-API-Key", "made-up")]])
+def test_unknown_or_missing_key_falls_back_to_ip(known_keys, headers):
+    scope = http_scope(headers=headers)
+
+    assert client_key(scope, trust_forwarded=False) == "ip:203.0.113.7"
+
+
+def test_rotating_keys_share_the_ip_budget(known_keys):
+    app = RateLimitMiddleware(ok_app, limit=3, window=60, exempt_paths=())
+    statuses = [
+        call(app, http_scope(headers=[("X-API-Key", f"random-{i}")]))[0]
+        for i in range(4)
+    ]
+
+    assert statuses == [200, 200, 200, 429]
+
+
+def test_batch_costs_one_unit_per_channel():
+    app = RateLimitMiddleware(ok_app, limit=10, window=60, exempt_paths=())
+    body = json.dumps({"channels": [{"platform": "youtube"}] * 4}).encode()
+
+    assert call(app, http_scope("POST", "/api/v1/posts/batch"), body)[0] == 200
+    assert call(app, http_scope("POST", "/api/v1/posts/batch"), body)[0] == 200
+    assert call(app, http_scope("POST", "/api/v1/posts/batch"), body)[0] == 429
+
+
+def test_batch_above_limit_is_refused_without_spending():
+    app = RateLimitMiddleware(ok_app, limit=10, window=60, exempt_paths=())
+    body = json.dumps({"channels": ["x"] * 11}).encode()
+
+    status, payload = call(app, http_scope("POST", "/api/v1/posts/batch"), body)
+    assert status == 413
+    assert "more than the limit of 10" in payload["detail"]["message"]
+    # The refused batch spent nothing
+    assert call(app, http_scope())[0] == 200
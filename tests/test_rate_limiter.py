@@ -0,0 +1,88 @@
+import asyncio
+import math
+
+import pytest
+
+from utils import rate_limiter
+from utils.rate_limiter import InMemoryRateLimitBackend, gcra
+
+LIMIT = 10
+WINDOW = 60.0  # one request every 6 seconds
+
+
+def test_burst_up_to_limit_then_reject():
+    tat, now = 0.0, 1000.0
+    for expected_remaining in range(LIMIT - 1, -1, -1):
+        tat, result = gcra(tat, now, 1, LIMIT, WINDOW)
+        assert result.allowed
+        assert result.remaining == expected_remaining
+
+    rejected_tat, result = gcra(tat, now, 1, LIMIT, WINDOW)
+    assert not result.allowed
+    assert rejected_tat == tat  # a rejected request consumes nothing
+    assert result.remaining == 0
+    assert result.retry_after == pytest.approx(6.0)
+    assert result.reset_after == pytest.approx(WINDOW)
+
+
+def test_budget_recovers_at_emission_rate():
+    tat, now = 0.0, 1000.0
+    for _ in range(LIMIT):
+        tat, _ = gcra(tat, now, 1, LIMIT, WINDOW)
+
+    _, result = gcra(tat, now + 5.9, 1, LIMIT, WINDOW)
+    assert not result.allowed
+    _, result = gcra(tat, now + 6.0, 1, LIMIT, WINDOW)
+    assert result.allowed
+
+
+def test_cost_counts_several_units():
+    tat, result = gcra(0.0, 1000.0, 4, LIMIT, WINDOW)
+
+    assert result.allowed
+    assert result.remaining == LIMIT - 4
+    assert result.reset_after == pytest.approx(24.0)
+
+
+def test_cost_above_limit_never_passes():
+    tat, result = gcra(0.0, 1000.0, LIMIT + 1, LIMIT, WINDOW)
+
+    assert not result.allowed
+    assert result.retry_after == math.inf
+    assert tat == 1000.0  # nothing was spent
+    assert gcra(tat, 1000.0, LIMIT, LIMIT, WINDOW)[1].allowed
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(rate_limiter.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_backend_tracks_clients_separately(clock):
+    backend = InMemoryRateLimitBackend()
+
+    async def run():
+        for _ in range(LIMIT):
+            assert (await backend.acquire("a", 1, LIMIT, WINDOW)).allowed
+        assert not (await backend.acquire("a", 1, LIMIT, WINDOW)).allowed
+        assert (await backend.acquire("b", 1, LIMIT, WINDOW)).allowed
+
+        clock[0] += WINDOW
+        assert (await backend.acquire("a", 1, LIMIT, WINDOW)).remaining == LIMIT - 1
+
+    asyncio.run(run())
+
+
+def test_backend_purges_recovered_clients(clock):
+    backend = InMemoryRateLimitBackend()
+
+    async def run():
+        for i in range(1023):
+            await backend.acquire(f"idle-{i}", 1, LIMIT, WINDOW)
+        clock[0] += WINDOW
+        await backend.acquire("active", 1, LIMIT, WINDOW)
+
+    asyncio.run(run())
+    assert list(backend._tats) == ["active"]
@@ -0,0 +1,98 @@
+import asyncio
+import threading
+
+import pytest
+
+from core.context import Priority, RequestContext, set_context
+from core.exceptions import DeadlineExceededError
+from services.scheduler import UpstreamScheduler
+
+
+class Upstream:
+    """Blocking upstream whose first call holds the only worker until released"""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.order = []
+
+    def hold(self):
+        self.release.wait(5)
+
+    def call(self, name):
+        self.order.append(name)
+        return name
+
+
+async def queue_behind_held_worker(upstream, jobs):
+    """Occupy the single worker, queue ``jobs`` behind it, then let them run
+
+    ``jobs`` are ``(name, RequestContext)`` pairs. Returns each job's result
+    or exception, in submission order.
+    """
+    scheduler = UpstreamScheduler(max_workers=1)
+
+    async def submit(fn, *args, context=RequestContext()):
+        set_context(context)
+        return await scheduler.submit(fn, *args)
+
+    held = asyncio.create_task(submit(upstream.hold))
+    await asyncio.sleep(0)
+    tasks = [asyncio.create_task(submit(upstream.call, n, context=c)) for n, c in jobs]
+    await asyncio.sleep(0)
+
+    upstream.release.set()
+    await held
+    return await asyncio.gather(*tasks, return_exceptions=True), scheduler
+
+
+def test_higher_priority_class_goes_first():
+    upstream = Upstream()
+    jobs = [
+        ("background", RequestContext(priority=Priority.BACKGROUND)),
+        ("batch", RequestContext(priority=Priority.BATCH)),
+        ("interactive", RequestContext(priority=Priority.INTERACTIVE)),
+    ]
+
+    asyncio.run(queue_behind_held_worker(upstream, jobs))
+
+    assert upstream.order == ["interactive", "batch", "background"]
+
+
+def test_clients_take_turns_within_a_class():
+    upstream = Upstream()
+    big = RequestContext(client_id="big", priority=Priority.BATCH)
+    small = RequestContext(client_id="small", priority=Priority.BATCH)
+    jobs = [(f"big{i}", big) for i in range(3)] + [("small0", small)]
+
+    asyncio.run(queue_behind_held_worker(upstream, jobs))
+
+    assert upstream.order == ["big0", "small0", "big1", "big2"]
+
+
+def test_disconnected_and_expired_jobs_are_dropped_before_running():
+    upstream = Upstream()
+    gone = asyncio.Event()
+    gone.set()
+    jobs = [
+        ("gone", RequestContext(disconnected=gone)),
+        ("late", RequestContext(deadline=0.0)),
+        ("kept", RequestContext()),
+    ]
+
+    results, scheduler = asyncio.run(queue_behind_held_worker(upstream, jobs))
+
+    assert upstream.order == ["kept"]
+    assert [type(r) for r in results[:2]] == [DeadlineExceededError] * 2
+    assert results[2] == "kept"
+    assert scheduler.stats()["classes"]["interactive"]["dropped"] == 2
+
+
+def test_upstream_exceptions_reach_the_caller():
+    def broken():
+        raise RuntimeError("upstream down")
+
+    async def run():
+        return await UpstreamScheduler(max_workers=1).submit(broken)
+
+    with pytest.raises(RuntimeError, match="upstream down"):
+        asyncio.run(run())
@@ -0,0 +1,99 @@
+import pytest
+
+from core.models import ChannelInfo, Platform
+from core.records import PostRecord
+from services.snapshot import (
+    CHANNEL_ID,
+    CHANNEL_INFO,
+    POST,
+    SnapshotReader,
+    write_snapshot,
+)
+
+NOW = 1_700_000_000.0
+
+POST_RECORD = PostRecord(
+    id="abc123",
+    platform="youtube",
+    author="Some Channel",
+    author_id="UC123",
+    content="A video",
+    created_at=NOW - 3600,
+    url="https://www.youtube.com/watch?v=abc123",
+    media_urls=("https://i.ytimg.com/vi/abc123/hqdefault.jpg",),
+    engagement=(("views", 10), ("likes", 2)),
+)
+INFO = ChannelInfo(
+    id="UC123",
+    name="Some Channel",
+    username="@some",
+    platform=Platform.YOUTUBE,
+    url="https://www.youtube.com/channel/UC123",
+    follower_count=42,
+)
+ENTRIES = [
+    (POST, ("youtube", "UC123"), POST_RECORD, NOW + 60),
+    (CHANNEL_ID, ("youtube", "@some"), "UC123", NOW + 60),
+    (CHANNEL_INFO, ("youtube", "@some"), INFO, NOW + 60),
+    (CHANNEL_ID, ("twitter", "gone"), "123", NOW - 60),
+]
+
+
+@pytest.fixture
+def reader(tmp_path):
+    path = str(tmp_path / "cache.snapshot")
+    assert write_snapshot(path, iter(ENTRIES)) == len(ENTRIES)
+    assert [p.name for p in tmp_path.iterdir()] == ["cache.snapshot"]
+
+    reader = SnapshotReader(path)
+    yield reader
+    reader.close()
+
+
+def test_round_trip(reader):
+    assert len(reader) == len(ENTRIES)
+
+    record, expires_at = reader.get(POST, ("youtube", "UC123"))
+    assert expires_at == NOW + 60
+    assert all(
+        getattr(record, slot) == getattr(POST_RECORD, slot)
+        for slot in PostRecord.__slots__
+    )
+    assert reader.get(CHANNEL_ID, ("youtube", "@some")) == ("UC123", NOW + 60)
+    assert reader.get(CHANNEL_INFO, ("youtube", "@some")) == (INFO, NOW + 60)
+    assert reader.get(POST, ("youtube", "UCother")) is None
+
+
+def test_take_removes_entry(reader):
+    assert reader.take(CHANNEL_ID, ("youtube", "@some")) == ("UC123", NOW + 60)
+    assert reader.take(CHANNEL_ID, ("youtube", "@some")) is None
+    assert len(reader) == len(ENTRIES) - 1
+    assert (CHANNEL_ID, ("youtube", "@some"), NOW + 60) not in list(reader.keys())
+
+
+def test_remaining_skips_taken_and_expired(reader, tmp_path):
+    reader.take(POST, ("youtube", "UC123"))
+    remaining = reader.remaining(NOW)
+
+    # Entries taken after the call are still carried over
+    reader.take(CHANNEL_ID, ("youtube", "@some"))
+    path = str(tmp_path / "next.snapshot")
+    assert write_snapshot(path, remaining) == 2
+
+    carried = SnapshotReader(path)
+    try:
+        assert sorted(kind for kind, _, _ in carried.keys()) == [
+            CHANNEL_ID,
+            CHANNEL_INFO,
+        ]
+        assert carried.get(CHANNEL_INFO, ("youtube", "@some")) == (INFO, NOW + 60)
+    finally:
+        carried.close()
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "not-a.snapshot"
+    path.write_bytes(b"x" * 64)
+
+    with pytest.raises(ValueError, match="not a cache snapshot"):
+        SnapshotReader(str(path))
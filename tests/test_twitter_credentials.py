@@ -0,0 +1,75 @@
+import json
+
+import pytest
+import requests
+import tweepy
+
+from config.settings import settings
+from core.exceptions import DeadlineExceededError
+from services.twitter_service import TwitterService
+
+
+def forbidden(body: dict) -> tweepy.Forbidden:
+    response = requests.Response()
+    response.status_code = 403
+    response.reason = "Forbidden"
+    response._content = json.dumps(body).encode()
+    return tweepy.Forbidden(response)
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(settings, "TWITTER_BEARER_TOKEN", None)
+    monkeypatch.setattr(settings, "TWITTER_BEARER_TOKENS", ["token-1", "token-2"])
+    return TwitterService()
+
+
+def fail_with(service: TwitterService, error: Exception) -> list:
+    calls = []
+
+    def get_user(**kwargs):
+        calls.append(kwargs)
+        raise error
+
+    for credential in service.credentials.credentials:
+        credential.client = type("Client", (), {"get_user": staticmethod(get_user)})
+    return calls
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        {
+            "reason": "client-not-enrolled",
+            "type": "https://api.twitter.com/2/problems/client-forbidden",
+        },
+        {"type": "https://api.twitter.com/2/problems/usage-capped"},
+    ],
+)
+def test_quarantines_token_on_credential_problem(service, body):
+    calls = fail_with(service, forbidden(body))
+
+    with pytest.raises(tweepy.Forbidden):
+        service._call("get_user", username="jack")
+
+    assert len(calls) == 2  # retried with the other token
+    assert [c.quarantines for c in service.credentials.credentials] == [1, 1]
+
+
+def test_other_forbidden_is_raised_without_quarantine(service):
+    calls = fail_with(service, forbidden({"title": "Forbidden", "type": "about:blank"}))
+
+    with pytest.raises(tweepy.Forbidden):
+        service._call("get_user", username="protected")
+
+    assert len(calls) == 1
+    assert service.credentials.available()
+    assert [c.quarantines for c in service.credentials.credentials] == [0, 0]
+
+
+def test_timeout_is_a_deadline_error(service):
+    fail_with(service, requests.ReadTimeout("read timed out"))
+
+    with pytest.raises(DeadlineExceededError):
+        service._call("get_user", username="jack")
+    assert [c.quarantines for c in service.credentials.credentials] == [0, 0]
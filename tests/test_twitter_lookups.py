@@ -0,0 +1,118 @@
+from datetime import datetime, timezone
+
+import pytest
+import tweepy
+
+from config.settings import settings
+from core.exceptions import ChannelNotFoundError
+from services.twitter_service import TwitterService
+
+USERS = {
+    "783214": {"id": "783214", "name": "Twitter", "username": "Twitter"},
+    "42": {"id": "42", "name": "Digits", "username": "1234567"},
+}
+
+
+class FakeClient:
+    """Answers user and timeline lookups from ``USERS``; records every call"""
+
+    def __init__(self):
+        self.calls = []
+
+    def _users(self, ids=(), usernames=()):
+        return [
+            tweepy.User(user)
+            for user in USERS.values()
+            if user["id"] in ids or user["username"].lower() in usernames
+        ]
+
+    def get_user(self, id=None, username=None, user_fields=None):
+        self.calls.append(("get_user", id or username))
+        users = self._users([id], [str(username).lower()])
+        return tweepy.Response(users[0] if users else None, {}, [], {})
+
+    def get_users(self, ids=None, usernames=None, user_fields=None):
+        self.calls.append(("get_users", tuple(ids or usernames)))
+        users = self._users(ids or (), [u.lower() for u in usernames or ()])
+        return tweepy.Response(users, {}, [], {})
+
+    def get_users_tweets(self, id, expansions=None, **params):
+        self.calls.append(("get_users_tweets", id, tuple(expansions or ())))
+        if id not in USERS:
+            errors = [{"title": "Not Found Error", "resource_id": id}]
+            return tweepy.Response(None, {}, errors, {})
+        tweet = tweepy.Tweet(
+            {
+                "id": "1",
+                "text": "hello",
+                "author_id": id,
+                "created_at": "2025-01-01T00:00:00.000Z",
+                "edit_history_tweet_ids": ["1"],
+            }
+        )
+        includes = {}
+        if "author_id" in (expansions or ()):
+            includes["users"] = [tweepy.User(USERS[id])]
+        return tweepy.Response([tweet], includes, [], {})
+
+
+@pytest.fixture
+def client():
+    return FakeClient()
+
+
+@pytest.fixture
+def twitter(monkeypatch, client):
+    monkeypatch.setattr(settings, "TWITTER_BEARER_TOKEN", "token")
+    monkeypatch.setattr(settings, "TWITTER_BEARER_TOKENS", [])
+    service = TwitterService()
+    for credential in service.credentials.credentials:
+        credential.client = client
+    return service
+
+
+def test_numeric_username_is_a_username(twitter, client):
+    info = twitter.get_channel_info("1234567")
+
+    assert info.id == "42"
+    assert client.calls == [("get_user", "1234567")]
+
+
+def test_prefixed_identifier_is_a_user_id(twitter, client):
+    assert twitter.get_channel_info("id:783214").username == "Twitter"
+    assert client.calls == [("get_user", "783214")]
+
+
+def test_prefixed_identifier_must_be_numeric(twitter):
+    with pytest.raises(ValueError):
+        twitter.get_channel_info("id:Twitter")
+
+
+def test_cached_id_fetches_timeline_without_user_lookup(twitter, client):
+    identifier = twitter.channel_id_identifier("783214")
+
+    post = twitter.get_latest_post(identifier, fields={"id", "author"})
+
+    assert (post.author, post.author_id) == ("Twitter", "783214")
+    assert post.created_at == datetime(2025, 1, 1, tzinfo=timezone.utc)
+    assert client.calls == [("get_users_tweets", "783214", ("author_id",))]
+
+
+def test_unknown_user_id_timeline_is_not_found(twitter):
+    with pytest.raises(ChannelNotFoundError):
+        twitter.get_latest_post("id:999")
+
+
+def test_batch_splits_ids_and_usernames(twitter, client):
+    results = twitter.get_channel_info_batch(
+        ["id:783214", "1234567", "id:999", "nobody"]
+    )
+
+    assert results["id:783214"].username == "Twitter"
+    assert results["1234567"].id == "42"
+    assert isinstance(results["id:999"], ChannelNotFoundError)
+    assert isinstance(results["nobody"], ChannelNotFoundError)
+    assert client.calls == [
+        ("get_users", ("783214", "999")),
+        ("get_users", ("1234567", "nobody")),
+    ]
@@ -0,0 +1,64 @@
+import hashlib
+import hmac
+
+import pytest
+
+from config.settings import settings
+from core.exceptions import AuthenticationError
+from services.websub_service import WebSubSubscriber, self_topic
+
+SECRET = "s3cret"
+BODY = b"<feed><entry>...</entry></feed>"
+
+
+@pytest.fixture
+def subscriber():
+    return WebSubSubscriber("https://api.example.com/websub", secret=SECRET)
+
+
+def sign(body: bytes, algorithm: str = "sha1", secret: str = SECRET) -> str:
+    digest = hmac.new(secret.encode(), body, getattr(hashlib, algorithm)).hexdigest()
+    return f"{algorithm}={digest}"
+
+
+@pytest.mark.parametrize("algorithm", ["sha1", "sha256", "sha384", "sha512"])
+def test_accepts_valid_signature(subscriber, algorithm):
+    assert subscriber.verify_signature(BODY, sign(BODY, algorithm))
+
+
+def test_accepts_uppercase_hex(subscriber):
+    algorithm, _, digest = sign(BODY).partition("=")
+
+    assert subscriber.verify_signature(BODY, f"{algorithm}={digest.upper()}")
+
+
+@pytest.mark.parametrize(
+    "signature",
+    [
+        None,
+        "",
+        "sha1",
+        sign(BODY, secret="other"),
+        sign(BODY + b" "),
+        sign(BODY, "md5"),
+        "sha1=" + "0" * 40,
+    ],
+)
+def test_rejects_bad_signature(subscriber, signature):
+    assert not subscriber.verify_signature(BODY, signature)
+
+
+def test_requires_secret(monkeypatch):
+    monkeypatch.setattr(settings, "WEBSUB_SECRET", None)
+
+    with pytest.raises(AuthenticationError):
+        WebSubSubscriber("https://api.example.com/websub")
+
+
+def test_self_topic():
+    topic = "https://www.youtube.com/xml/feeds/videos.xml?channel_id=UC123"
+    link = f'<https://pubsubhubbub.appspot.com>; rel=hub, <{topic}>; rel="self"'
+
+    assert self_topic(link) == topic
+    assert self_topic("<https://pubsubhubbub.appspot.com>; rel=hub") is None
+    assert self_topic(None) is None
@@ -0,0 +1,70 @@
+import pytest
+
+from config.settings import settings
+from core.exceptions import ChannelNotFoundError
+from services.youtube_service import YouTubeService
+
+
+class RecordingClient:
+    """Data API client stand-in: records list() calls, answers canned items"""
+
+    def __init__(self, items):
+        self.items = items
+        self.calls = []
+
+    def channels(self):
+        return self
+
+    def videos(self):
+        return self
+
+    def list(self, **kwargs):
+        self.calls.append(kwargs)
+        ids = kwargs.get("id", "").split(",")
+        return {"items": [item for item in self.items if item["id"] in ids]}
+
+
+@pytest.fixture
+def youtube(monkeypatch):
+    monkeypatch.setattr(settings, "YOUTUBE_API_KEY", "test-key")
+    return YouTubeService()
+
+
+def use_client(monkeypatch, youtube, client):
+    monkeypatch.setattr(
+        youtube, "_execute", lambda make_request, cost=1: make_request(client)
+    )
+
+
+def test_channel_batch_chunks_ids_without_max_results(monkeypatch, youtube):
+    ids = [f"UC{i:022d}" for i in range(60)]
+    client = RecordingClient([{"id": ids[0], "snippet": {"title": "First"}}])
+    use_client(monkeypatch, youtube, client)
+
+    results = youtube.get_channel_info_batch(ids, fields={"name"})
+
+    assert [len(call["id"].split(",")) for call in client.calls] == [50, 10]
+    assert all("maxResults" not in call for call in client.calls)
+    assert results[ids[0]].name == "First"
+    assert isinstance(results[ids[1]], ChannelNotFoundError)
+
+
+def test_engagement_batch_chunks_ids_without_max_results(monkeypatch, youtube):
+    ids = [f"video{i}" for i in range(120)]
+    client = RecordingClient(
+        [
+            {"id": "video7", "statistics": {"viewCount": "10", "likeCount": "2"}},
+            {"id": "video110", "statistics": {}},
+        ]
+    )
+    use_client(monkeypatch, youtube, client)
+
+    engagement = youtube.get_engagement_batch(ids)
+
+    assert [len(call["id"].split(",")) for call in client.calls] == [50, 50, 20]
+    assert all("maxResults" not in call for call in client.calls)
+    # Deleted videos are left out
+    assert engagement == {
+        "video7": {"views": 10, "likes": 2, "comments": 0},
+        "video110": {"views": 0, "likes": 0, "comments": 0},
+    }
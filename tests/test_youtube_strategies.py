@@ -0,0 +1,120 @@
+import json
+from datetime import datetime, timezone
+
+import httplib2
+import pytest
+import requests
+from googleapiclient.errors import HttpError
+
+from config.settings import settings
+from core.exceptions import APIError, ChannelNotFoundError
+from core.models import Platform, SocialMediaPost
+from services.youtube_service import YouTubeService, _FeedIncomplete
+
+CHANNEL_ID = "UC" + "x" * 22
+VIDEO = SocialMediaPost(
+    id="abc123",
+    platform=Platform.YOUTUBE,
+    author="Some Channel",
+    author_id=CHANNEL_ID,
+    content="A video",
+    created_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+    url="https://www.youtube.com/watch?v=abc123",
+)
+
+
+def feed_error(status: int) -> requests.HTTPError:
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(f"{status} error", response=response)
+
+
+def data_api_error(status: int, reason: str) -> HttpError:
+    resp = httplib2.Response({"status": status})
+    resp.reason = "error"
+    content = {
+        "error": {"code": status, "message": reason, "errors": [{"reason": reason}]}
+    }
+    return HttpError(resp, json.dumps(content).encode())
+
+
+@pytest.fixture
+def youtube(monkeypatch):
+    monkeypatch.setattr(settings, "YOUTUBE_API_KEY", "test-key")
+    monkeypatch.setattr(settings, "YOUTUBE_FETCH_STRATEGY", "feed")
+    return YouTubeService()
+
+
+def script(youtube, **outcomes):
+    """Make each ``_latest_via_<strategy>`` return or raise its outcome"""
+    used = []
+
+    def strategy(name, outcome):
+        def run(channel_id, fields=None):
+            used.append(name)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        return run
+
+    for name, outcome in outcomes.items():
+        setattr(youtube, f"_latest_via_{name}", strategy(name, outcome))
+    return used
+
+
+def test_configured_strategy_answers_first(youtube):
+    used = script(youtube, feed=VIDEO, playlist=None, search=None)
+
+    assert youtube.get_latest_post(CHANNEL_ID, fields={"id"}) is VIDEO
+    assert used == ["feed"]
+
+
+@pytest.mark.parametrize(
+    "failure",
+    [
+        requests.ConnectionError("reset"),
+        feed_error(500),
+        _FeedIncomplete("no publish date"),
+    ],
+)
+def test_falls_back_to_next_strategy(youtube, failure):
+    used = script(youtube, feed=failure, playlist=VIDEO, search=None)
+
+    assert youtube.get_latest_post(CHANNEL_ID, fields={"id"}) is VIDEO
+    assert used == ["feed", "playlist"]
+
+
+def test_unknown_channel_id_stops_at_feed_404(youtube):
+    used = script(youtube, feed=feed_error(404), playlist=VIDEO, search=VIDEO)
+
+    with pytest.raises(ChannelNotFoundError):
+        youtube.get_latest_post(CHANNEL_ID)
+    assert used == ["feed"]
+
+
+def test_unknown_channel_id_stops_at_missing_playlist(youtube, monkeypatch):
+    monkeypatch.setattr(settings, "YOUTUBE_FETCH_STRATEGY", "playlist")
+    used = script(
+        youtube,
+        playlist=data_api_error(404, "playlistNotFound"),
+        feed=VIDEO,
+        search=VIDEO,
+    )
+
+    with pytest.raises(ChannelNotFoundError):
+        youtube.get_latest_post(CHANNEL_ID)
+    assert used == ["playlist"]
+
+
+def test_all_strategies_failing_is_an_api_error(youtube):
+    used = script(
+        youtube,
+        feed=feed_error(503),
+        playlist=data_api_error(500, "backendError"),
+        search=data_api_error(500, "backendError"),
+    )
+
+    with pytest.raises(APIError):
+        youtube.get_latest_post(CHANNEL_ID)
+    assert used == ["feed", "playlist", "search"]
@@ -0,0 +1,84 @@
+import hashlib
+import math
+import time
+
+
+class BloomFilter:
+    """Fixed-size set membership with false positives but no false negatives
+
+    Sized for ``capacity`` keys at a false positive rate of ``error_rate``;
+    the k bit positions come from double hashing one 128-bit BLAKE2b digest.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.num_bits = max(
+            8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
+
+    def nbytes(self) -> int:
+        return len(self._bits)
+
+
+class RotatingBloomFilter:
+    """Bloom filter whose keys expire after between ``ttl`` and ``2 * ttl``
+
+    Keeps two generations: keys go into the current one, lookups check both.
+    Every ``ttl`` seconds (or when the current generation reaches capacity)
+    the previous generation is dropped and a fresh one started, so removal
+    comes for free and the false positive rate stays bounded at about twice
+    ``error_rate``.
+    """
+
+    def __init__(self, capacity: int, error_rate: float, ttl: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.ttl = ttl
+        self._current = BloomFilter(capacity, error_rate)
+        self._previous = BloomFilter(capacity, error_rate)
+        self._rotated_at = time.monotonic()
+
+    def _rotate_if_due(self) -> None:
+        elapsed = time.monotonic() - self._rotated_at
+        if elapsed < self.ttl and self._current.count < self.capacity:
+            return
+
+        # After two idle periods the current generation has expired as well
+        self._previous = (
+            self._current
+            if elapsed < 2 * self.ttl
+            else BloomFilter(self.capacity, self.error_rate)
+        )
+        self._current = BloomFilter(self.capacity, self.error_rate)
+        self._rotated_at = time.monotonic()
+
+    def add(self, key: str) -> None:
+        self._rotate_if_due()
+        self._current.add(key)
+
+    def __contains__(self, key: str) -> bool:
+        self._rotate_if_due()
+        return key in self._current or key in self._previous
+
+    def nbytes(self) -> int:
+        return self._current.nbytes() + self._previous.nbytes()
@@ -0,0 +1,92 @@
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional, Tuple
+
+# Rough per-entry bookkeeping cost (OrderedDict node, entry tuple, floats)
+ENTRY_OVERHEAD = 160
+
+
+class ByteBoundedCache:
+    """LRU cache with a per-entry TTL, bounded by the total size of its entries
+
+    ``sizeof`` estimates the memory held by a value; the cache evicts least
+    recently used entries until the total fits in ``max_bytes``. Not
+    thread-safe: use it from the event loop only.
+    """
+
+    def __init__(
+        self, max_bytes: int, ttl: float, sizeof: Callable[[Any], int]
+    ):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._sizeof = sizeof
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int, float]]" = OrderedDict()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return a live value for ``key`` or ``None``"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, _, expires_at = entry
+        if expires_at <= time.time():
+            self.pop(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store ``value``, evicting older entries to stay within budget"""
+        self.pop(key)
+
+        size = self._sizeof(value) + sys.getsizeof(key) + ENTRY_OVERHEAD
+        if size > self.max_bytes:
+            return
+
+        while self._entries and self.current_bytes + size > self.max_bytes:
+            _, (_, evicted_size, _) = self._entries.popitem(last=False)
+            self.current_bytes -= evicted_size
+            self.evictions += 1
+
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        self._entries[key] = (value, size, expires_at)
+        self.current_bytes += size
+
+    def pop(self, key: Hashable) -> Optional[Any]:
+        """Remove ``key`` and return its value, if present"""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return None
+
+        self.current_bytes -= entry[1]
+        return entry[0]
+
+    def items(self) -> Iterator[Tuple[Hashable, Any, float]]:
+        """Iterate live ``(key, value, expires_at)`` entries, oldest first"""
+        now = time.time()
+        for key, (value, _, expires_at) in list(self._entries.items()):
+            if expires_at > now:
+                yield key, value, expires_at
+
+    def stats(self) -> Dict[str, int]:
+        """Usage counters for monitoring"""
+        return {
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,148 @@
+import math
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from core.exceptions import AuthenticationError, RateLimitError
+
+
+def unique_secrets(*secrets: Optional[Sequence[str]]) -> List[str]:
+    """Flatten single secrets and lists of them, dropping blanks and repeats"""
+    flat = []
+    for secret in secrets:
+        if isinstance(secret, str):
+            flat.append(secret)
+        elif secret:
+            flat.extend(secret)
+    return list(dict.fromkeys(s.strip() for s in flat if s and s.strip()))
+
+
+class Credential:
+    """One API key or token, its client, and what is known of its budget"""
+
+    def __init__(self, name: str, client: Any):
+        self.name = name
+        self.client = client
+        self.calls = 0
+        self.quarantines = 0
+        self.quarantined_until = 0.0
+        self.quarantine_reason: Optional[str] = None
+        # scope -> (remaining, POSIX time the budget resets)
+        self.budgets: Dict[str, Tuple[int, float]] = {}
+
+    def remaining(self, scope: str, now: float) -> float:
+        budget = self.budgets.get(scope)
+        if budget is None or budget[1] <= now:
+            return math.inf  # never seen or reset since: assume all of it
+        return budget[0]
+
+
+class CredentialPool:
+    """Several credentials for one platform, picked by remaining budget
+
+    ``acquire`` returns the credential with the most budget left in a scope
+    (an endpoint's rate-limit window, or a daily quota), breaking ties by
+    fewest calls so fresh credentials share the load. Credentials that hit a
+    quota or rate limit are quarantined until it resets. Thread-safe: the
+    services call it from scheduler worker threads.
+    """
+
+    def __init__(self, platform: str, credentials: List[Credential]):
+        if not credentials:
+            raise AuthenticationError(f"No {platform} credentials provided")
+        self.platform = platform
+        self.credentials = credentials
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.credentials)
+
+    @staticmethod
+    def label(platform: str, index: int) -> str:
+        """Name of a credential by its position in the settings
+
+        Nothing of the secret goes in: the name is shown by the unauthenticated
+        ``/health/credentials`` endpoint.
+        """
+        return f"{platform}-{index + 1}"
+
+    def acquire(self, scope: str = "default") -> Credential:
+        """The available credential with the most budget left in ``scope``"""
+        now = time.time()
+        with self._lock:
+            available = [c for c in self.credentials if c.quarantined_until <= now]
+            if not available:
+                retry_at = datetime.fromtimestamp(
+                    min(c.quarantined_until for c in self.credentials), timezone.utc
+                )
+                raise RateLimitError(
+                    f"All {self.platform} credentials are rate limited or out of "
+                    f"quota until {retry_at.isoformat(timespec='seconds')}"
+                )
+
+            credential = max(
+                available, key=lambda c: (c.remaining(scope, now), -c.calls)
+            )
+            credential.calls += 1
+            return credential
+
+    def available(self) -> bool:
+        now = time.time()
+        return any(c.quarantined_until <= now for c in self.credentials)
+
+    def observe(
+        self, credential: Credential, scope: str, remaining: int, reset_at: float
+    ) -> None:
+        """Record the budget reported by the API (e.g. rate-limit headers)"""
+        with self._lock:
+            credential.budgets[scope] = (remaining, reset_at)
+
+    def spend(
+        self,
+        credential: Credential,
+        scope: str,
+        cost: int,
+        limit: int,
+        reset_at: float,
+    ) -> None:
+        """Count ``cost`` against a budget of ``limit`` that resets at ``reset_at``"""
+        now = time.time()
+        with self._lock:
+            remaining, current_reset = credential.budgets.get(scope, (limit, reset_at))
+            if current_reset <= now:
+                remaining, current_reset = limit, reset_at
+            credential.budgets[scope] = (remaining - cost, current_reset)
+
+    def quarantine(self, credential: Credential, until: float, reason: str) -> None:
+        """Skip ``credential`` until ``until`` (POSIX time)"""
+        with self._lock:
+            credential.quarantined_until = max(credential.quarantined_until, until)
+            credential.quarantine_reason = reason
+            credential.quarantines += 1
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Usage of every credential, for monitoring"""
+        now = time.time()
+        with self._lock:
+            return [
+                {
+                    "name": c.name,
+                    "calls": c.calls,
+                    "quarantines": c.quarantines,
+                    "quarantined_until": (
+                        datetime.fromtimestamp(c.quarantined_until, timezone.utc)
+                        if c.quarantined_until > now
+                        else None
+                    ),
+                    "quarantine_reason": (
+                        c.quarantine_reason if c.quarantined_until > now else None
+                    ),
+                    "remaining": {
+                        scope: remaining
+                        for scope, (remaining, reset_at) in c.budgets.items()
+                        if reset_at > now
+                    },
+                }
+                for c in self.credentials
+            ]
@@ -0,0 +1,37 @@
+import requests
+
+from core.context import current_context
+from core.exceptions import DeadlineExceededError
+
+
+def upstream_timeout(default: float) -> float:
+    """Timeout for the next upstream call: ``default``, capped by the deadline
+
+    Raises ``DeadlineExceededError`` once the current request's deadline has
+    passed, so multi-step lookups stop instead of issuing more calls.
+    """
+    context = current_context()
+    if context.disconnected is not None and context.disconnected.is_set():
+        raise DeadlineExceededError("Client disconnected")
+
+    remaining = context.remaining()
+    if remaining is None:
+        return default
+    if remaining <= 0:
+        raise DeadlineExceededError("Request deadline exceeded")
+    return min(default, remaining)
+
+
+class DeadlineSession(requests.Session):
+    """``requests`` session whose calls time out by the request deadline
+
+    Also gives a timeout to callers that never pass one (e.g. tweepy).
+    """
+
+    def __init__(self, default_timeout: float):
+        super().__init__()
+        self.default_timeout = default_timeout
+
+    def request(self, method, url, *args, **kwargs):
+        kwargs["timeout"] = upstream_timeout(kwargs.get("timeout") or self.default_timeout)
+        return super().request(method, url, *args, **kwargs)
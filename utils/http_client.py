@@ -1,17 +1,24 @@
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Dict, Any
 import time
-from ..config.settings import settings
-from ..core.exceptions import APIError, RateLimitError
+from config.settings import settings
+from core.exceptions import APIError, RateLimitError
+from utils.deadline import DeadlineSession
 
 
 class HTTPClient:
     """HTTP client with retry logic and error handling"""
 
-    def __init__(self, timeout: int = None): # type: ignore
+    def __init__(self, timeout: int = None, pool_size: int = 10): # type: ignore
         self.timeout = timeout or settings.REQUEST_TIMEOUT
         self.max_retries = settings.MAX_RETRIES
-        self.session = requests.Session()
+        # Timeouts are further capped by the current request's deadline
+        self.session = DeadlineSession(self.timeout)
+        # Keep up to ``pool_size`` connections per host alive for reuse
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
 
     def get(
         self, url: str, headers: Dict[str, str] = None, params: Dict[str, Any] = None # type: ignore
@@ -19,6 +26,12 @@ class HTTPClient:
         """Make GET request with retry logic"""
         return self._make_request("GET", url, headers=headers, params=params)
 
+    def post(
+        self, url: str, headers: Dict[str, str] = None, data: Dict[str, Any] = None # type: ignore
+    ) -> Dict[str, Any]:
+        """Make form-encoded POST request with retry logic"""
+        return self._make_request("POST", url, headers=headers, data=data)
+
     def _make_request(self, method: str, url: str, **kwargs) -> Dict[str, Any]:
         """Make HTTP request with retry logic"""
         last_exception = None
@@ -37,7 +50,8 @@ class HTTPClient:
                     raise RateLimitError("Rate limit exceeded")
 
                 response.raise_for_status()
-                return response.json()
+                # e.g. "202 Accepted" from a WebSub hub carries no body
+                return response.json() if response.content else {}
 
             except requests.exceptions.RequestException as e:
                 last_exception = e
@@ -0,0 +1,25 @@
+from collections import deque
+from typing import Deque, Optional
+
+
+class LatencyWindow:
+    """Ring buffer of the most recent latencies (seconds) with percentiles
+
+    Appends are atomic, so worker threads can record into it directly.
+    """
+
+    def __init__(self, maxlen: int = 1024):
+        self._samples: Deque[float] = deque(maxlen=maxlen)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def add(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """The ``p`` quantile (0..1) of the window, ``None`` if empty"""
+        samples = sorted(self._samples)
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(p * len(samples)))]
@@ -0,0 +1,131 @@
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional
+
+_active_profile: ContextVar[Optional["RequestProfile"]] = ContextVar(
+    "active_profile", default=None
+)
+
+
+class RequestProfile:
+    """cProfile session for one request, on the event loop and in workers
+
+    While active (``with profile:``), the event loop thread is profiled and
+    upstream jobs started from the request's context record their own
+    profile in the worker thread (see ``profiled_call``); ``report`` merges
+    them. The loop thread profile also sees any other request interleaved
+    with this one.
+    """
+
+    def __init__(self):
+        self._loop_profile = cProfile.Profile()
+        self._thread_profiles: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+        self._token = None
+
+    def __enter__(self) -> "RequestProfile":
+        self._token = _active_profile.set(self)
+        self._loop_profile.enable()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._loop_profile.disable()
+        _active_profile.reset(self._token)
+
+    def add(self, profile: cProfile.Profile) -> None:
+        with self._lock:
+            self._thread_profiles.append(profile)
+
+    def report(self, sort: str = "cumulative", limit: int = 40) -> str:
+        """Merged stats sorted by ``sort``, then the callees of the top entries"""
+        stream = io.StringIO()
+        stats = pstats.Stats(self._loop_profile, stream=stream)
+        with self._lock:
+            for profile in self._thread_profiles:
+                stats.add(profile)
+
+        stats.sort_stats(sort).print_stats(limit)
+        stats.print_callees(limit // 2)
+        return stream.getvalue()
+
+
+def profiled_call(fn: Callable, *args):
+    """Run ``fn`` in a worker thread, profiled if its request is being profiled"""
+    session = _active_profile.get()
+    if session is None:
+        return fn(*args)
+
+    profile = cProfile.Profile()
+    try:
+        profile.enable()
+    except ValueError:
+        # Python 3.12+: the request's profiler already covers every thread
+        return fn(*args)
+
+    try:
+        return fn(*args)
+    finally:
+        profile.disable()
+        session.add(profile)
+
+
+class SamplingProfiler:
+    """Periodically samples the stack of every thread
+
+    Stacks are aggregated in the folded format (``root;...;leaf count``)
+    understood by flamegraph.pl and speedscope. Worker threads of one pool
+    are merged under their pool's name.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self._labels: Dict[object, str] = {}
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            path = code.co_filename.split(os.sep)
+            label = self._labels[code] = (
+                f"{code.co_name} ({'/'.join(path[-2:])}:{code.co_firstlineno})"
+            )
+        return label
+
+    @staticmethod
+    def _thread_group(name: str) -> str:
+        # "ThreadPoolExecutor-0_3" -> "ThreadPoolExecutor-0"
+        return name.rsplit("_", 1)[0] if name.startswith("ThreadPoolExecutor") else name
+
+    def run(self, duration: float) -> Counter:
+        """Sample for ``duration`` seconds (blocking); returns stack counts"""
+        own_ident = threading.get_ident()
+        counts: Counter = Counter()
+        end = time.monotonic() + duration
+
+        while time.monotonic() < end:
+            names = {
+                thread.ident: self._thread_group(thread.name)
+                for thread in threading.enumerate()
+            }
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(self._label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(names.get(ident, f"thread-{ident}"))
+                counts[";".join(reversed(stack))] += 1
+            time.sleep(self.interval)
+
+        return counts
+
+
+def folded_stacks(counts: Counter) -> str:
+    return "".join(f"{stack} {count}\n" for stack, count in counts.most_common())
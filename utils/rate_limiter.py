@@ -0,0 +1,89 @@
+import asyncio
+import math
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, NamedTuple
+
+
+class RateLimitResult(NamedTuple):
+    """Outcome of a rate limit check"""
+
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_after: float  # seconds until the full budget is available again
+    retry_after: float  # seconds until this request would be allowed (0 if allowed)
+
+
+class RateLimitBackend(ABC):
+    """State store for GCRA rate limiting
+
+    GCRA (the generic cell rate algorithm) keeps a single number per client,
+    its theoretical arrival time (TAT). Backends only have to store that
+    float atomically, so a shared store (e.g. Redis with a small script) can
+    implement this interface to enforce limits across workers.
+    """
+
+    @abstractmethod
+    async def acquire(
+        self, key: str, cost: int, limit: int, window: float
+    ) -> RateLimitResult:
+        """Consume ``cost`` units of ``key``'s budget of ``limit`` per ``window``"""
+        pass
+
+
+def gcra(
+    tat: float, now: float, cost: int, limit: int, window: float
+) -> "tuple[float, RateLimitResult]":
+    """Apply one GCRA step; returns the new TAT and the result
+
+    A ``cost`` above ``limit`` can never pass; callers should refuse such
+    requests up front rather than have them retried.
+    """
+    emission_interval = window / limit
+    tat = max(tat, now)
+    new_tat = tat + cost * emission_interval
+    if new_tat - now > window:
+        return tat, RateLimitResult(
+            allowed=False,
+            limit=limit,
+            remaining=max(0, math.floor((window - (tat - now)) / emission_interval)),
+            reset_after=tat - now,
+            retry_after=new_tat - now - window if cost <= limit else math.inf,
+        )
+
+    return new_tat, RateLimitResult(
+        allowed=True,
+        limit=limit,
+        remaining=max(0, math.floor((window - (new_tat - now)) / emission_interval)),
+        reset_after=new_tat - now,
+        retry_after=0.0,
+    )
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """Per-process GCRA state: one float per client
+
+    Clients whose budget has fully recovered hold no information and are
+    purged whenever the table doubles, so memory tracks active clients.
+    """
+
+    def __init__(self):
+        self._tats: Dict[str, float] = {}
+        self._purge_at = 1024
+        self._lock = asyncio.Lock()
+
+    async def acquire(
+        self, key: str, cost: int, limit: int, window: float
+    ) -> RateLimitResult:
+        async with self._lock:
+            now = time.monotonic()
+            self._tats[key], result = gcra(
+                self._tats.get(key, now), now, cost, limit, window
+            )
+
+            if len(self._tats) >= self._purge_at:
+                self._tats = {k: tat for k, tat in self._tats.items() if tat > now}
+                self._purge_at = max(1024, 2 * len(self._tats))
+
+            return result